@@ -0,0 +1,252 @@
+#!/usr/bin/python3
+"""
+This module admits the requests of the API before any work is done,
+so a traffic spike is shed quickly instead of queueing without limit
+in the threads and the storage session. Each budget limits:
+- the rate of each client (by address), with a token bucket:
+  a client over its rate gets 429 Too Many Requests,
+- the requests running at once, with a bounded wait queue:
+  when the queue is full, or the wait times out, the request gets
+  503 Service Unavailable.
+Both answers carry a Retry-After header. Every request uses the
+default budget, and the expensive routes (places_search) also use
+their own, smaller one. The long-lived routes (the event streams) only
+use their own budget, so they do not hold the slots of the short
+requests. The sub-requests of a batch are admitted with the batch
+itself.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, request
+from werkzeug.exceptions import ServiceUnavailable, TooManyRequests
+
+#: The settings of each budget: rate (requests per second of a client),
+#: burst (requests a client can make at once), concurrency (requests
+#: running at once), queue (requests waiting for a slot) and
+#: queue_timeout (seconds a request waits), None for no limit.
+#: They are overridden by the ADMISSION_BUDGETS config.
+BUDGETS = {
+    "default": {"rate": 100, "burst": 200, "concurrency": 32,
+                "queue": 64, "queue_timeout": 2},
+    "search": {"rate": 5, "burst": 20, "concurrency": 4,
+               "queue": 8, "queue_timeout": 2},
+    "stream": {"rate": 1, "burst": 5, "concurrency": 64,
+               "queue": 0, "queue_timeout": 0},
+}
+
+#: The budget of the expensive and long-lived routes, by endpoint
+ROUTE_BUDGETS = {
+    "app_views.places_search": "search",
+    "async_app_views.async_places_search": "search",
+    "app_views.stream_changes": "stream",
+}
+
+#: The budgets used instead of the default budget
+DEDICATED_BUDGETS = {"stream"}
+
+#: The number of clients whose token buckets are kept
+MAX_CLIENTS = 10000
+
+#: Set in the environ of the batch sub-requests
+BATCH_ENVIRON_KEY = "hbnb.batch"
+
+_ENVIRON_KEY = "hbnb.admission"
+
+
+class TokenBucket:
+    """A token bucket refilled at a constant rate."""
+
+    def __init__(self, rate, burst):
+        """
+        Initializes a full bucket.
+
+        Parameters:
+            rate (float): The tokens added per second.
+            burst (int): The capacity of the bucket.
+        """
+        self.__rate = rate
+        self.__burst = burst
+        self.__tokens = burst
+        self.__updated = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def take(self):
+        """
+        Takes a token from the bucket.
+
+        Returns 0 if a token was taken, otherwise the seconds
+        until the next one is available.
+        """
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(
+                self.__burst,
+                self.__tokens + (now - self.__updated) * self.__rate)
+            self.__updated = now
+            if self.__tokens >= 1:
+                self.__tokens -= 1
+                return 0
+
+            return (1 - self.__tokens) / self.__rate
+
+
+class RateLimiter:
+    """The token buckets of the clients of a budget."""
+
+    def __init__(self, rate, burst, max_clients=MAX_CLIENTS):
+        """
+        Initializes the rate limiter.
+
+        Parameters:
+            rate (float): The requests per second of a client.
+            burst (int): The requests a client can make at once.
+            max_clients (int): The number of buckets kept (the least
+                recently used ones are dropped).
+        """
+        self.__rate = rate
+        self.__burst = burst
+        self.__max_clients = max_clients
+        self.__buckets = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def take(self, client):
+        """
+        Takes a token from the bucket of a client.
+
+        Returns 0 if the request is admitted, otherwise the seconds
+        until the client can make it.
+        """
+        with self.__lock:
+            bucket = self.__buckets.get(client)
+            if bucket is None:
+                bucket = self.__buckets[client] = TokenBucket(
+                    self.__rate, self.__burst)
+                while len(self.__buckets) > self.__max_clients:
+                    self.__buckets.popitem(last=False)
+            self.__buckets.move_to_end(client)
+
+        return bucket.take()
+
+
+class ConcurrencyLimiter:
+    """Limits the requests running at once, with a bounded wait queue."""
+
+    def __init__(self, limit, max_queued):
+        """
+        Initializes the limiter.
+
+        Parameters:
+            limit (int): The requests running at once.
+            max_queued (int): The requests waiting for a slot.
+        """
+        self.__limit = limit
+        self.__max_queued = max_queued
+        self.__active = 0
+        self.__queued = 0
+        self.__condition = threading.Condition()
+
+    def acquire(self, timeout):
+        """
+        Takes a slot, waiting up to timeout seconds for one
+        if there is room in the queue.
+
+        Returns True if a slot was taken, False otherwise.
+        """
+        with self.__condition:
+            if self.__active < self.__limit:
+                self.__active += 1
+                return True
+            if self.__queued >= self.__max_queued:
+                return False
+
+            self.__queued += 1
+            try:
+                if not self.__condition.wait_for(
+                        lambda: self.__active < self.__limit, timeout):
+                    return False
+            finally:
+                self.__queued -= 1
+
+            self.__active += 1
+            return True
+
+    def release(self):
+        """Gives a slot back."""
+        with self.__condition:
+            self.__active -= 1
+            self.__condition.notify()
+
+
+class Budget:
+    """The rate and concurrency limits of a group of requests."""
+
+    def __init__(self, rate=None, burst=None, concurrency=None,
+                 queue=0, queue_timeout=0):
+        """
+        Initializes the budget (see BUDGETS for the parameters).
+        """
+        self.rate_limiter = RateLimiter(rate, burst or max(rate, 1)) \
+            if rate else None
+        self.concurrency_limiter = ConcurrencyLimiter(
+            concurrency, queue) if concurrency else None
+        self.queue_timeout = queue_timeout
+
+    def admit(self, client):
+        """
+        Admits a request of a client, or aborts with 429 or 503.
+
+        Returns the ConcurrencyLimiter to release when the request
+        ends, or None.
+        """
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.take(client)
+            if wait:
+                raise TooManyRequests(retry_after=math.ceil(wait))
+
+        if self.concurrency_limiter is None:
+            return None
+
+        if not self.concurrency_limiter.acquire(self.queue_timeout):
+            raise ServiceUnavailable(
+                "The server is overloaded",
+                retry_after=max(math.ceil(self.queue_timeout), 1))
+
+        return self.concurrency_limiter
+
+
+def init_app(app):
+    """
+    Registers the admission hooks (before the other hooks,
+    so a rejected request does no work).
+    """
+    settings = {name: dict(budget) for name, budget in BUDGETS.items()}
+    for name, budget in app.config.get("ADMISSION_BUDGETS", {}).items():
+        settings.setdefault(name, {}).update(budget)
+    budgets = app.extensions["admission"] = {
+        name: Budget(**budget) for name, budget in settings.items()}
+
+    @app.before_request
+    def admit_request():
+        """Admit the request or reject it with 429 or 503"""
+        if current_app.config.get("ADMISSION_DISABLED") or \
+                request.environ.get(BATCH_ENVIRON_KEY):
+            return
+
+        admitted = request.environ[_ENVIRON_KEY] = []
+        route_budget = ROUTE_BUDGETS.get(request.endpoint)
+        names = (route_budget,) if route_budget in DEDICATED_BUDGETS \
+            else ("default", route_budget)
+        for name in names:
+            if name in budgets:
+                limiter = budgets[name].admit(request.remote_addr)
+                if limiter is not None:
+                    admitted.append(limiter)
+
+    @app.teardown_request
+    def release_request(exception):
+        """Give back the slots of the request"""
+        for limiter in request.environ.pop(_ENVIRON_KEY, ()):
+            limiter.release()
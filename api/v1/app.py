@@ -5,18 +5,29 @@ It also sets up a CORS policy. and a Swagger documentation route at /apidocs.
 It also handles 404 errors.
 """
 
+import math
 import os
 
-from flask import Flask, make_response, jsonify
+from flask import Flask, make_response, jsonify, request
 from flask_cors import CORS
 from flasgger import Swagger
-from models import storage
+from models import storage, async_storage
+from models.engine.storage import DeadlineExceeded, StorageUnavailable
 from api.v1.views import app_views
+from api.v1 import admission
+from api.v1 import deadlines
+from api.v1 import unit_of_work
+from api.v1.json_provider import CodecJSONProvider
+from api.v1 import cache
+from api.v1 import compression
+from api.v1 import conditional
+from api.v1 import formats
 
 app = Flask(__name__)
 
-# Set the JSONIFY_PRETTYPRINT_REGULAR config to True for pretty JSON output
-app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
+# Encode and decode JSON with the storage JSON codec (compact output,
+# set app.json.compact to False for pretty JSON output)
+app.json = CodecJSONProvider(app)
 
 # Set the SWAGGER config for the API documentation
 app.config['SWAGGER'] = {
@@ -52,6 +63,48 @@ app.url_map.strict_slashes = False
 # Register the blueprint for the API routes
 app.register_blueprint(app_views)
 
+# Register the asynchronous routes when the asyncio storage is enabled
+if async_storage:
+    from api.v1.views.async_views import async_app_views
+
+    app.register_blueprint(async_app_views)
+
+
+# Shed the requests over the rate and concurrency limits first
+admission.init_app(app)
+
+# Give every request a deadline the storage operations must meet
+deadlines.init_app(app)
+
+# Persist the changes of each write request once, when it ends
+unit_of_work.init_app(app)
+
+# Keep the compressed bytes of the cached responses
+# (registered first, the after_request hooks run in reverse order)
+cache.init_app(app)
+
+# Compress the responses with the encoding the client accepts
+compression.init_app(app)
+
+# Answer conditional GET requests with 304 Not Modified
+conditional.init_app(app)
+
+# Decode the bodies in MessagePack or CBOR (jsonify and json_array encode
+# the responses in them when the client asks for it, and the library is
+# installed)
+formats.init_app(app)
+
+
+@app.before_request
+def route_reads():
+    """
+    Send the reads of read-only requests to the read replicas.
+    The sub-requests of a batch keep the routing of the batch, so
+    they read the writes made by the previous ones.
+    """
+    if admission.BATCH_ENVIRON_KEY not in request.environ:
+        storage.read_from_replica(request.method in ('GET', 'HEAD'))
+
 
 @app.teardown_appcontext
 def close_storage(exception):
@@ -75,6 +128,46 @@ def bad_request(exception):
     }), 400)
 
 
+@app.errorhandler(410)
+def gone(exception):
+    """Return a JSON-formatted 410 response"""
+    return make_response(jsonify({
+        'error': 'Gone', 'message': exception.description
+    }), 410)
+
+
+@app.errorhandler(429)
+@app.errorhandler(503)
+def overloaded(exception):
+    """Return a JSON-formatted 429 or 503 response with Retry-After"""
+    response = make_response(jsonify({
+        'error': exception.name, 'message': exception.description
+    }), exception.code)
+    response.retry_after = exception.retry_after
+
+    return response
+
+
+@app.errorhandler(DeadlineExceeded)
+def deadline_exceeded(exception):
+    """Return a JSON-formatted 504 response"""
+    return make_response(jsonify({
+        'error': 'Gateway Timeout', 'message': str(exception)
+    }), 504)
+
+
+@app.errorhandler(StorageUnavailable)
+def storage_unavailable(exception):
+    """Return a JSON-formatted 503 response with Retry-After"""
+    response = make_response(jsonify({
+        'error': 'Service Unavailable', 'message': str(exception)
+    }), 503)
+    if exception.retry_after is not None:
+        response.retry_after = max(math.ceil(exception.retry_after), 1)
+
+    return response
+
+
 if __name__ == '__main__':
     HOST = os.getenv('HBNB_API_HOST', "0.0.0.0")
     PORT = os.getenv('HBNB_API_PORT', 5000)
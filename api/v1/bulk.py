@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""
+This module provides the helpers behind the bulk create routes
+(e.g. POST /states/bulk). A bulk request carries a JSON array of objects,
+or one JSON object per line with the application/x-ndjson content type.
+Every object is validated first, references such as user_id are looked up
+with one query per referenced class, and the objects are then stored with
+a single batch write. If any object is invalid nothing is stored.
+"""
+from flask import abort, jsonify, request
+
+from models import storage
+from models.engine import json_codec
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def read_items():
+    """
+    Reads the objects of a bulk request.
+
+    Returns a list of the decoded items
+    or aborts with 400 if the body is not a JSON array or NDJSON.
+    """
+    if request.mimetype == NDJSON_MIMETYPE:
+        try:
+            return [json_codec.loads(line)
+                    for line in request.get_data(as_text=True).splitlines()
+                    if line.strip()]
+        except ValueError:
+            abort(400, "Not a NDJSON")
+
+    items = request.get_json(silent=True)
+    if not isinstance(items, list):
+        abort(400, "Not a JSON array")
+
+    return items
+
+
+def bulk_create(items, required, build, references=None):
+    """
+    Validates and stores the objects of a bulk request.
+
+    Parameters:
+        items (list): The decoded items of the request.
+        required (list): The attributes every item must have.
+        build (callable): Builds the object of a valid item.
+        references (dict): Maps reference attributes (e.g. "user_id")
+            to the class of the object they point to.
+
+    Returns a 201 response with the created object of every item,
+    or a 400 response with the error of every invalid item
+    (valid items are reported with 424 since nothing was stored).
+    """
+    references = references or {}
+    known_ids = {
+        attr: storage.existing_ids(cls, {
+            item[attr] for item in items
+            if isinstance(item, dict) and isinstance(item.get(attr), str)
+        })
+        for attr, cls in references.items()
+    }
+
+    errors = {}
+    for index, item in enumerate(items):
+        error = _validate(item, required, references, known_ids)
+        if error:
+            errors[index] = error
+
+    if errors:
+        return jsonify([
+            dict(index=index, **errors[index]) if index in errors else
+            {"index": index, "status": 424, "error": "Not created"}
+            for index in range(len(items))
+        ]), 400
+
+    objs = [build(item) for item in items]
+    storage.new_many(objs)
+
+    return jsonify([
+        {"index": index, "status": 201, "object": obj.to_dict()}
+        for index, obj in enumerate(objs)
+    ]), 201
+
+
+def _validate(item, required, references, known_ids):
+    """
+    Validates one item of a bulk request.
+
+    Returns None if the item is valid, otherwise a dict
+    with the status and the error message of the item.
+    """
+    if not isinstance(item, dict):
+        return {"status": 400, "error": "Not a JSON"}
+
+    for attr in required:
+        if attr not in item:
+            return {"status": 400, "error": "Missing {}".format(attr)}
+
+    for attr in references:
+        value = item.get(attr)
+        if not isinstance(value, str) or value not in known_ids[attr]:
+            return {"status": 404, "error": "{} not found".format(attr)}
+
+    return None
@@ -0,0 +1,435 @@
+#!/usr/bin/python3
+"""
+This module caches the responses of the read routes in process memory
+(e.g. /states, /stats or a places_search body), so a repeated request
+skips the storage and the serialization. Each entry remembers the
+storage versions of the classes its response is made of, and it is only
+served while none of them changed, so a write to a class invalidates
+exactly the entries that depend on it. Entries also expire after a TTL,
+for the writes of other processes, and the least recently used ones
+are evicted once the cache is full. The responses in a binary format
+(e.g. MessagePack) are entries of their own, and next to its response
+an entry keeps its variants (the bytes compressed for a client), so a
+hot response is only compressed once.
+
+Identical requests missing the cache at the same time (e.g. when a
+popular entry expires) are coalesced: the first one computes the
+response while the others wait for it and are served its cache entry,
+so the storage does the work once instead of once per thread.
+
+An outdated entry is kept (until it is evicted, or for CACHE_STALE_TTL)
+as the last known good response of its request: while the storage is
+unavailable (its circuit breaker is open), it is served with a
+Warning: 110 header, and once the breaker half-opens a background
+request refreshes it, probing whether the storage is back.
+"""
+import io
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request
+
+from models import storage
+from models.engine.circuit_breaker import CLOSED, HALF_OPEN
+from models.engine.storage import StorageUnavailable
+
+from api.v1.admission import BATCH_ENVIRON_KEY
+from api.v1.compression import negotiate_encoding
+from api.v1.conditional import discard_validators
+from api.v1.formats import binary_format
+from api.v1.includes import included_classes
+from api.v1.serialization import streaming_requested
+
+CACHE_MAX_ENTRIES = 256
+CACHE_TTL = 60
+
+#: The seconds an outdated entry may be served while the storage
+#: is unavailable
+CACHE_STALE_TTL = 3600
+
+#: The seconds a request waits for an identical one in flight
+#: (at most until its deadline)
+SINGLE_FLIGHT_TIMEOUT = 30
+
+_ENVIRON_KEY = "hbnb.cache_entry"
+
+
+class ResponseCache:
+    """A bounded LRU cache of responses with a time to live."""
+
+    def __init__(self):
+        """Initializes an empty cache."""
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key, versions, variant=None):
+        """
+        Gets the entry of a key.
+
+        Parameters:
+            key (tuple): The key of the request.
+            versions (tuple): The current versions of its classes.
+            variant (str): The content encoding of a variant
+                of the response, None for the response itself.
+
+        Returns the cached (status, headers, body) of the response,
+        or None if it is missing, expired or made of changed classes
+        (outdated entries are kept, see get_stale).
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+
+            entry_versions, stored_at, ttl, response, variants = entry
+            if entry_versions != versions or \
+                    stored_at + ttl < time.monotonic():
+                return None
+
+            self.__entries.move_to_end(key)
+            if variant is not None:
+                return variants.get(variant)
+            return response
+
+    def get_stale(self, key, max_age):
+        """
+        Gets the last response stored for a key, even if it is
+        expired or made of changed classes.
+
+        Parameters:
+            key (tuple): The key of the request.
+            max_age (float): The age (seconds) of the oldest response
+                to return.
+
+        Returns a ((status, headers, body), age) tuple, or None.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+
+            _versions, stored_at, _ttl, response, _variants = entry
+            age = time.monotonic() - stored_at
+            if age > max_age:
+                return None
+
+            return response, age
+
+    def set(self, key, versions, response, ttl, max_entries):
+        """
+        Stores the entry of a key, evicting the least recently
+        used entries beyond max_entries.
+
+        Parameters:
+            key (tuple): The key of the request.
+            versions (tuple): The versions of its classes read before
+                the response was computed.
+            response (tuple): The (status, headers, body) to cache.
+            ttl (float): The seconds the entry lives.
+            max_entries (int): The size of the cache.
+        """
+        with self.__lock:
+            self.__entries[key] = (
+                versions, time.monotonic(), ttl, response, {})
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > max_entries:
+                self.__entries.popitem(last=False)
+
+    def set_variant(self, key, versions, variant, response):
+        """
+        Stores a variant of the response of a key, if its entry
+        is still cached for the same versions.
+
+        Parameters:
+            key (tuple): The key of the request.
+            versions (tuple): The versions of its classes.
+            variant (str): The content encoding of the variant.
+            response (tuple): The (status, headers, body) of the variant.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] == versions:
+                entry[4][variant] = response
+
+    def clear(self):
+        """Removes all the entries."""
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self):
+        """Returns the number of entries."""
+        return len(self.__entries)
+
+
+response_cache = ResponseCache()
+
+
+class SingleFlight:
+    """Tracks the computations in flight, so each key runs once."""
+
+    def __init__(self):
+        """Initializes the registry with no computation in flight."""
+        self.__calls = {}
+        self.__lock = threading.Lock()
+
+    def begin(self, key):
+        """
+        Joins the computation of a key.
+
+        Parameters:
+            key (tuple): The key of the computation.
+
+        Returns a (leader, event) tuple: leader is True if the caller
+        must compute (and then call end), otherwise event is set
+        once the computation in flight ends.
+        """
+        with self.__lock:
+            event = self.__calls.get(key)
+            if event is not None:
+                return False, event
+
+            event = self.__calls[key] = threading.Event()
+            return True, event
+
+    def end(self, key):
+        """Ends the computation of a key, waking up its waiters."""
+        with self.__lock:
+            event = self.__calls.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def __len__(self):
+        """Returns the number of computations in flight."""
+        return len(self.__calls)
+
+
+single_flight = SingleFlight()
+
+
+def cached(*classes):
+    """
+    Caches the successful responses of a read view.
+
+    Parameters:
+        *classes (class): The classes the response is made of
+            (the classes embedded with include are added).
+    """
+    def decorator(view):
+        """Wraps the view"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            """Serves the response from the cache when it is current"""
+            dependencies = included_classes(classes)
+            if current_app.config.get("CACHE_DISABLED") or any(
+                    cls.__name__ in storage.pending_changes()
+                    for cls in dependencies) or streaming_requested():
+                # The staged changes of this thread are not shared,
+                # and streamed responses are never held in memory
+                return view(*args, **kwargs)
+
+            key = _request_key()
+            versions = tuple(storage.version(cls) for cls in dependencies)
+            variant = negotiate_encoding()
+            if variant is not None:
+                entry = response_cache.get(key, versions, variant)
+                if entry is not None:
+                    return _make_response(entry)
+                request.environ[_ENVIRON_KEY] = (key, versions, variant)
+
+            entry = response_cache.get(key, versions)
+            if entry is not None:
+                return _make_response(entry)
+
+            if storage.circuit_state() != CLOSED:
+                stale = _stale_response(key)
+                if stale is not None:
+                    if storage.circuit_state() == HALF_OPEN:
+                        _refresh_in_background(
+                            view, args, kwargs, key, dependencies)
+                    return stale
+
+            try:
+                return _compute(view, args, kwargs, key, versions)
+            except StorageUnavailable:
+                stale = _stale_response(key)
+                if stale is None:
+                    raise
+                return stale
+
+        return wrapper
+
+    return decorator
+
+
+def _compute(view, args, kwargs, key, versions):
+    """
+    Computes the response of a view and caches it, or waits for the
+    identical request computing it (see SingleFlight).
+    """
+    leader, call = single_flight.begin((key, versions))
+    if not leader:
+        call.wait(_wait_timeout())
+        entry = response_cache.get(key, versions)
+        if entry is not None:
+            return _make_response(entry)
+        # Not cacheable (or too slow): compute it separately
+        return view(*args, **kwargs)
+
+    try:
+        return _store(key, versions, view(*args, **kwargs))
+    finally:
+        single_flight.end((key, versions))
+
+
+def _store(key, versions, response):
+    """
+    Caches the response of a view if it is successful and not streamed.
+
+    Returns the response (a Response object).
+    """
+    response = current_app.make_response(response)
+    if response.status_code == 200 and not response.is_streamed:
+        response_cache.set(
+            key, versions,
+            (response.status_code,
+             [(name, response.headers[name])
+              for name in ("Content-Type", "Vary")
+              if name in response.headers],
+             response.get_data()),
+            current_app.config.get("CACHE_TTL", CACHE_TTL),
+            current_app.config.get("CACHE_MAX_ENTRIES", CACHE_MAX_ENTRIES))
+
+    return response
+
+
+def _stale_response(key):
+    """
+    Builds a response from the last known good entry of a key,
+    marked stale, or returns None if there is none.
+    """
+    stale = response_cache.get_stale(
+        key, current_app.config.get("CACHE_STALE_TTL", CACHE_STALE_TTL))
+    if stale is None:
+        return None
+
+    entry, age = stale
+    response = _make_response(entry)
+    response.headers["Warning"] = '110 - "Response is Stale"'
+    response.age = int(age)
+    # Its validators and variants would describe the current state
+    discard_validators()
+    request.environ.pop(_ENVIRON_KEY, None)
+
+    return response
+
+
+def _refresh_in_background(view, args, kwargs, key, dependencies):
+    """
+    Recomputes the entry of a key in a background thread (once at a
+    time per key), so the stale response is replaced as soon as
+    the storage is back.
+    """
+    refresh_key = ("refresh",) + key
+    leader, _call = single_flight.begin(refresh_key)
+    if not leader:
+        return
+
+    app = current_app._get_current_object()
+    # A request of its own, admitted with the one that started it
+    environ = {name: value for name, value in request.environ.items()
+               if not name.startswith("hbnb.")}
+    environ[BATCH_ENVIRON_KEY] = True
+    body = request.get_data()
+    environ["wsgi.input"] = io.BytesIO(body)
+    environ["CONTENT_LENGTH"] = str(len(body))
+
+    def refresh():
+        """Recompute and cache the response"""
+        try:
+            # Leaving the context releases the storage of this thread,
+            # with the app context it pushes (see close_storage)
+            with app.request_context(environ):
+                versions = tuple(
+                    storage.version(cls) for cls in dependencies)
+                _store(key, versions, view(*args, **kwargs))
+        except StorageUnavailable:
+            pass
+        except Exception:
+            app.logger.exception("Cache refresh failed: %s", key[0])
+        finally:
+            single_flight.end(refresh_key)
+
+    threading.Thread(target=refresh, daemon=True).start()
+
+
+def init_app(app):
+    """
+    Registers the hook storing the variants of the cached responses
+    (it must run after the hook compressing them).
+    """
+
+    @app.after_request
+    def store_variant(response):
+        """Keep the final bytes of a cached response for the next hits"""
+        cache_entry = request.environ.pop(_ENVIRON_KEY, None)
+        if cache_entry is None or response.status_code != 200 or \
+                response.is_streamed:
+            return response
+
+        if response.content_encoding:
+            key, versions, variant = cache_entry
+            headers = [(name, response.headers[name])
+                       for name in ("Content-Type", "Content-Encoding",
+                                    "Vary")
+                       if name in response.headers]
+            response_cache.set_variant(
+                key, versions, variant,
+                (response.status_code, headers, response.get_data()))
+
+        return response
+
+
+def _wait_timeout():
+    """
+    Returns the seconds a request waits for an identical one
+    in flight, bounded by its deadline.
+    """
+    timeout = current_app.config.get(
+        "SINGLE_FLIGHT_TIMEOUT", SINGLE_FLIGHT_TIMEOUT)
+    time_left = storage.time_left()
+    if time_left is not None:
+        timeout = max(min(timeout, time_left), 0)
+
+    return timeout
+
+
+def _make_response(entry):
+    """Builds a response from a cached (status, headers, body)."""
+    status, headers, body = entry
+    return current_app.response_class(body, status=status, headers=headers)
+
+
+def _request_key():
+    """
+    Builds the cache key of the current request from its route,
+    arguments, normalized JSON body and binary format. A body JSON
+    cannot encode (e.g. a MessagePack body with bytes values or mixed
+    key types) is keyed by its raw bytes and content type.
+    """
+    body = request.get_json(silent=True) if request.method == "POST" \
+        else None
+    try:
+        body = json.dumps(body, sort_keys=True)
+    except (TypeError, ValueError):
+        body = (request.mimetype, request.get_data())
+
+    return (
+        request.endpoint,
+        tuple(sorted(request.view_args.items())),
+        tuple(sorted(request.args.items(multi=True))),
+        body,
+        binary_format()
+    )
@@ -0,0 +1,221 @@
+#!/usr/bin/python3
+"""
+This module compresses the responses of the API with the encoding the
+client prefers in its Accept-Encoding header: zstd, br or gzip.
+zstd and br are optional and only offered when their library
+(zstandard, brotli) is installed. Bodies smaller than
+COMPRESS_MIN_SIZE are sent as they are, and streamed bodies are
+compressed chunk by chunk, flushing each one so the client still gets
+the first objects at once. A compressed response gets its own ETag
+(the ETag of the identity response with a -<encoding> suffix), and
+the suffix is ignored when If-None-Match is evaluated.
+"""
+import re
+import zlib
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESS_MIN_SIZE = 1024
+
+#: The mimetypes worth compressing (besides text/*)
+COMPRESSIBLE_MIMETYPES = {
+    "application/json", "application/x-ndjson", "application/javascript",
+    "application/msgpack", "application/x-msgpack", "application/cbor"
+}
+
+_ENVIRON_KEY = "hbnb.etag_encoding"
+
+
+class _GzipStream:
+    """A gzip compressor."""
+
+    def __init__(self):
+        """Starts a gzip stream."""
+        self.__compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        """Compresses data, returning the bytes ready so far."""
+        return self.__compressor.compress(data)
+
+    def flush(self):
+        """Returns the compressed bytes of all the data given so far."""
+        return self.__compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        """Ends the stream, returning its last bytes."""
+        return self.__compressor.flush()
+
+
+class _BrotliStream:
+    """A brotli compressor."""
+
+    def __init__(self):
+        """Starts a brotli stream."""
+        self.__compressor = brotli.Compressor(quality=4)
+
+    def compress(self, data):
+        """Compresses data, returning the bytes ready so far."""
+        return self.__compressor.process(data)
+
+    def flush(self):
+        """Returns the compressed bytes of all the data given so far."""
+        return self.__compressor.flush()
+
+    def finish(self):
+        """Ends the stream, returning its last bytes."""
+        return self.__compressor.finish()
+
+
+class _ZstdStream:
+    """A zstd compressor."""
+
+    def __init__(self):
+        """Starts a zstd stream."""
+        self.__compressor = zstandard.ZstdCompressor(level=3).compressobj()
+
+    def compress(self, data):
+        """Compresses data, returning the bytes ready so far."""
+        return self.__compressor.compress(data)
+
+    def flush(self):
+        """Returns the compressed bytes of all the data given so far."""
+        return self.__compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        """Ends the stream, returning its last bytes."""
+        return self.__compressor.flush()
+
+
+#: The encodings of the installed libraries, preferred first
+ENCODINGS = {}
+if zstandard is not None:
+    ENCODINGS["zstd"] = _ZstdStream
+if brotli is not None:
+    ENCODINGS["br"] = _BrotliStream
+ENCODINGS["gzip"] = _GzipStream
+
+_ETAG_SUFFIX = re.compile(r'-(?:{})"'.format("|".join(ENCODINGS)))
+
+
+def negotiate_encoding():
+    """
+    Negotiates the encoding of the response with the
+    Accept-Encoding header of the request.
+
+    Returns the name of the encoding (e.g. "gzip"), or None
+    if the client accepts none of them.
+    """
+    best, best_quality = None, 0
+    for encoding in ENCODINGS:
+        quality = request.accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+
+    return best
+
+
+def compress(data, encoding):
+    """
+    Compresses a whole body.
+
+    Parameters:
+        data (bytes): The body.
+        encoding (str): The name of the encoding.
+
+    Returns the compressed body (bytes).
+    """
+    stream = ENCODINGS[encoding]()
+    return stream.compress(data) + stream.finish()
+
+
+def compress_stream(chunks, encoding):
+    """
+    Compresses a streamed body, flushing the compressed bytes
+    of every chunk as soon as it is generated.
+
+    Parameters:
+        chunks (iterable): The chunks of the body (bytes).
+        encoding (str): The name of the encoding.
+
+    Returns a generator of the compressed chunks.
+    """
+    stream = ENCODINGS[encoding]()
+    try:
+        for chunk in chunks:
+            compressed = stream.compress(chunk) + stream.flush()
+            if compressed:
+                yield compressed
+        yield stream.finish()
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+def init_app(app):
+    """Registers the hooks compressing the responses."""
+
+    @app.before_request
+    def strip_etag_encoding():
+        """Compare If-None-Match with the ETag of the identity response"""
+        if_none_match = request.environ.get("HTTP_IF_NONE_MATCH")
+        if if_none_match:
+            match = _ETAG_SUFFIX.search(if_none_match)
+            if match:
+                request.environ[_ENVIRON_KEY] = match.group()[1:-1]
+                request.environ["HTTP_IF_NONE_MATCH"] = _ETAG_SUFFIX.sub(
+                    '"', if_none_match)
+
+    @app.after_request
+    def compress_response(response):
+        """Compress the body of the response with the negotiated encoding"""
+        if response.status_code == 304:
+            _set_etag_encoding(response, request.environ.get(_ENVIRON_KEY))
+            return response
+
+        if response.status_code != 200 or not (
+                response.mimetype.startswith("text/") or
+                response.mimetype in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        if response.content_encoding:
+            # Already compressed (e.g. served from the response cache)
+            _set_etag_encoding(response, response.content_encoding)
+            return response
+
+        encoding = negotiate_encoding()
+        if encoding is None or response.direct_passthrough:
+            return response
+
+        if response.is_streamed:
+            response.response = compress_stream(response.response, encoding)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < current_app.config.get(
+                    "COMPRESS_MIN_SIZE", COMPRESS_MIN_SIZE):
+                return response
+            response.set_data(compress(data, encoding))
+
+        response.content_encoding = encoding
+        _set_etag_encoding(response, encoding)
+
+        return response
+
+
+def _set_etag_encoding(response, encoding):
+    """Adds the -<encoding> suffix to the ETag of a response."""
+    etag, weak = response.get_etag()
+    if etag and encoding in ENCODINGS and \
+            not etag.endswith("-" + encoding):
+        response.set_etag("{}-{}".format(etag, encoding), weak)
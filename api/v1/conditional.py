@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+"""
+This module answers conditional GET requests (If-None-Match and
+If-Modified-Since) with 304 Not Modified before anything is serialized.
+Single objects get a strong ETag and a Last-Modified date from their
+updated_at, and collections an ETag built from the sequence number of
+the last change of the classes they are made of, read from the change
+log of the storage, which all the processes share. A poll of an
+unchanged collection makes that single query of the storage.
+"""
+import hashlib
+from datetime import timezone
+from functools import wraps
+
+from flask import abort, request
+from werkzeug.http import is_resource_modified
+from werkzeug.wrappers import Response
+
+from models import storage
+
+from api.v1.includes import included_classes
+from api.v1.serialization import response_format
+
+_ENVIRON_KEY = "hbnb.validators"
+
+
+def conditional(*classes, parent=None):
+    """
+    Makes a collection view conditional on the last change of the
+    classes of its objects (and of the resources embedded with include).
+
+    Parameters:
+        *classes (class): The classes the response is made of.
+        parent (tuple): The (class, view argument) of the object the
+            collection belongs to, answered with 404 if it does not
+            exist before the validators are compared.
+    """
+    def decorator(view):
+        """Wraps the view"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            """Answers with 304 if the collection did not change"""
+            if parent and not storage.get(parent[0], kwargs.get(parent[1])):
+                abort(404)
+            etag = _etag(str(storage.last_change(included_classes(classes))))
+            _evaluate(etag)
+
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def check_object(obj):
+    """
+    Answers a request for a single object with 304 if the client
+    already has its current representation, otherwise records the
+    ETag and Last-Modified headers of the response.
+
+    Parameters:
+        obj (BaseModel): The requested object.
+    """
+    classes = included_classes((obj.__class__,))
+    parts = [obj.__class__.__name__, obj.id, obj.updated_at.isoformat()]
+    if len(classes) > 1:
+        # Embedded resources change without touching obj.updated_at
+        _evaluate(_etag(*parts, str(storage.last_change(classes))))
+        return
+
+    _evaluate(_etag(*parts),
+              obj.updated_at.astimezone(timezone.utc).replace(microsecond=0))
+
+
+def discard_validators():
+    """
+    Keeps the validators recorded for the current request off its
+    response (e.g. when it is not the current representation).
+    """
+    request.environ.pop(_ENVIRON_KEY, None)
+
+
+def init_app(app):
+    """Registers the hook setting the validators on the responses."""
+
+    @app.after_request
+    def set_validators(response):
+        """Add the ETag and Last-Modified headers of the request"""
+        validators = request.environ.get(_ENVIRON_KEY)
+        if validators and response.status_code == 200:
+            _set_validators(response, *validators)
+
+        return response
+
+
+def _evaluate(etag, last_modified=None):
+    """
+    Aborts with 304 if the request validators match,
+    otherwise records them for the response.
+    """
+    if request.method in ("GET", "HEAD") and not is_resource_modified(
+            request.environ, etag=etag, last_modified=last_modified):
+        response = Response(status=304)
+        _set_validators(response, etag, last_modified)
+        abort(response)
+
+    request.environ[_ENVIRON_KEY] = (etag, last_modified)
+
+
+def _set_validators(response, etag, last_modified):
+    """Sets the ETag and Last-Modified headers of a response."""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+
+
+def _etag(*parts):
+    """
+    Builds an ETag from the parts the representation depends on,
+    the path, the query string (e.g. fields) and the negotiated format
+    of the request.
+    """
+    parts += (request.path, request.query_string.decode(),
+              response_format())
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
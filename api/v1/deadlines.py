@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+"""
+This module gives every request of the API a deadline, so the work of
+a client that already gave up does not keep a worker busy. The timeout
+is the default of the route (REQUEST_TIMEOUT, or ROUTE_TIMEOUTS for the
+expensive routes), shortened by the X-Request-Timeout header (seconds)
+of the client. The deadline is handed to the storage, which checks it
+during its scans and statements and raises DeadlineExceeded, answered
+with 504 Gateway Timeout. The sub-requests of a batch share the
+deadline of the batch.
+"""
+import time
+
+from flask import abort, current_app, request
+
+from models import storage
+
+from api.v1.admission import BATCH_ENVIRON_KEY
+
+DEADLINE_HEADER = "X-Request-Timeout"
+
+#: The timeout (seconds) of the routes without their own
+REQUEST_TIMEOUT = 30
+
+#: The timeout (seconds) of the expensive routes, by endpoint
+ROUTE_TIMEOUTS = {
+    "app_views.places_search": 10,
+    "async_app_views.async_places_search": 10,
+    "app_views.batch": 60,
+    # The event streams end before their deadline, the clients reconnect
+    "app_views.stream_changes": 300,
+}
+
+
+def request_timeout():
+    """
+    Returns the timeout (seconds) of the current request,
+    or aborts with 400 if its X-Request-Timeout header is invalid.
+    """
+    timeouts = dict(ROUTE_TIMEOUTS,
+                    **current_app.config.get("ROUTE_TIMEOUTS", {}))
+    timeout = timeouts.get(request.endpoint, current_app.config.get(
+        "REQUEST_TIMEOUT", REQUEST_TIMEOUT))
+
+    header = request.headers.get(DEADLINE_HEADER)
+    if header is None:
+        return timeout
+
+    try:
+        client_timeout = float(header)
+    except ValueError:
+        client_timeout = 0
+    if not client_timeout > 0:
+        abort(400, "Invalid {}".format(DEADLINE_HEADER))
+
+    return min(timeout, client_timeout)
+
+
+def init_app(app):
+    """Registers the hooks setting the deadline of the requests."""
+
+    @app.before_request
+    def start_deadline():
+        """Hand the deadline of the request to the storage"""
+        if not request.environ.get(BATCH_ENVIRON_KEY):
+            storage.set_deadline(time.monotonic() + request_timeout())
+
+    @app.teardown_request
+    def clear_deadline(exception):
+        """Remove the deadline once the request (and its stream) ended"""
+        if not request.environ.get(BATCH_ENVIRON_KEY):
+            storage.set_deadline(None)
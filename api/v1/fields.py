@@ -0,0 +1,32 @@
+#!/usr/bin/python3
+"""
+This module limits the responses to the attributes requested with
+the fields query parameter (e.g. /cities/<city_id>/places?fields=id,name).
+List routes pass the fields down to the storage, so DBStorage only
+selects the matching columns; single objects and searches are
+projected by to_dict.
+"""
+from flask import abort, request
+
+
+def parse_fields(cls):
+    """
+    Reads the fields query parameter for objects of a class.
+
+    Returns the list of attribute names to return, None if the parameter
+    is missing, or aborts with 400 if one of them is unknown.
+    """
+    if "fields" not in request.args:
+        return None
+
+    names = [name.strip()
+             for name in request.args["fields"].split(",")
+             if name.strip()]
+
+    known = cls.field_names()
+    for name in names:
+        if name not in known:
+            abort(400, "Unknown field: {}".format(name))
+
+    return names
+
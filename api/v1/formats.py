@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+"""
+This module adds the binary formats MessagePack and CBOR to the API,
+for the machine clients that do not want to pay for JSON text.
+A request whose Accept header prefers one of them gets its response
+encoded in it straight from the values of the view, by jsonify (see
+CodecJSONProvider) and json_array: the same to_dict shapes, and the
+error bodies. A POST or PUT body in one of them is decoded like a JSON
+one.
+Each format is optional and only offered when its library
+(msgpack, cbor2) is installed.
+"""
+from flask import Request, current_app, request
+from werkzeug.exceptions import BadRequest
+
+from models.engine import json_codec
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+#: The binary formats of the installed libraries:
+#: mimetype -> (name, dumps, loads)
+BINARY_FORMATS = {}
+
+if msgpack is not None:
+    for _mimetype in ("application/msgpack", "application/x-msgpack"):
+        BINARY_FORMATS[_mimetype] = (
+            "msgpack",
+            lambda obj: msgpack.packb(obj, default=json_codec.default),
+            lambda data: msgpack.unpackb(data, strict_map_key=False)
+        )
+
+if cbor2 is not None:
+    BINARY_FORMATS["application/cbor"] = (
+        "cbor",
+        lambda obj: cbor2.dumps(obj, default=lambda encoder, value:
+                                encoder.encode(json_codec.default(value))),
+        cbor2.loads
+    )
+
+
+class FormatRequest(Request):
+    """A request whose get_json also decodes the binary formats."""
+
+    def get_json(self, force=False, silent=False, cache=True):
+        """
+        Decodes the body of the request, in JSON
+        or in one of the binary formats.
+
+        Parameters:
+            force (bool): Decode it as JSON whatever its mimetype.
+            silent (bool): Return None instead of raising
+                if it cannot be decoded.
+            cache (bool): Keep the decoded body for the next calls.
+
+        Returns the decoded body, or None if it is not in a known format.
+        """
+        if force or self.mimetype not in BINARY_FORMATS:
+            return super().get_json(force=force, silent=silent, cache=cache)
+
+        if cache and getattr(self, "_binary_body", None) is not None:
+            return self._binary_body
+
+        try:
+            body = BINARY_FORMATS[self.mimetype][2](
+                self.get_data(cache=cache))
+        except ValueError:
+            if silent:
+                return None
+            raise BadRequest(
+                "Failed to decode {} object".format(self.mimetype))
+
+        if cache:
+            self._binary_body = body
+        return body
+
+
+def binary_format():
+    """
+    Negotiates a binary format with the Accept header of the request.
+
+    Returns the mimetype of the binary format the client prefers
+    to JSON, or None.
+    """
+    offers = ["application/json"] + list(BINARY_FORMATS)
+    best = request.accept_mimetypes.best_match(offers)
+
+    return best if best in BINARY_FORMATS else None
+
+
+def binary_response(obj):
+    """
+    Encodes a value in the binary format negotiated by the request.
+
+    Parameters:
+        obj: The value (e.g. the dict of an object), shaped like the
+            JSON response.
+
+    Returns the response, or None if the client prefers JSON.
+    """
+    mimetype = binary_format()
+    if mimetype is None:
+        return None
+
+    response = current_app.response_class(
+        BINARY_FORMATS[mimetype][1](obj), mimetype=mimetype)
+    response.vary.add("Accept")
+
+    return response
+
+
+def init_app(app):
+    """Registers the request class decoding the binary bodies."""
+    app.request_class = FormatRequest
@@ -0,0 +1,33 @@
+#!/usr/bin/python3
+"""
+This module reads the ids query parameter of the multi-get routes
+(e.g. /places?ids=<id1>,<id2>), which return many objects at once,
+looked up with a single storage.get_many call instead of one
+request per object.
+"""
+from flask import abort, current_app, request
+
+MAX_IDS = 100
+
+
+def parse_ids(required=False):
+    """
+    Reads the ids query parameter.
+
+    Parameters:
+        required (bool): Whether the parameter must be given.
+
+    Returns the list of IDs, None if the parameter is missing, or aborts
+    with 400 if it is required and missing or has too many IDs.
+    """
+    if "ids" not in request.args:
+        if required:
+            abort(400, "Missing ids")
+        return None
+
+    ids = [_id.strip() for _id in request.args["ids"].split(",")
+           if _id.strip()]
+    if len(ids) > current_app.config.get("MAX_IDS", MAX_IDS):
+        abort(400, "Too many ids")
+
+    return ids
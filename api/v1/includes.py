@@ -0,0 +1,162 @@
+#!/usr/bin/python3
+"""
+This module embeds related resources in place and city responses,
+as requested with the include query parameter
+(e.g. /places/<place_id>?include=city,user,amenities,reviews).
+Each relation is loaded for a whole batch of objects of the response
+at once, with one storage lookup per relation, and every related object
+is serialized only once even when several objects of the batch share it.
+"""
+from itertools import islice
+
+from flask import abort, request
+
+from models import storage
+from models.engine import json_codec
+
+# Relations of each class: name -> (related class name,
+# attribute of the object, matching attribute of the related object)
+RELATIONS = {
+    "Place": {
+        "city": ("City", "city_id", "id"),
+        "user": ("User", "user_id", "id"),
+        "reviews": ("Review", "id", "place_id"),
+        "amenities": ("Amenity", None, None),
+    },
+    "City": {
+        "state": ("State", "state_id", "id"),
+        "places": ("Place", "id", "city_id"),
+    },
+}
+
+
+def parse_include(cls):
+    """
+    Reads the include query parameter for objects of a class.
+
+    Returns the list of relation names to embed
+    or aborts with 400 if one of them is unknown.
+    """
+    names = [name.strip()
+             for name in request.args.get("include", "").split(",")
+             if name.strip()]
+
+    relations = RELATIONS.get(cls.__name__, {})
+    for name in names:
+        if name not in relations:
+            abort(400, "Unknown include: {}".format(name))
+
+    return names
+
+
+def included_classes(classes):
+    """
+    Adds the classes of the resources requested with the include
+    query parameter to a tuple of classes (unknown names are ignored).
+
+    Returns the tuple of classes a response is made of.
+    """
+    names = [name.strip()
+             for name in request.args.get("include", "").split(",")]
+    included = [
+        storage.get_class(RELATIONS[cls.__name__][name][0])
+        for cls in classes for name in names
+        if name in RELATIONS.get(cls.__name__, {})
+    ]
+
+    return tuple(dict.fromkeys(tuple(classes) + tuple(included)))
+
+
+def to_dicts(objs, names, fields=None):
+    """
+    Serializes objects with their related resources embedded.
+
+    Parameters:
+        objs (list): The objects, all of the same class.
+        names (list): The names of the relations to embed.
+        fields (list): The attributes of the objects to return,
+            None for all of them (related resources are complete).
+
+    Returns a list with the dictionary of each object.
+    """
+    objs = list(objs)
+    dicts = [obj.to_dict(fields) for obj in objs]
+    if not objs:
+        return dicts
+
+    relations = RELATIONS[objs[0].__class__.__name__]
+    for name in names:
+        related_class_name, attr, related_attr = relations[name]
+        embedded = _load(objs, related_class_name, attr, related_attr)
+        for obj, dictionary in zip(objs, dicts):
+            dictionary[name] = embedded(obj)
+
+    return dicts
+
+
+def to_fragments(objs, names, fields=None, batch_size=1000):
+    """
+    Encodes objects to JSON with their related resources embedded.
+    Without relations, the encoding each object keeps is reused.
+    The objects are consumed lazily, batch_size at a time, so a
+    streamed response is generated without loading all of them.
+
+    Parameters:
+        objs (iterable): The objects, all of the same class.
+        names (list): The names of the relations to embed.
+        fields (list): The attributes of the objects to return,
+            None for all of them.
+        batch_size (int): The objects whose relations are loaded
+            with one storage lookup.
+
+    Returns a generator of the encoded JSON object (bytes) of each object.
+    """
+    if not names:
+        for obj in objs:
+            yield obj.to_json(fields)
+        return
+
+    objs = iter(objs)
+    while True:
+        batch = list(islice(objs, batch_size))
+        if not batch:
+            return
+        for dictionary in to_dicts(batch, names, fields):
+            yield json_codec.dumps(dictionary)
+
+
+def _load(objs, related_class_name, attr, related_attr):
+    """
+    Loads one relation of many objects with a single storage lookup.
+
+    Returns a function giving the serialized related resource
+    (a dict, a list of dicts or None) of an object.
+    """
+    serialized = {}
+
+    def serialize(related):
+        """Serializes a related object once"""
+        if related.id not in serialized:
+            serialized[related.id] = related.to_dict()
+        return serialized[related.id]
+
+    if attr is None:
+        amenities = storage.find_place_amenities(objs)
+        return lambda obj: [serialize(amenity)
+                            for amenity in amenities.get(obj.id, [])]
+
+    related_cls = storage.get_class(related_class_name)
+    related_objs = storage.find_by(
+        related_cls, related_attr, {getattr(obj, attr) for obj in objs})
+
+    if related_attr == "id":
+        by_id = {related.id: related for related in related_objs}
+        return lambda obj: serialize(by_id[getattr(obj, attr)]) \
+            if getattr(obj, attr) in by_id else None
+
+    groups = {}
+    for related in related_objs:
+        groups.setdefault(getattr(related, related_attr), []).append(related)
+
+    return lambda obj: [serialize(related)
+                        for related in groups.get(getattr(obj, attr), [])]
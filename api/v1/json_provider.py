@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""
+This module plugs the storage JSON codec (models.engine.json_codec)
+into Flask, so jsonify, the error handlers and request.get_json all use
+the fastest JSON library available. Responses are compact unless
+compact is set to False, in which case they are indented, and encoded
+in MessagePack or CBOR instead when the client prefers it (see
+api.v1.formats).
+"""
+import json
+
+from flask import has_request_context
+from flask.json.provider import JSONProvider
+
+from models.engine import json_codec
+
+from api.v1.formats import binary_response
+
+
+class CodecJSONProvider(JSONProvider):
+    """A Flask JSON provider backed by the storage JSON codec."""
+
+    #: Compact output, set to False for indented responses
+    compact = True
+
+    #: The mimetype of the responses
+    mimetype = "application/json"
+
+    def dumps(self, obj, **kwargs):
+        """
+        Encodes an object to a JSON string.
+
+        Parameters:
+            obj: The object to encode.
+            **kwargs: Options of the standard json module
+                (e.g. indent), which bypass the codec.
+
+        Returns:
+            str: The JSON document.
+        """
+        if kwargs:
+            kwargs.setdefault("default", json_codec.default)
+            return json.dumps(obj, **kwargs)
+
+        return json_codec.dumps(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        """
+        Decodes a JSON document.
+
+        Parameters:
+            s (str or bytes): The JSON document.
+
+        Returns:
+            The decoded object.
+        """
+        return json_codec.loads(s)
+
+    def response(self, *args, **kwargs):
+        """
+        Builds a JSON response of the given arguments
+        (a single value, several values as a list, or keyword
+        arguments as a dict), encoded straight to bytes, in the binary
+        format the request negotiated if any.
+
+        Returns:
+            Response: The JSON (or binary) response.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        response = binary_response(obj) if has_request_context() else None
+        if response is not None:
+            return response
+
+        if self.compact:
+            body = json_codec.dumps(obj)
+        else:
+            body = self.dumps(obj, indent=2).encode("utf-8")
+
+        return self._app.response_class(body, mimetype=self.mimetype)
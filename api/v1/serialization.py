@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""
+This module builds the JSON list responses of the API from the
+encoded JSON of each object (see BaseModel.to_json and
+storage.iter_json). The fragments are joined into the response body
+as they are, instead of decoding and encoding every object again.
+
+Clients accepting application/x-ndjson get one JSON object per line,
+and the stream query parameter (e.g. /states?stream=1) asks for a JSON
+array. Both are streamed: the body is generated while the storage
+iterators are consumed, so the first objects are sent at once and
+the whole collection is never held in memory.
+"""
+from flask import current_app, request, stream_with_context
+
+from models.engine import json_codec
+
+from api.v1.formats import BINARY_FORMATS, binary_response
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def response_format():
+    """
+    Negotiates the format of a response with the Accept header.
+
+    Returns "ndjson" if the client prefers application/x-ndjson,
+    the name of a binary format (e.g. "msgpack") if it prefers one,
+    otherwise "json".
+    """
+    best = request.accept_mimetypes.best_match(
+        ["application/json", NDJSON_MIMETYPE] + list(BINARY_FORMATS))
+
+    if best == NDJSON_MIMETYPE:
+        return "ndjson"
+    if best in BINARY_FORMATS:
+        return BINARY_FORMATS[best][0]
+    return "json"
+
+
+def streaming_requested():
+    """
+    Returns True if the list response of the request is streamed
+    (the binary formats are encoded from the whole list).
+    """
+    format_name = response_format()
+    return format_name == "ndjson" or (
+        format_name == "json" and
+        request.args.get("stream", "").lower() in ("1", "true"))
+
+
+def json_array(fragments):
+    """
+    Builds a JSON array (or NDJSON) response from encoded JSON values.
+
+    Parameters:
+        fragments (iterable): The encoded JSON values (bytes).
+
+    Returns a 200 response, streamed if the request asks for it.
+    """
+    if response_format() not in ("json", "ndjson"):
+        # The binary formats cannot embed the JSON values as they are
+        return binary_response(
+            [json_codec.loads(fragment) for fragment in fragments])
+
+    if response_format() == "ndjson":
+        body = _chunks(fragments, b"", b"\n", b"\n", b"")
+        response = current_app.response_class(
+            stream_with_context(body), mimetype=NDJSON_MIMETYPE)
+    elif streaming_requested():
+        body = _chunks(fragments, b"[", b",", b"]", b"[]")
+        response = current_app.response_class(
+            stream_with_context(body), mimetype="application/json")
+    else:
+        response = current_app.response_class(
+            b"[" + b",".join(fragments) + b"]", mimetype="application/json")
+
+    response.vary.add("Accept")
+    return response
+
+
+def _chunks(fragments, start, separator, end, empty):
+    """
+    Generates the body of a streamed response: the first value is sent
+    alone, then the values are grouped in chunks of STREAM_CHUNK_SIZE.
+
+    Parameters:
+        fragments (iterable): The encoded JSON values (bytes).
+        start (bytes): The bytes before the first value.
+        separator (bytes): The bytes between two values.
+        end (bytes): The bytes after the last value.
+        empty (bytes): The body without any value.
+    """
+    fragments = iter(fragments)
+    first = next(fragments, None)
+    if first is None:
+        yield empty
+        return
+
+    yield start + first
+    chunk, size = [], 0
+    for fragment in fragments:
+        chunk.append(separator + fragment)
+        size += len(fragment) + len(separator)
+        if size >= STREAM_CHUNK_SIZE:
+            yield b"".join(chunk)
+            chunk, size = [], 0
+
+    chunk.append(end)
+    yield b"".join(chunk)
@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+"""
+This module wraps every write request of the API in a storage
+transaction (a unit of work). The objects created, updated and deleted
+by the handler are only staged, and they are persisted once when the
+request ends: one commit with DBStorage, one write of the file with
+FileStorage. Requests that fail (status >= 400 or an exception) are
+rolled back instead.
+"""
+from flask import request
+
+from models import storage
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_ENVIRON_KEY = "hbnb.unit_of_work"
+
+
+def manages_transaction(view):
+    """
+    Marks a view that manages its own storage transactions,
+    so no unit of work is opened around it.
+    """
+    view.manages_transaction = True
+    return view
+
+
+def init_app(app):
+    """Registers the unit of work hooks on the application."""
+
+    @app.before_request
+    def begin_unit_of_work():
+        """Open the unit of work of a write request"""
+        view = app.view_functions.get(request.endpoint)
+        if request.method in SAFE_METHODS or \
+                getattr(view, "manages_transaction", False):
+            return
+
+        storage.begin()
+        request.environ[_ENVIRON_KEY] = "open"
+
+    @app.after_request
+    def end_unit_of_work(response):
+        """Persist the unit of work of a successful request once"""
+        if request.environ.get(_ENVIRON_KEY) != "open":
+            return response
+
+        request.environ[_ENVIRON_KEY] = "closed"
+        if response.status_code < 400:
+            storage.commit()
+        else:
+            storage.rollback()
+
+        return response
+
+    @app.teardown_request
+    def discard_unit_of_work(exception):
+        """Roll back the unit of work of a request that raised"""
+        if request.environ.get(_ENVIRON_KEY) == "open":
+            request.environ[_ENVIRON_KEY] = "closed"
+            storage.rollback()
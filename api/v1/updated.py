@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""
+This module reads the updated_since and latest query parameters of the
+list routes, which return the objects updated after a time, least
+recently updated first (e.g. /states?updated_since=2024-05-01T12:00:00),
+or the most recently updated ones, most recent first
+(e.g. /states?latest=10). Both are answered from the updated_at index
+of the storage instead of a scan of the class.
+"""
+from datetime import datetime
+
+from flask import abort, current_app, request
+
+from models import storage
+
+MAX_LATEST = 1000
+
+
+def updated_objects(cls, **filters):
+    """
+    Reads the updated_since and latest query parameters
+    for objects of a class.
+
+    Parameters:
+        cls (class): The class of the objects.
+        **filters: Attribute values the objects must have.
+
+    Returns the list of the objects selected, None if both parameters
+    are missing, or aborts with 400 if they are invalid or both given.
+    """
+    since = request.args.get("updated_since")
+    latest = request.args.get("latest")
+    if since is None and latest is None:
+        return None
+    if since is not None and latest is not None:
+        abort(400, "Use either updated_since or latest")
+
+    if since is not None:
+        return storage.modified_since(cls, _parse_time(since), **filters)
+
+    return storage.recently_updated(cls, _parse_latest(latest), **filters)
+
+
+def _parse_time(value):
+    """
+    Reads an ISO 8601 time, converting a time with an offset to the
+    local time of updated_at, or aborts with 400.
+    """
+    try:
+        since = datetime.fromisoformat(value)
+    except ValueError:
+        abort(400, "Invalid updated_since")
+
+    if since.tzinfo is not None:
+        since = since.astimezone().replace(tzinfo=None)
+
+    return since
+
+
+def _parse_latest(value):
+    """Reads the number of objects of latest, or aborts with 400"""
+    try:
+        latest = int(value)
+    except ValueError:
+        latest = 0
+    if not 0 < latest <= current_app.config.get("MAX_LATEST", MAX_LATEST):
+        abort(400, "Invalid latest")
+
+    return latest
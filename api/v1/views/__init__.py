@@ -20,3 +20,5 @@ if app_views:
     from api.v1.views.places import *
     from api.v1.views.places_reviews import *
     from api.v1.views.places_amenities import *
+    from api.v1.views.batch import *
+    from api.v1.views.changes import *
@@ -9,16 +9,38 @@ from flasgger import swag_from
 from models import storage
 from models.amenity import Amenity
 from api.v1.views import app_views
+from api.v1.bulk import bulk_create, read_items
+from api.v1.fields import parse_fields
+from api.v1.ids import parse_ids
+from api.v1.updated import updated_objects
+from api.v1.serialization import json_array
+from api.v1.cache import cached
+from api.v1.conditional import conditional, check_object
 
 
 @app_views.route("/amenities", methods=["GET"])
+@conditional(Amenity)
+@cached(Amenity)
 @swag_from('documentation/amenity/all_amenities.yml')
 def get_amenities():
-    """Return a JSON list of all Amenity objects"""
-    return jsonify([
-        amenity.to_dict()
-        for amenity in storage.all(Amenity).values()
-    ])
+    """
+    Return a JSON list of all Amenity objects, of the ones whose IDs
+    are in the ids query parameter, or of the ones updated since
+    updated_since (or the latest ones)
+    """
+    fields = parse_fields(Amenity)
+    ids = parse_ids()
+    if ids is not None:
+        return json_array(
+            amenity.to_json(fields)
+            for amenity in storage.get_many(Amenity, ids)
+        )
+
+    amenities = updated_objects(Amenity)
+    if amenities is not None:
+        return json_array(amenity.to_json(fields) for amenity in amenities)
+
+    return json_array(storage.iter_json(Amenity, fields=fields))
 
 
 @app_views.route("/amenities/<amenity_id>", methods=["GET"])
@@ -29,7 +51,8 @@ def get_amenity(amenity_id):
     if not amenity:
         abort(404)
 
-    return jsonify(amenity.to_dict())
+    check_object(amenity)
+    return jsonify(amenity.to_dict(parse_fields(Amenity)))
 
 
 @app_views.route("/amenities/<amenity_id>", methods=["DELETE"])
@@ -41,7 +64,6 @@ def delete_amenity(amenity_id):
         abort(404)
 
     amenity.delete()
-    storage.save()
 
     return jsonify({}), 200
 
@@ -63,6 +85,16 @@ def post_amenity():
     return jsonify(new_amenity.to_dict()), 201
 
 
+@app_views.route("/amenities/bulk", methods=["POST"])
+@swag_from('documentation/amenity/post_amenities_bulk.yml')
+def post_amenities_bulk():
+    """Create many Amenity objects in one batch"""
+    return bulk_create(
+        read_items(), ["name"],
+        lambda amenity_data: Amenity(name=amenity_data.get("name"))
+    )
+
+
 @app_views.route("/amenities/<amenity_id>", methods=["PUT"])
 @swag_from('documentation/amenity/put_amenity.yml')
 def put_amenity(amenity_id):
@@ -76,6 +108,5 @@ def put_amenity(amenity_id):
         abort(400, "Not a JSON")
 
     amenity.update(**amenity_data)
-    amenity.save()
 
     return jsonify(amenity.to_dict()), 200
@@ -0,0 +1,144 @@
+#!/usr/bin/python3
+"""
+This module sets up asynchronous versions of the heavy read routes
+(the collection listings and places_search) on their own blueprint,
+served under /api/v1/async/. They read through the asyncio storage
+(models.async_storage). The blueprint is only registered when the
+asyncio storage is enabled (HBNB_ASYNC_STORAGE).
+
+Flask runs each async view in an event loop of its own, in the thread
+of the request, so under a WSGI server these routes do not serve more
+requests at once than the synchronous ones (and their connections are
+not pooled): the queries of several requests only overlap when the
+application runs on an ASGI server with a pooled storage.
+"""
+from functools import wraps
+
+from flask import Blueprint, abort, request
+from flasgger import swag_from
+
+from models import async_storage
+from models.engine import json_codec
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+from api.v1.fields import parse_fields
+from api.v1.serialization import json_array
+
+async_app_views = Blueprint(
+    'async_app_views', __name__, url_prefix='/api/v1/async/'
+)
+
+
+def closes_storage(view):
+    """
+    Closes the asyncio storage session once the view is done,
+    inside the event loop the view runs in. It goes above swag_from,
+    whose wrapper is synchronous, so Flask still sees a coroutine.
+    """
+    @wraps(view)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await view(*args, **kwargs)
+        finally:
+            await async_storage.close()
+
+    return wrapper
+
+
+async def collect(dicts):
+    """Collects the values of an async iterator into a list."""
+    return [dictionary async for dictionary in dicts]
+
+
+@async_app_views.route("/states", methods=["GET"])
+@closes_storage
+@swag_from('documentation/state/all_states.yml')
+async def async_get_states():
+    """Return a JSON list of all State objects"""
+    return json_array(await collect(
+        async_storage.iter_json(State, fields=parse_fields(State))))
+
+
+@async_app_views.route("/amenities", methods=["GET"])
+@closes_storage
+@swag_from('documentation/amenity/all_amenities.yml')
+async def async_get_amenities():
+    """Return a JSON list of all Amenity objects"""
+    return json_array(await collect(
+        async_storage.iter_json(Amenity, fields=parse_fields(Amenity))))
+
+
+@async_app_views.route("/users", methods=["GET"])
+@closes_storage
+@swag_from('documentation/user/all_users.yml')
+async def async_get_users():
+    """Return a JSON list of all User objects"""
+    return json_array(await collect(
+        async_storage.iter_json(User, fields=parse_fields(User))))
+
+
+@async_app_views.route("/states/<state_id>/cities", methods=["GET"])
+@closes_storage
+@swag_from("documentation/city/cities_by_state.yml")
+async def async_get_cities(state_id):
+    """Return a JSON list of all City objects in a State"""
+    if not await async_storage.get(State, state_id):
+        abort(404)
+
+    return json_array(
+        await collect(async_storage.iter_json(
+            City, fields=parse_fields(City), state_id=state_id)))
+
+
+@async_app_views.route("/cities/<city_id>/places", methods=["GET"])
+@closes_storage
+@swag_from("documentation/place/get_places.yml")
+async def async_get_places(city_id):
+    """Return a JSON list of all Place objects in a City"""
+    if not await async_storage.get(City, city_id):
+        abort(404)
+
+    return json_array(
+        await collect(async_storage.iter_json(
+            Place, fields=parse_fields(Place), city_id=city_id)))
+
+
+@async_app_views.route("/places/<place_id>/reviews", methods=["GET"])
+@closes_storage
+@swag_from('documentation/review/get_reviews.yml')
+async def async_get_reviews(place_id):
+    """Return a JSON list of all Review objects of a Place"""
+    if not await async_storage.get(Place, place_id):
+        abort(404)
+
+    return json_array(
+        await collect(async_storage.iter_json(
+            Review, fields=parse_fields(Review), place_id=place_id)))
+
+
+@async_app_views.route('/places_search', methods=['POST'])
+@closes_storage
+@swag_from('documentation/place/places_search.yml')
+async def async_places_search():
+    """
+    Search for Place objects based on the JSON in the request,
+    with the same filters as the synchronous places_search.
+    Return 400 if not a JSON.
+    """
+    search_data = request.get_json(silent=True)
+    if search_data is None:
+        abort(400, "Not a JSON")
+
+    places = await collect(async_storage.search_places(
+        states=search_data.get("states") or (),
+        cities=search_data.get("cities") or (),
+        amenities=search_data.get("amenities") or (),
+        fields=parse_fields(Place)
+    ))
+
+    return json_array(json_codec.dumps(place) for place in places)
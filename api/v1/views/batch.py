@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+"""
+This module sets up the batch route, which runs several API requests
+in one HTTP round trip. Each sub-request is dispatched to the matching
+app_views route inside the current application context, so all of them
+share one storage session (and, with FileStorage, one reload of the file).
+Each sub-request is its own unit of work; with "transaction": true the
+whole batch is committed once at the end, or rolled back if any
+sub-request fails.
+"""
+from flask import jsonify, abort, request, current_app
+from flasgger import swag_from
+from werkzeug.exceptions import HTTPException
+
+from models import storage
+
+from api.v1.views import app_views
+from api.v1.admission import BATCH_ENVIRON_KEY
+from api.v1.unit_of_work import manages_transaction
+
+BATCH_MAX_REQUESTS = 100
+
+
+class BatchAborted(Exception):
+    """Raised to roll back a transactional batch."""
+    pass
+
+
+@app_views.route('/batch', methods=['POST'])
+@swag_from('documentation/index/batch.yml')
+@manages_transaction
+def batch():
+    """
+    Run a list of API requests and return their results together.
+
+    The JSON should have the following keys:
+    - requests: list of {"method", "path", "body"} objects, where path is
+      relative to /api/v1 (e.g. "/places/<place_id>/reviews")
+    - transaction: if true, commit all the changes at once, or none of
+      them if any request fails (optional, default false)
+
+    Return 200 with the {"status", "body"} of every request,
+    409 if a transactional batch was rolled back,
+    or 400 if the JSON is not valid.
+    """
+    batch_data = request.get_json(silent=True)
+    if not isinstance(batch_data, dict):
+        abort(400, "Not a JSON")
+
+    sub_requests = batch_data.get("requests")
+    if not isinstance(sub_requests, list):
+        abort(400, "Missing requests")
+    if len(sub_requests) > current_app.config.get(
+            "BATCH_MAX_REQUESTS", BATCH_MAX_REQUESTS):
+        abort(400, "Too many requests")
+
+    if not batch_data.get("transaction"):
+        return jsonify(
+            {"results": [dispatch(sub) for sub in sub_requests]}), 200
+
+    results = []
+    try:
+        with storage.atomic():
+            for sub_request in sub_requests:
+                results.append(dispatch(sub_request))
+            if any(result["status"] >= 400 for result in results):
+                raise BatchAborted()
+    except BatchAborted:
+        return jsonify({"results": results}), 409
+
+    return jsonify({"results": results}), 200
+
+
+def dispatch(sub_request):
+    """
+    Dispatch one sub-request to its app_views route.
+
+    Returns a dict with the status code and the decoded body
+    of the response.
+    """
+    if not isinstance(sub_request, dict) or \
+            not isinstance(sub_request.get("path"), str):
+        return {"status": 400, "body": {"error": "Missing path"}}
+
+    path = sub_request["path"]
+    if not path.startswith(app_views.url_prefix):
+        path = app_views.url_prefix.rstrip("/") + "/" + path.lstrip("/")
+
+    method = str(sub_request.get("method", "GET")).upper()
+    adapter = current_app.url_map.bind("localhost")
+    try:
+        endpoint, _ = adapter.match(path.split("?")[0], method=method)
+    except HTTPException as err:
+        return {"status": err.code, "body": {"error": err.name}}
+
+    if not endpoint.startswith(app_views.name + ".") or \
+            endpoint == app_views.name + "." + batch.__name__:
+        return {"status": 404, "body": {"error": "Not found"}}
+
+    # The sub-requests are admitted with the batch
+    options = {"method": method, "environ_base": {BATCH_ENVIRON_KEY: True}}
+    if "body" in sub_request:
+        options["json"] = sub_request["body"]
+
+    with current_app.test_request_context(path, **options):
+        try:
+            response = current_app.full_dispatch_request()
+        except Exception:
+            current_app.logger.exception("Batch request failed: %s", path)
+            return {"status": 500, "body": {"error": "Internal error"}}
+
+        # Streamed bodies are generated within the sub-request context
+        return {
+            "status": response.status_code,
+            "body": response.get_json(silent=True)
+            if response.is_json else response.get_data(as_text=True)
+        }
@@ -0,0 +1,199 @@
+#!/usr/bin/python3
+"""
+This module sets up the change feed routes, which let a client mirror
+the objects incrementally instead of downloading everything again.
+The storage logs every object created, updated or deleted with a
+sequence number, and the token of a page is the number of its last
+change: the client passes it back as since (or as the Last-Event-ID
+of the event stream) to get the changes made after it.
+
+Within a page, only the last change of each object is returned, with
+the current object for the changes that did not delete it. Deleting
+an object also deletes the objects it owns (e.g. the cities of a
+state), which are logged as deleted too.
+"""
+import time
+
+from flask import abort, current_app, jsonify, request, stream_with_context
+from flasgger import swag_from
+
+from models import storage
+from models.engine import json_codec
+
+from api.v1.views import app_views
+
+#: The changes of a page by default, and at most
+CHANGES_PAGE_SIZE = 100
+CHANGES_MAX_PAGE_SIZE = 1000
+
+#: The seconds between two reads of the change log by an event stream
+CHANGES_POLL_INTERVAL = 1
+
+#: The seconds without changes after which an event stream sends
+#: a comment, so the proxies keep the connection open
+CHANGES_HEARTBEAT = 15
+
+
+@app_views.route("/changes", methods=["GET"])
+@swag_from('documentation/change/get_changes.yml')
+def get_changes():
+    """
+    Return the changes made after the since token,
+    with the token of the last one
+    """
+    since = parse_token(request.args.get("since", "0"))
+    classes = parse_classes()
+    limit = _page_size()
+
+    changes = storage.changes(since, limit)
+    token = changes[-1]["seq"] if changes else since
+
+    return jsonify({
+        "changes": with_objects(changes, classes),
+        "next": str(token),
+        "more": len(changes) == limit
+    })
+
+
+@app_views.route("/changes/stream", methods=["GET"])
+@swag_from('documentation/change/stream_changes.yml')
+def stream_changes():
+    """
+    Send the changes made after the since token (or the Last-Event-ID
+    header) as Server-Sent Events, until the request times out
+    """
+    since = parse_token(request.headers.get(
+        "Last-Event-ID", request.args.get("since", "0")))
+    classes = parse_classes()
+
+    response = current_app.response_class(
+        stream_with_context(_events(since, classes)),
+        mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    # Do not let the proxies (e.g. nginx) buffer the events
+    response.headers["X-Accel-Buffering"] = "no"
+
+    return response
+
+
+def parse_token(token):
+    """
+    Reads a change token.
+
+    Returns its sequence number (int), or aborts with 400 if it is
+    invalid, or with 410 if it is ahead of the change log (the log was
+    reset, the client has to download everything again).
+    """
+    try:
+        since = int(token)
+    except ValueError:
+        since = -1
+    if since < 0:
+        abort(400, "Invalid since")
+    if since > storage.last_change():
+        abort(410, "Unknown since, the change log was reset")
+
+    return since
+
+
+def parse_classes():
+    """
+    Reads the classes query parameter (e.g. classes=State,City).
+
+    Returns the set of class names, None for all of them, or aborts
+    with 400 if a class is unknown.
+    """
+    if "classes" not in request.args:
+        return None
+
+    names = {name.strip() for name in request.args["classes"].split(",")
+             if name.strip()}
+    if not names or not names <= set(storage.get_classes_names()):
+        abort(400, "Invalid classes")
+
+    return names
+
+
+def with_objects(changes, classes=None):
+    """
+    Keeps the last change of each object of the classes, and adds the
+    current object (as returned by to_dict) to the changes that did
+    not delete it.
+
+    Parameters:
+        changes (list): The changes (see storage.changes).
+        classes (set): The class names to keep, None for all of them.
+
+    Returns a list of the changes, ordered by sequence number.
+    """
+    last = {}
+    for change in changes:
+        if classes is None or change["class"] in classes:
+            key = (change["class"], change["id"])
+            last.pop(key, None)
+            last[key] = change
+
+    ids = {}
+    for class_name, _id in last:
+        ids.setdefault(class_name, []).append(_id)
+    objects = {
+        (class_name, obj.id): obj.to_dict()
+        for class_name, class_ids in ids.items()
+        for obj in storage.get_many(storage.get_class(class_name), class_ids)
+    }
+
+    for key, change in last.items():
+        if change["op"] != "delete" and key in objects:
+            change["object"] = objects[key]
+
+    return list(last.values())
+
+
+def _page_size():
+    """Reads the limit query parameter, or aborts with 400"""
+    try:
+        limit = int(request.args.get("limit", CHANGES_PAGE_SIZE))
+    except ValueError:
+        limit = 0
+    if not 0 < limit <= CHANGES_MAX_PAGE_SIZE:
+        abort(400, "Invalid limit")
+
+    return limit
+
+
+def _events(since, classes):
+    """
+    Generates the events of the changes made after a sequence number,
+    reading the change log every CHANGES_POLL_INTERVAL seconds, and
+    ends before the deadline of the request (the clients reconnect
+    with the Last-Event-ID of the last event).
+    """
+    poll_interval = current_app.config.get(
+        "CHANGES_POLL_INTERVAL", CHANGES_POLL_INTERVAL)
+    heartbeat = current_app.config.get(
+        "CHANGES_HEARTBEAT", CHANGES_HEARTBEAT)
+
+    # The delay (milliseconds) before the client reconnects
+    yield "retry: {}\n\n".format(int(poll_interval * 1000))
+
+    last_sent = time.monotonic()
+    while True:
+        changes = storage.changes(since, CHANGES_MAX_PAGE_SIZE)
+        for change in with_objects(changes, classes):
+            yield "id: {}\nevent: change\ndata: {}\n\n".format(
+                change["seq"], json_codec.dumps(change).decode())
+            last_sent = time.monotonic()
+        if changes:
+            since = changes[-1]["seq"]
+            if len(changes) == CHANGES_MAX_PAGE_SIZE:
+                continue
+
+        time_left = storage.time_left()
+        if time_left is not None and time_left <= poll_interval:
+            return
+
+        if time.monotonic() - last_sent >= heartbeat:
+            yield ": keepalive\n\n"
+            last_sent = time.monotonic()
+
+        time.sleep(poll_interval)
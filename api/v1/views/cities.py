@@ -10,20 +10,56 @@ from models.state import State
 from models.city import City
 from models import storage
 from api.v1.views import app_views
+from api.v1.bulk import bulk_create, read_items
+from api.v1.includes import parse_include, to_dicts, to_fragments
+from api.v1.fields import parse_fields
+from api.v1.ids import parse_ids
+from api.v1.updated import updated_objects
+from api.v1.serialization import json_array
+from api.v1.cache import cached
+from api.v1.conditional import conditional, check_object
 
 
 @app_views.route("/states/<state_id>/cities/", methods=["GET"])
+@conditional(State, City, parent=(State, "state_id"))
+@cached(State, City)
 @swag_from("documentation/city/cities_by_state.yml")
 def get_cities(state_id):
-    """Return a JSON list of all City objects in a State"""
+    """
+    Return a JSON list of all City objects in a State, or of the ones
+    updated since updated_since (or the latest ones)
+    """
     state = storage.get(State, state_id)
     if not state:
         abort(404)
 
-    return jsonify([
-        city.to_dict()
-        for city in state.cities
-    ])
+    include = parse_include(City)
+    fields = parse_fields(City)
+    cities = updated_objects(City, state_id=state.id)
+    if include:
+        if cities is None:
+            cities = storage.find_by(City, "state_id", [state.id])
+        return json_array(to_fragments(cities, include, fields))
+    if cities is not None:
+        return json_array(city.to_json(fields) for city in cities)
+
+    return json_array(
+        storage.iter_json(City, fields=fields, state_id=state.id))
+
+
+@app_views.route("/cities", methods=["GET"])
+@conditional(City)
+@cached(City)
+@swag_from("documentation/city/get_cities_by_ids.yml")
+def get_cities_by_ids():
+    """
+    Return a JSON list of the City objects
+    whose IDs are in the ids query parameter
+    """
+    cities = storage.get_many(City, parse_ids(required=True))
+
+    return json_array(
+        to_fragments(cities, parse_include(City), parse_fields(City)))
 
 
 @app_views.route("/cities/<city_id>", methods=["GET"])
@@ -34,7 +70,9 @@ def get_city(city_id):
     if not city:
         abort(404)
 
-    return jsonify(city.to_dict())
+    check_object(city)
+    return jsonify(
+        to_dicts([city], parse_include(City), parse_fields(City))[0])
 
 
 @app_views.route("/cities/<city_id>", methods=["DELETE"])
@@ -46,7 +84,6 @@ def delete_city(city_id):
         abort(404)
 
     city.delete()
-    storage.save()
 
     return jsonify({}), 200
 
@@ -71,6 +108,20 @@ def post_city(state_id):
     return jsonify(new_city.to_dict()), 201
 
 
+@app_views.route("/states/<state_id>/cities/bulk", methods=["POST"])
+@swag_from("documentation/city/post_cities_bulk.yml")
+def post_cities_bulk(state_id):
+    """Create many City objects in a State in one batch"""
+    state = storage.get(State, state_id)
+    if not state:
+        abort(404)
+
+    return bulk_create(
+        read_items(), ["name"],
+        lambda city_data: City(name=city_data.get("name"), state_id=state_id)
+    )
+
+
 @app_views.route("/cities/<city_id>", methods=["PUT"])
 @swag_from("documentation/city/put_city.yml")
 def put_city(city_id):
@@ -84,6 +135,5 @@ def put_city(city_id):
         abort(400, "Not a JSON")
 
     city.update(**city_data)
-    city.save()
 
     return jsonify(city.to_dict()), 200
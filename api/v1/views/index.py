@@ -10,6 +10,8 @@ from flasgger import swag_from
 from models import storage
 
 from api.v1.views import app_views
+from api.v1.cache import cached
+from api.v1.conditional import conditional
 
 
 @app_views.route('/status', methods=['GET'])
@@ -20,6 +22,8 @@ def status():
 
 
 @app_views.route('/stats', methods=['GET'])
+@conditional(*storage.get_classes())
+@cached(*storage.get_classes())
 @swag_from('documentation/index/get_stats.yml')
 def get_stats():
     """ retrieves the number of each objects by type """
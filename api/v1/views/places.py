@@ -10,12 +10,23 @@ from flasgger import swag_from
 from models.user import User
 from models.city import City
 from models.place import Place
+from models.amenity import Amenity
 from models import storage
 
 from api.v1.views import app_views
+from api.v1.bulk import bulk_create, read_items
+from api.v1.includes import parse_include, to_dicts, to_fragments
+from api.v1.fields import parse_fields
+from api.v1.ids import parse_ids
+from api.v1.updated import updated_objects
+from api.v1.serialization import json_array
+from api.v1.cache import cached
+from api.v1.conditional import conditional, check_object
 
 
 @app_views.route("/cities/<city_id>/places", methods=["GET"])
+@conditional(City, Place, parent=(City, "city_id"))
+@cached(City, Place)
 @swag_from("documentation/place/get_places.yml")
 def get_places(city_id):
     """
@@ -24,15 +35,44 @@ def get_places(city_id):
 
     Return 200 status code with the list of Place objects
     with City with <city_id> in JSON format if success.
+    The include query parameter embeds related resources, and the
+    updated_since (or latest) query parameter selects the places
+    updated since a time (or the latest ones).
     """
     city = storage.get(City, city_id)
     if not city:
         abort(404)
 
-    return jsonify([
-        place.to_dict()
-        for place in city.places
-    ])
+    include = parse_include(Place)
+    fields = parse_fields(Place)
+    places = updated_objects(Place, city_id=city.id)
+    if include:
+        if places is None:
+            places = storage.find_by(Place, "city_id", [city.id])
+        return json_array(to_fragments(places, include, fields))
+    if places is not None:
+        return json_array(place.to_json(fields) for place in places)
+
+    return json_array(
+        storage.iter_json(Place, fields=fields, city_id=city.id))
+
+
+@app_views.route("/places", methods=["GET"])
+@conditional(Place)
+@cached(Place)
+@swag_from("documentation/place/get_places_by_ids.yml")
+def get_places_by_ids():
+    """
+    Return a JSON list of the Place objects
+    whose IDs are in the ids query parameter.
+
+    Return 400 if the ids are missing or too many.
+    The include query parameter embeds related resources.
+    """
+    places = storage.get_many(Place, parse_ids(required=True))
+
+    return json_array(
+        to_fragments(places, parse_include(Place), parse_fields(Place)))
 
 
 @app_views.route("/places/<place_id>", methods=["GET"])
@@ -43,12 +83,15 @@ def get_place(place_id):
     or 404 error if not found.
 
     Return 200 status code with the Place object in JSON format if success.
+    The include query parameter embeds related resources.
     """
     place = storage.get(Place, place_id)
     if not place:
         abort(404)
 
-    return jsonify(place.to_dict())
+    check_object(place)
+    return jsonify(
+        to_dicts([place], parse_include(Place), parse_fields(Place))[0])
 
 
 @app_views.route("/places/<place_id>", methods=["DELETE"])
@@ -64,7 +107,6 @@ def delete_place(place_id):
         abort(404)
 
     place.delete()
-    storage.save()
 
     return jsonify({}), 200
 
@@ -102,6 +144,29 @@ def post_place(city_id):
     return jsonify(new_place.to_dict()), 201
 
 
+@app_views.route("/cities/<city_id>/places/bulk", methods=["POST"])
+@swag_from("documentation/place/post_places_bulk.yml")
+def post_places_bulk(city_id):
+    """
+    Create many Place objects in a City object with city_id in one batch.
+
+    Return 404 if city_id is not linked to any City object.
+    Every place needs a name and the user_id of an existing User.
+
+    Return 201 status code with the new Place objects if success,
+    or 400 with the error of each invalid place (nothing is created).
+    """
+    city = storage.get(City, city_id)
+    if not city:
+        abort(404)
+
+    return bulk_create(
+        read_items(), ["user_id", "name"],
+        lambda place_data: Place(**dict(place_data, city_id=city_id)),
+        references={"user_id": User}
+    )
+
+
 @app_views.route("/places/<place_id>", methods=["PUT"])
 @swag_from("documentation/place/put_place.yml")
 def put_place(place_id):
@@ -120,12 +185,12 @@ def put_place(place_id):
         abort(400, "Not a JSON")
 
     place.update(**place_data)
-    place.save()
 
     return jsonify(place.to_dict()), 200
 
 
 @app_views.route('/places_search', methods=['POST'])
+@cached(Place, City, Amenity)
 @swag_from('documentation/place/places_search.yml')
 def places_search():
     """
@@ -142,6 +207,7 @@ def places_search():
         (AND logic) (empty list means all)
 
     If the JSON is empty, return all Place objects.
+    The include query parameter embeds related resources.
 
     Return 200 with a list of Place objects in JSON format if success.
     """
@@ -151,11 +217,38 @@ def places_search():
     if search_data is None:
         abort(400, "Not a JSON")
 
-    # Fetch all places
-    places = storage.all(Place).values()
+    include = parse_include(Place)
+    fields = parse_fields(Place)
+
+    # Return JSON response with list of place dictionaries
+    # (with the requested related resources embedded), encoding
+    # each place as soon as it matches
+    return json_array(
+        to_fragments(_matching_places(search_data), include, fields))
+
 
-    # List to store filtered places
-    filtered_places = []
+def _matching_places(search_data):
+    """
+    Generate the Place objects matching the filters of a search.
+
+    The places, the states of their cities and their amenities are all
+    read before the first place is generated, so no lookup (nor those
+    of the included resources) runs while a cursor is still open.
+    """
+    # Fetch all places
+    places = list(storage.all(Place).values())
+
+    # Fetch the state of each city and the amenities of each place
+    # (with one lookup each) when the filters need them
+    city_states = {}
+    if search_data.get("states"):
+        city_states = {
+            city.id: city.state_id for city in storage.find_by(
+                City, "id", {place.city_id for place in places})
+        }
+    place_amenities = {}
+    if search_data.get("amenities"):
+        place_amenities = storage.find_place_amenities(places)
 
     # Iterate through all places
     for place in places:
@@ -166,7 +259,8 @@ def places_search():
         # Check for state filter
         if search_data.get("states"):
             # Check if place's city state matches any in search data
-            state_matches = place.city.state_id in search_data["states"]
+            state_matches = \
+                city_states.get(place.city_id) in search_data["states"]
 
             # If state filter matches, set city_matches to False (OR logic)
             city_matches = False
@@ -186,15 +280,14 @@ def places_search():
         if search_data.get("amenities"):
             # Check if all amenity IDs in search data are present \
             # in the place's amenities
+            amenity_ids = {
+                amenity.id for amenity in place_amenities[place.id]}
             amenity_matches = all(
-                amenity_id in [amenity.id for amenity in place.amenities]
+                amenity_id in amenity_ids
                 for amenity_id in search_data["amenities"]
             )
 
-        # Add place to filtered list if state or \
+        # Yield the place if state or \
         # city matches AND all amenity matches
         if (state_matches or city_matches) and amenity_matches:
-            filtered_places.append(place)
-
-    # Return JSON response with list of place dictionaries
-    return jsonify([place.to_dict() for place in filtered_places])
+            yield place
@@ -16,9 +16,15 @@ from models.place import Place
 
 from models import storage
 from api.v1.views import app_views
+from api.v1.fields import parse_fields
+from api.v1.serialization import json_array
+from api.v1.cache import cached
+from api.v1.conditional import conditional
 
 
 @app_views.route("/places/<place_id>/amenities", methods=["GET"])
+@conditional(Place, Amenity, parent=(Place, "place_id"))
+@cached(Place, Amenity)
 @swag_from("documentation/place_amenity/get_place_amenities.yml")
 def get_place_amenities(place_id):
     """
@@ -32,10 +38,11 @@ def get_place_amenities(place_id):
     if not place:
         abort(404)
 
-    return jsonify([
-        amenity.to_dict()
+    fields = parse_fields(Amenity)
+    return json_array(
+        amenity.to_json(fields)
         for amenity in place.amenities
-    ])
+    )
 
 
 @app_views.route(
@@ -62,7 +69,6 @@ def delete_place_amenity(place_id, amenity_id):
         abort(404)
 
     amenity.delete()
-    storage.save()
 
     return jsonify({}), 200
 
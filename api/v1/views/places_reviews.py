@@ -53,23 +53,57 @@ from models.user import User
 from models import storage
 
 from api.v1.views import app_views
+from api.v1.bulk import bulk_create, read_items
+from api.v1.fields import parse_fields
+from api.v1.ids import parse_ids
+from api.v1.updated import updated_objects
+from api.v1.serialization import json_array
+from api.v1.cache import cached
+from api.v1.conditional import conditional, check_object
 
 
 @app_views.route('/places/<place_id>/reviews', methods=['GET'])
+@conditional(Place, Review, parent=(Place, 'place_id'))
+@cached(Place, Review)
 @swag_from('documentation/review/get_reviews.yml')
 def get_reviews(place_id):
     """
     Retrieves the list of all Review objects of a Place.
 
-    Returns a JSON list of all Review objects of a Place
+    Returns a JSON list of all Review objects of a Place (or of the
+    ones updated since updated_since, or the latest ones)
     or a 404 error if the Place is not found.
     """
     place = storage.get(Place, place_id)
     if place is None:
         abort(404)
 
-    reviews = [review.to_dict() for review in place.reviews]
-    return jsonify(reviews)
+    fields = parse_fields(Review)
+    reviews = updated_objects(Review, place_id=place.id)
+    if reviews is not None:
+        return json_array(review.to_json(fields) for review in reviews)
+
+    return json_array(storage.iter_json(
+        Review, fields=fields, place_id=place.id))
+
+
+@app_views.route('/reviews', methods=['GET'])
+@conditional(Review)
+@cached(Review)
+@swag_from('documentation/review/get_reviews_by_ids.yml')
+def get_reviews_by_ids():
+    """
+    Retrieves the Review objects whose IDs are in the ids query parameter.
+
+    Returns a JSON list of the Review objects found
+    or a 400 error if the ids are missing or too many.
+    """
+    fields = parse_fields(Review)
+
+    return json_array(
+        review.to_json(fields)
+        for review in storage.get_many(Review, parse_ids(required=True))
+    )
 
 
 @app_views.route('/reviews/<review_id>', methods=['GET'])
@@ -85,7 +119,8 @@ def get_review(review_id):
     if review is None:
         abort(404)
 
-    return jsonify(review.to_dict())
+    check_object(review)
+    return jsonify(review.to_dict(parse_fields(Review)))
 
 
 @app_views.route('/reviews/<review_id>', methods=['DELETE'])
@@ -102,7 +137,6 @@ def delete_review(review_id):
         abort(404)
 
     storage.delete(review)
-    storage.save()
 
     return jsonify({}), 200
 
@@ -145,6 +179,29 @@ def create_review(place_id):
     return jsonify(review.to_dict()), 201
 
 
+@app_views.route('/places/<place_id>/reviews/bulk', methods=['POST'])
+@swag_from('documentation/review/post_reviews_bulk.yml')
+def create_reviews_bulk(place_id):
+    """
+    Creates many Review objects linked to a Place in one batch.
+
+    Every review needs a text and the user_id of an existing User.
+
+    Returns the new Reviews with the status code 201
+    or a 400 error with the error of each invalid review
+    (nothing is created) or a 404 error if the Place is not found.
+    """
+    place = storage.get(Place, place_id)
+    if not place:
+        abort(404)
+
+    return bulk_create(
+        read_items(), ['user_id', 'text'],
+        lambda data: Review(**dict(data, place_id=place_id)),
+        references={'user_id': User}
+    )
+
+
 @app_views.route('/reviews/<review_id>', methods=['PUT'])
 @swag_from('documentation/review/put_review.yml')
 def update_review(review_id):
@@ -166,6 +223,5 @@ def update_review(review_id):
         abort(400, 'Not a JSON')
 
     review.update(**data)
-    review.save()
 
     return jsonify(review.to_dict()), 200
@@ -12,16 +12,36 @@ from models.state import State
 
 
 from api.v1.views import app_views
+from api.v1.bulk import bulk_create, read_items
+from api.v1.fields import parse_fields
+from api.v1.ids import parse_ids
+from api.v1.updated import updated_objects
+from api.v1.serialization import json_array
+from api.v1.cache import cached
+from api.v1.conditional import conditional, check_object
 
 
 @app_views.route("/states/", methods=["GET"])
+@conditional(State)
+@cached(State)
 @swag_from('documentation/state/all_states.yml')
 def get_states():
-    """Return a JSON list of all State objects"""
-    return jsonify([
-        state.to_dict()
-        for state in storage.all(State).values()
-    ])
+    """
+    Return a JSON list of all State objects, of the ones whose IDs
+    are in the ids query parameter, or of the ones updated since
+    updated_since (or the latest ones)
+    """
+    fields = parse_fields(State)
+    ids = parse_ids()
+    if ids is not None:
+        return json_array(
+            state.to_json(fields) for state in storage.get_many(State, ids))
+
+    states = updated_objects(State)
+    if states is not None:
+        return json_array(state.to_json(fields) for state in states)
+
+    return json_array(storage.iter_json(State, fields=fields))
 
 
 @app_views.route("/states/<state_id>", methods=["GET"])
@@ -32,7 +52,8 @@ def get_state(state_id):
     if not state:
         abort(404)
 
-    return jsonify(state.to_dict())
+    check_object(state)
+    return jsonify(state.to_dict(parse_fields(State)))
 
 
 @app_views.route("/states/<state_id>", methods=["DELETE"])
@@ -44,7 +65,6 @@ def delete_state(state_id):
         abort(404)
 
     state.delete()
-    storage.save()
 
     return jsonify({}), 200
 
@@ -66,6 +86,16 @@ def post_state():
     return jsonify(new_state.to_dict()), 201
 
 
+@app_views.route("/states/bulk", methods=["POST"])
+@swag_from('documentation/state/post_states_bulk.yml')
+def post_states_bulk():
+    """Create many State objects in one batch"""
+    return bulk_create(
+        read_items(), ["name"],
+        lambda state_data: State(name=state_data.get("name"))
+    )
+
+
 @app_views.route("/states/<state_id>", methods=["PUT"])
 @swag_from('documentation/state/put_state.yml')
 def put_state(state_id):
@@ -79,6 +109,5 @@ def put_state(state_id):
         abort(400, "Not a JSON")
 
     state.update(**update_data)
-    state.save()
 
     return jsonify(state.to_dict()), 200
@@ -8,16 +8,36 @@ from flasgger import swag_from
 from models.user import User
 from models import storage
 from api.v1.views import app_views
+from api.v1.bulk import bulk_create, read_items
+from api.v1.fields import parse_fields
+from api.v1.ids import parse_ids
+from api.v1.updated import updated_objects
+from api.v1.serialization import json_array
+from api.v1.cache import cached
+from api.v1.conditional import conditional, check_object
 
 
 @app_views.route("/users", methods=["GET"])
+@conditional(User)
+@cached(User)
 @swag_from('documentation/user/all_users.yml')
 def get_users():
-    """Return a JSON list of all User objects"""
-    return jsonify([
-        user.to_dict()
-        for user in storage.all(User).values()
-    ])
+    """
+    Return a JSON list of all User objects, of the ones whose IDs
+    are in the ids query parameter, or of the ones updated since
+    updated_since (or the latest ones)
+    """
+    fields = parse_fields(User)
+    ids = parse_ids()
+    if ids is not None:
+        return json_array(
+            user.to_json(fields) for user in storage.get_many(User, ids))
+
+    users = updated_objects(User)
+    if users is not None:
+        return json_array(user.to_json(fields) for user in users)
+
+    return json_array(storage.iter_json(User, fields=fields))
 
 
 @app_views.route("/users/<user_id>", methods=["GET"])
@@ -28,7 +48,8 @@ def get_user(user_id):
     if not user:
         abort(404)
 
-    return jsonify(user.to_dict())
+    check_object(user)
+    return jsonify(user.to_dict(parse_fields(User)))
 
 
 @app_views.route("/users/<user_id>", methods=["DELETE"])
@@ -40,7 +61,6 @@ def delete_user(user_id):
         abort(404)
 
     user.delete()
-    storage.save()
 
     return jsonify({}), 200
 
@@ -64,6 +84,16 @@ def post_user():
     return jsonify(new_user.to_dict()), 201
 
 
+@app_views.route("/users/bulk", methods=["POST"])
+@swag_from('documentation/user/post_users_bulk.yml')
+def post_users_bulk():
+    """Create many User objects in one batch"""
+    return bulk_create(
+        read_items(), ["email", "password"],
+        lambda user_data: User(**user_data)
+    )
+
+
 @app_views.route("/users/<user_id>", methods=["PUT"])
 @swag_from('documentation/user/put_user.yml')
 def put_user(user_id):
@@ -77,6 +107,5 @@ def put_user(user_id):
         abort(400, "Not a JSON")
 
     user.update(**user_data)
-    user.save()
 
     return jsonify(user.to_dict()), 200
@@ -5,7 +5,7 @@ This module defines a set of commands used in an AirBnB application.
 from abc import ABC, abstractmethod
 
 from models.dict_wrapper import FrozenDict, SealedDict
-from utils import parse_value, parse_params
+from utils import parse_value, parse_params, print_list
 
 
 class AirBnBCommand(ABC):
@@ -370,14 +370,14 @@ class AllCommand(AirBnBCommand):
         """Executes the command to retrieve all objects."""
         class_name = self.__tokens['class_name']
         if not class_name:
-            print(self._storage.find_all())
+            print_list(self._storage.iter_find_all())
             return
 
         _class = self.get_class(self.__tokens)
         if not _class:
             return
 
-        print(self._storage.find_all(class_name=_class.__name__))
+        print_list(self._storage.iter_find_all(class_name=_class.__name__))
 
 
 class AbstractUpdateCommand(AirBnBCommand, ABC):
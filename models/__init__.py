@@ -2,6 +2,7 @@
 """
 Initializes Module Global Variables (Singleton)
 """
+import asyncio
 import os
 
 from models.engine.file_storage import FileStorage
@@ -13,3 +14,13 @@ else:
     storage = FileStorage()
 
 storage.reload()
+
+# Optional asyncio storage used by the async API views (HBNB_ASYNC_STORAGE)
+async_storage = None
+if os.getenv('HBNB_TYPE_STORAGE') == "db" and os.getenv('HBNB_ASYNC_STORAGE'):
+    from models.engine.async_db_storage import AsyncDBStorage
+
+    # Flask runs every async view in its own event loop, and pooled
+    # connections belong to the loop that opened them
+    async_storage = AsyncDBStorage(pooled=False)
+    asyncio.run(async_storage.reload())
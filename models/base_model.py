@@ -4,12 +4,14 @@ This module contains the BaseModel class, which serves
 as the base class for all models in the application.
 """
 import os
-from uuid import uuid4
 from datetime import datetime
 
-from sqlalchemy import Column, String, DATETIME
+from sqlalchemy import Column, DATETIME
 from sqlalchemy.ext.declarative import declarative_base
 
+from models.engine import json_codec
+from models.engine.identifiers import ID_TYPE, new_id
+
 STORAGE_TYPE = os.getenv('HBNB_TYPE_STORAGE')
 
 Base = declarative_base()
@@ -21,14 +23,16 @@ class BaseModel:
     """
 
     NOT_UPDATABLE = ["id", "created_at", "updated_at"]
+    NOT_SERIALIZABLE = []
 
     if STORAGE_TYPE == 'db':
-        id = Column(String(60), primary_key=True)
+        id = Column(ID_TYPE, primary_key=True)
         created_at = Column(DATETIME, nullable=False,
                             default=datetime.now)
+        # Indexed for the modified since and recently updated queries
         updated_at = Column(DATETIME, nullable=False,
                             default=datetime.now,
-                            onupdate=datetime.now)
+                            onupdate=datetime.now, index=True)
 
     def __init__(self, *args, **kwargs):
         """
@@ -38,21 +42,22 @@ class BaseModel:
         - *args: Variable-length argument list.
         - **kwargs: Arbitrary keyword arguments.
         """
-        self.id = kwargs.pop("id", str(uuid4()))
-
-        value = kwargs.pop("updated_at", None)
-        self.updated_at = datetime.fromisoformat(value) \
-            if value else datetime.now()
+        self.id = kwargs.pop("id") if "id" in kwargs else new_id()
 
         value = kwargs.pop("created_at", None)
         self.created_at = datetime.fromisoformat(value) \
             if value else datetime.now()
 
+        updated_at = kwargs.pop("updated_at", None)
         kwargs.pop("__class__", None)
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
 
+        # Set last, since setting attributes touches updated_at
+        self.updated_at = datetime.fromisoformat(updated_at) \
+            if updated_at else datetime.now()
+
     def save(self):
         """
         Saves the current object instance to persistent storage.
@@ -74,10 +79,13 @@ class BaseModel:
         storage.new(self)
         storage.save()
 
-    def to_dict(self):
+    def to_dict(self, fields=None):
         """
         Returns a dictionary representation of the object.
 
+        Parameters:
+        - fields (list[str]): The keys to return, None for all of them.
+
         Returns:
         - dictionary (dict[str, any]): Dictionary containing object attributes.
         """
@@ -89,9 +97,68 @@ class BaseModel:
         dictionary["__class__"] = self.__class__.__name__
 
         dictionary.pop("_sa_instance_state", None)
+        dictionary.pop("_json", None)
+        for attr in self.NOT_SERIALIZABLE:
+            dictionary.pop(attr, None)
+
+        if STORAGE_TYPE == 'db':
+            # Loaded relationships hold objects, not serializable values
+            for relation in self.__mapper__.relationships:
+                dictionary.pop(relation.key, None)
+
+        if fields is not None:
+            return {key: dictionary[key]
+                    for key in fields if key in dictionary}
 
         return dictionary
 
+    def to_json(self, fields=None):
+        """
+        Returns the JSON encoding of the dictionary representation
+        of the object. The complete representation is encoded once and
+        kept until the object changes (an attribute is set or
+        updated_at moves).
+
+        Parameters:
+        - fields (list[str]): The keys to return, None for all of them.
+
+        Returns:
+        - bytes: The UTF-8 encoded JSON object.
+        """
+        if fields is not None:
+            return json_codec.dumps(self.to_dict(fields))
+
+        cached = self.__dict__.get("_json")
+        if cached is None or cached[0] != self.updated_at:
+            cached = (self.updated_at, json_codec.dumps(self.to_dict()))
+            self.__dict__["_json"] = cached
+
+        return cached[1]
+
+    @classmethod
+    def field_names(cls):
+        """
+        Returns the names of the keys to_dict can return
+        for objects of the class.
+
+        Returns:
+        - list[str]: The serializable attribute names and "__class__".
+        """
+        if STORAGE_TYPE == 'db':
+            names = [column.name for column in cls.__table__.columns]
+        else:
+            names = list(BaseModel.NOT_UPDATABLE)
+            for klass in reversed(cls.__mro__):
+                names.extend(
+                    name for name, value in vars(klass).items()
+                    if not name.startswith("_") and not name.isupper() and
+                    not callable(value) and not isinstance(
+                        value, (property, classmethod, staticmethod))
+                )
+
+        return [name for name in dict.fromkeys(names)
+                if name not in cls.NOT_SERIALIZABLE] + ["__class__"]
+
     def delete(self):
         from models import storage
 
@@ -102,16 +169,18 @@ class BaseModel:
         Updates the object's attributes with the provided values.
 
         This method updates only the attributes of the object
-        that can be updated.
+        that can be updated, all of them in one storage write.
 
         Parameters:
             **kwargs (dict): Arbitrary keyword arguments.
         """
         from models import storage
 
-        for attr, value in kwargs.items():
-            if attr not in set(self.NOT_UPDATABLE + BaseModel.NOT_UPDATABLE):
-                storage.update(self, attr=attr, value=value)
+        not_updatable = set(self.NOT_UPDATABLE + BaseModel.NOT_UPDATABLE)
+        storage.update_many([(self, {
+            attr: value for attr, value in kwargs.items()
+            if attr not in not_updatable
+        })])
 
     def __str__(self):
         """
@@ -122,12 +191,14 @@ class BaseModel:
         """
         dictionary = dict(self.__dict__)
         dictionary.pop("_sa_instance_state", None)
+        dictionary.pop("_json", None)
 
         return "[{}] ({}) {}".format(
             self.__class__.__name__, self.id, dictionary
         )
 
-    if STORAGE_TYPE != 'db':
-        def __setattr__(self, key, value):
+    def __setattr__(self, key, value):
+        self.__dict__.pop("_json", None)
+        if STORAGE_TYPE != 'db':
             object.__setattr__(self, "updated_at", datetime.now())
-            object.__setattr__(self, key, value)
+        object.__setattr__(self, key, value)
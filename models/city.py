@@ -9,6 +9,7 @@ from sqlalchemy import Column, String, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from models.base_model import BaseModel, Base
+from models.engine.identifiers import ID_TYPE
 
 STORAGE_TYPE = os.getenv('HBNB_TYPE_STORAGE')
 
@@ -29,7 +30,7 @@ class City(*parent_classes):
         __tablename__ = 'cities'
 
         name = Column(String(128), nullable=False, index=True)
-        state_id = Column(String(60),
+        state_id = Column(ID_TYPE,
                           ForeignKey('states.id', ondelete="CASCADE"),
                           nullable=False)
         state = relationship("State", back_populates="cities")
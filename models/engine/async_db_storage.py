@@ -0,0 +1,659 @@
+#!/usr/bin/python3
+
+"""
+AsyncDBStorage Module
+
+This module defines the AsyncDBStorage class which is responsible for
+interacting with the database through the asyncio extension of SQLAlchemy.
+
+Classes:
+    - AsyncDBStorage: Implements the Storage interface with coroutines.
+
+"""
+
+import asyncio
+import os
+from datetime import datetime
+
+from sqlalchemy import delete, event, func, or_, select, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import (
+    async_scoped_session, async_sessionmaker, create_async_engine
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.pool import NullPool
+
+from models.base_model import Base
+from models.engine.db_storage import DBStorage
+from models.engine import json_codec
+from models.engine.storage import Storage
+
+#: The asyncio driver of each database backend
+ASYNC_DRIVERS = {"mysql": "mysql+aiomysql", "sqlite": "sqlite+aiosqlite"}
+
+
+class _SyncSession(Session):
+    """The sessions the asyncio sessions of AsyncDBStorage run on."""
+    pass
+
+
+class AsyncDBStorage(Storage):
+    """
+    AsyncDBStorage class represents the database storage system using
+    the asyncio extension of SQLAlchemy.
+
+    It has the same methods as DBStorage, but every method that talks
+    to the database is a coroutine (or an async generator for the
+    iterators), so one event loop can wait on many slow queries at once.
+    Sessions are scoped to the current asyncio task.
+
+    Flask runs each async view to completion in an event loop of its
+    own, in the thread of the request, so under a WSGI server the async
+    views do not serve more requests at once than the synchronous ones
+    and the connections cannot be pooled across requests. Only an ASGI
+    server, with a single event loop and a pooled storage, lets the
+    queries of several requests overlap.
+
+    Like DBStorage, every flush and bulk statement changes the versions
+    of the classes and logs its changes in the ``changes`` table, in
+    the same transaction.
+    """
+    __engine = None
+    __session = None
+
+    def __init__(self, pooled=True):
+        """
+        Initialize the AsyncDBStorage instance.
+
+        ``HBNB_ASYNC_DB_URL`` takes a full async database URL
+        (e.g. ``sqlite+aiosqlite:///hbnb.db``), otherwise the URL of
+        DBStorage (``HBNB_DB_URL`` or the ``HBNB_MYSQL_*`` variables) is
+        used with the asyncio driver of its backend (see ASYNC_DRIVERS).
+
+        Parameters:
+            pooled (bool): Whether connections are pooled. Pooled
+                connections belong to the event loop that opened them,
+                so callers that run every coroutine in a new loop
+                must disable pooling.
+        """
+        url = os.getenv('HBNB_ASYNC_DB_URL')
+        if not url:
+            url = make_url(
+                os.getenv('HBNB_DB_URL') or DBStorage._mysql_urls()[0])
+            url = url.set(drivername=ASYNC_DRIVERS.get(
+                url.get_backend_name(), url.drivername))
+
+        options = {} if pooled else {"poolclass": NullPool}
+        AsyncDBStorage.__engine = create_async_engine(
+            url, pool_pre_ping=True, **options)
+        DBStorage._watch_engine(AsyncDBStorage.__engine.sync_engine)
+
+        if os.getenv('HBNB_ENV') == 'test':
+            asyncio.run(self._drop_all())
+
+    async def _drop_all(self):
+        """Drops every table, used by the test environment."""
+        async with self.__engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+
+    async def all(self, cls=None):
+        """
+        Retrieve all objects of a given class from the database.
+
+        Parameters:
+            cls (class): The class of objects to retrieve.
+
+        Returns:
+            dict: A dictionary of objects, where keys are object IDs.
+        """
+        return {
+            self._get_obj_key(obj.__class__.__name__, obj.id): obj
+            async for obj in self.iter_all(cls)
+        }
+
+    async def iter_all(self, cls=None, batch_size=1000):
+        """
+        Iterate over all objects of a given class from the database,
+        streaming the rows batch_size at a time.
+
+        Parameters:
+            cls (class): The class of objects to retrieve,
+                        or None for all classes.
+            batch_size (int): The number of rows fetched per batch.
+
+        Yields:
+            BaseModel: The objects of the class.
+        """
+        if cls is None:
+            classes = self.get_classes()
+        elif cls in self.get_classes():
+            classes = (cls,)
+        else:
+            return
+
+        session = self.__session()
+        try:
+            for _class in classes:
+                result = await session.stream_scalars(
+                    select(_class).execution_options(yield_per=batch_size))
+                async for obj in result:
+                    yield obj
+        except SQLAlchemyError as err:
+            await session.rollback()
+            raise err
+
+    async def iter_dicts(self, cls, batch_size=1000, fields=None,
+                         **filters):
+        """
+        Iterate over the dictionary representations of the objects
+        of a given class without building ORM objects.
+
+        Parameters:
+            cls (class): The class of objects to retrieve.
+            batch_size (int): The number of rows fetched per batch.
+            fields (list): The keys to return, None for all of them.
+                Only the matching columns are selected.
+            **filters: Column values the rows must have.
+
+        Yields:
+            dict: The objects as returned by to_dict.
+        """
+        if cls not in self.get_classes():
+            return
+
+        table = cls.__table__
+        columns = [column for column in table.columns
+                   if column.name not in cls.NOT_SERIALIZABLE and
+                   (fields is None or column.name in fields)]
+        statement = select(*(columns or [table.c.id])).where(*(
+            table.c[attr] == value for attr, value in filters.items()
+        )).execution_options(yield_per=batch_size)
+
+        session = self.__session()
+        try:
+            result = await session.stream(statement)
+            async for row in result.mappings():
+                yield DBStorage._row_to_dict(cls.__name__, row, fields)
+        except SQLAlchemyError as err:
+            await session.rollback()
+            raise err
+
+    async def iter_json(self, cls, batch_size=1000, fields=None,
+                        **filters):
+        """
+        Iterate over the JSON encodings of the objects of a given class.
+
+        Parameters:
+            cls (class): The class of objects to retrieve.
+            batch_size (int): The number of rows fetched per batch.
+            fields (list): The keys to return, None for all of them.
+            **filters: Column values the rows must have.
+
+        Yields:
+            bytes: The objects as encoded JSON objects.
+        """
+        async for dictionary in self.iter_dicts(
+                cls, batch_size, fields, **filters):
+            yield json_codec.dumps(dictionary)
+
+    async def search_places(self, states=(), cities=(), amenities=(),
+                            batch_size=1000, fields=None):
+        """
+        Iterate over the places matching the places_search filters,
+        filtering in SQL instead of loading every place.
+
+        A place matches when its city is in one of the states or is one
+        of the cities (all places when both are empty) and it has every
+        one of the amenities.
+
+        Parameters:
+            states (list): State ids (OR logic).
+            cities (list): City ids (OR logic).
+            amenities (list): Amenity ids (AND logic).
+            batch_size (int): The number of rows fetched per batch.
+            fields (list): The keys to return, None for all of them.
+                Only the matching columns are selected.
+
+        Yields:
+            dict: The matching places as returned by to_dict.
+        """
+        place_cls = self.get_class("Place")
+        city_cls = self.get_class("City")
+        amenity_cls = self.get_class("Amenity")
+
+        location = []
+        if states:
+            location.append(place_cls.city_id.in_(
+                select(city_cls.id).where(city_cls.state_id.in_(states))))
+        if cities:
+            location.append(place_cls.city_id.in_(cities))
+
+        columns = [column for column in place_cls.__table__.columns
+                   if fields is None or column.name in fields]
+        statement = select(*(columns or [place_cls.id]))
+        if location:
+            statement = statement.where(or_(*location))
+        for amenity_id in amenities:
+            statement = statement.where(
+                place_cls.amenities.any(amenity_cls.id == amenity_id))
+
+        session = self.__session()
+        try:
+            result = await session.stream(
+                statement.execution_options(yield_per=batch_size))
+            async for row in result.mappings():
+                yield DBStorage._row_to_dict("Place", row, fields)
+        except SQLAlchemyError as err:
+            await session.rollback()
+            raise err
+
+    async def new(self, obj):
+        """
+        Adds a new object to the database session.
+
+        Parameters:
+            obj: The object to add.
+        """
+        if not obj:
+            return
+
+        session = self.__session()
+        try:
+            session.add(obj)
+            await session.flush()
+        except SQLAlchemyError as err:
+            await session.rollback()
+            raise err
+
+    async def new_many(self, objs):
+        """
+        Adds many new objects to the database in one transaction.
+
+        Parameters:
+            objs (iterable): The objects to add.
+        """
+        objs = [obj for obj in objs if obj]
+        if not objs:
+            return
+
+        session = self.__session()
+        try:
+            session.add_all(objs)
+            await session.flush()
+        except SQLAlchemyError as err:
+            await session.rollback()
+            raise err
+
+        await self.save()
+
+    async def update_many(self, updates):
+        """
+        Updates the attributes of many objects in one transaction,
+        with a single bulk UPDATE by primary key per class.
+
+        The attributes that are not columns are only set on the
+        objects (see DBStorage.update_many).
+
+        Parameters:
+            updates (iterable): (obj, {attr: value}) pairs.
+        """
+        rows_by_class = {}
+        updates = [(obj,) + DBStorage._split_columns(obj, attrs)
+                   for obj, attrs in updates if obj and attrs]
+        now = datetime.now()
+        for obj, columns, _others in updates:
+            if columns:
+                rows_by_class.setdefault(obj.__class__, []).append(
+                    dict(columns, id=obj.id, updated_at=now))
+
+        for obj, _columns, others in updates:
+            for attr, value in others.items():
+                setattr(obj, attr, value)
+        if not rows_by_class:
+            return
+
+        self._changed(*(_class.__name__ for _class in rows_by_class))
+        session = self.__session()
+        try:
+            for _class, rows in rows_by_class.items():
+                await session.execute(update(_class), rows)
+            await session.run_sync(self._log, [
+                ("update", _class.__name__, row["id"])
+                for _class, rows in rows_by_class.items() for row in rows
+            ])
+        except SQLAlchemyError as err:
+            await session.rollback()
+            raise err
+
+        await self.save()
+        for obj, columns, _others in updates:
+            if columns:
+                for attr, value in dict(columns, updated_at=now).items():
+                    set_committed_value(obj, attr, value)
+
+    async def delete_many(self, objs):
+        """
+        Deletes many objects from the database in one transaction,
+        with a single ``DELETE ... WHERE id IN`` statement per class.
+
+        Parameters:
+            objs (iterable): The objects to delete.
+        """
+        ids_by_class = {}
+        for obj in objs:
+            if obj:
+                ids_by_class.setdefault(obj.__class__, []).append(obj.id)
+
+        if not ids_by_class:
+            return
+
+        self._changed(*(_class.__name__ for _class in ids_by_class))
+        session = self.__session()
+        try:
+            await session.run_sync(self._delete_owned, ids_by_class)
+            for _class, ids in ids_by_class.items():
+                for table, column in DBStorage._association_columns(_class):
+                    await session.execute(
+                        delete(table).where(column.in_(ids)))
+                await session.execute(
+                    delete(_class).where(_class.id.in_(ids)))
+            await session.run_sync(self._log, [
+                ("delete", _class.__name__, _id)
+                for _class, ids in ids_by_class.items() for _id in ids
+            ])
+        except SQLAlchemyError as err:
+            await session.rollback()
+            raise err
+
+        await self.save()
+
+    async def save(self):
+        """
+        Commits changes to the database.
+        """
+        session = self.__session()
+        try:
+            await session.commit()
+            self._settled()
+        except SQLAlchemyError as err:
+            await session.rollback()
+            raise err
+
+    async def delete(self, obj=None):
+        """
+        Deletes an object from the database.
+
+        Parameters:
+            obj: The object to delete.
+        """
+        if not obj:
+            return
+
+        session = self.__session()
+        try:
+            await session.run_sync(
+                self._delete_owned, {obj.__class__: [obj.id]})
+            await session.delete(obj)
+            await session.flush()
+        except SQLAlchemyError as err:
+            await session.rollback()
+            raise err
+
+    async def reload(self):
+        """
+        Creates the tables and the task-scoped session registry.
+        """
+        async with self.__engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        session_factory = async_sessionmaker(
+            bind=self.__engine,
+            autoflush=False,
+            expire_on_commit=False,
+            sync_session_class=_SyncSession
+        )
+
+        AsyncDBStorage.__session = async_scoped_session(
+            session_factory, scopefunc=asyncio.current_task)
+        event.listen(_SyncSession, "after_flush", self._flushed)
+
+    def _flushed(self, session, flush_context):
+        """
+        Records the classes of the objects a flush inserts, updates
+        or deletes, and logs their changes (see DBStorage._flushed).
+        """
+        DBStorage._flushed(self, session, flush_context)
+
+    def _delete_owned(self, session, ids_by_class):
+        """
+        Deletes and logs the objects owned by objects about to be
+        deleted, in the sync session of an asyncio session (see
+        DBStorage._delete_owned).
+        """
+        DBStorage._delete_owned(self, session, ids_by_class)
+
+    @staticmethod
+    def _log(session, changes):
+        """
+        Inserts changes into the change log, in the transaction of the
+        sync session of an asyncio session (see DBStorage._log).
+        """
+        DBStorage._log(session, changes)
+
+    async def find(self, class_name, _id):
+        """
+        Finds an object in the database by its class name and ID.
+
+        Parameters:
+            class_name (str): The name of the class.
+            _id (str): The ID of the object.
+
+        Returns:
+            object: The found object, or None if not found.
+        """
+        _class = self.get_class(class_name)
+        if not _class or not _id:
+            return None
+
+        session = self.__session()
+        try:
+            return await session.get(_class, _id, populate_existing=True)
+        except SQLAlchemyError as err:
+            await session.rollback()
+            raise err
+
+    async def get(self, cls, _id):
+        """
+        Get an object by its class and ID
+
+        Parameters:
+            cls (BaseModel): the class of the object
+            _id (str): the ID of the object
+
+        Returns:
+            The object if found, otherwise None
+        """
+        if not cls or cls not in self.get_classes():
+            return None
+
+        return await self.find(cls.__name__, _id)
+
+    async def get_many(self, cls, ids):
+        """
+        Get many objects of a class by their IDs
+        with a single ``WHERE id IN`` query.
+
+        Parameters:
+            cls (BaseModel): the class of the objects
+            ids (iterable): the IDs of the objects
+
+        Returns:
+            A list of the objects found, in the order of their first ID
+        """
+        if not cls or cls not in self.get_classes():
+            return []
+
+        ids = list(dict.fromkeys(ids))
+        found = {obj.id: obj for obj in await self.find_by(cls, "id", ids)}
+
+        return [found[_id] for _id in ids if _id in found]
+
+    async def find_by(self, cls, attr, values):
+        """
+        Finds the objects of a class whose attribute is one of
+        the given values, with a single ``WHERE attr IN`` query.
+
+        Parameters:
+            cls (class): The class of the objects.
+            attr (str): The name of the column.
+            values (iterable): The accepted values.
+
+        Returns:
+            list: The objects found.
+        """
+        values = set(values)
+        if cls not in self.get_classes() or not values:
+            return []
+
+        session = self.__session()
+        try:
+            return list(await session.scalars(
+                select(cls).where(getattr(cls, attr).in_(values))))
+        except SQLAlchemyError as err:
+            await session.rollback()
+            raise err
+
+    async def existing_ids(self, cls, ids):
+        """
+        Finds which of the given IDs belong to objects of a class,
+        with a single ``SELECT id ... WHERE id IN`` query.
+
+        Parameters:
+            cls (class): The class of the objects.
+            ids (iterable): The IDs to look up.
+
+        Returns:
+            set: The IDs found.
+        """
+        ids = set(ids)
+        if cls not in self.get_classes() or not ids:
+            return set()
+
+        session = self.__session()
+        try:
+            return set(await session.scalars(
+                select(cls.id).where(cls.id.in_(ids))))
+        except SQLAlchemyError as err:
+            await session.rollback()
+            raise err
+
+    async def find_all(self, class_name=""):
+        """
+        Finds all objects of a given class from the database.
+
+        Parameters:
+            class_name (str): The name of the class.
+
+        Returns:
+            list: A list of string representations of the objects.
+        """
+        return [string async for string in self.iter_find_all(class_name)]
+
+    async def iter_find_all(self, class_name=""):
+        """
+        Iterates over the string representations of all objects
+        of a given class, or of all classes if class_name is empty.
+
+        Parameters:
+            class_name (str): The name of the class.
+
+        Yields:
+            str: The string representations of the objects.
+        """
+        _class = self.get_class(class_name) if class_name else None
+        if class_name and not _class:
+            return
+
+        async for obj in self.iter_all(_class):
+            yield str(obj)
+
+    async def update(self, obj=None, attr=None, value=None):
+        """
+        Updates a single attribute of a given object with a new value.
+        Changes are flushed to the session but not committed.
+
+        Parameters:
+            obj (BaseModel): The object to be updated.
+            attr (str): The name of the attribute to update.
+            value: The new value to set for the specified attribute.
+        """
+        if not obj or attr is None:
+            return
+
+        self._changed(obj.__class__.__name__)
+        session = self.__session()
+        try:
+            await session.execute(
+                update(obj.__class__)
+                .where(obj.__class__.id == obj.id)
+                .values({attr: value})
+            )
+            await session.run_sync(
+                self._log, [("update", obj.__class__.__name__, obj.id)])
+            await session.refresh(obj)
+        except SQLAlchemyError as err:
+            await session.rollback()
+            raise err
+
+    async def count(self, cls=None):
+        """
+        Count the number of objects of a given class or all classes
+
+        Parameters:
+            cls (BaseModel): the class to count
+
+        Returns:
+            The number of objects (int)
+        """
+        if not cls:
+            total = 0
+            for _class in self.get_classes():
+                total += await self.count_by_class_name(_class.__name__)
+            return total
+
+        if cls not in self.get_classes():
+            return 0
+
+        return await self.count_by_class_name(cls.__name__)
+
+    async def count_by_class_name(self, class_name):
+        """
+        Counts the number of objects of a given class in the database.
+
+        Parameters:
+            class_name (str): The name of the class.
+
+        Returns:
+            int: The count of objects or 0 if the class is not found
+        """
+        _class = self.get_class(class_name)
+        if not _class:
+            return 0
+
+        session = self.__session()
+        try:
+            return await session.scalar(select(func.count(_class.id)))
+        except SQLAlchemyError as err:
+            await session.rollback()
+            raise err
+
+    async def close(self):
+        """
+        Remove the session of the current task.
+        """
+        await self.__session.remove()
+
+        # Uncommitted changes of the session are gone
+        self._settled()
@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""
+This module defines the CircuitBreaker class, which stops calling a
+database that keeps failing. After failure_threshold consecutive
+failures the circuit opens: calls fail at once, without waiting on
+connection attempts, for reset_timeout seconds. The circuit then
+half-opens and lets one thread probe the database: a success closes
+the circuit, a failure opens it again.
+"""
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """A thread-safe circuit breaker."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        """
+        Initializes a closed circuit.
+
+        Parameters:
+            failure_threshold (int): The consecutive failures
+                opening the circuit.
+            reset_timeout (float): The seconds the circuit stays open
+                before a probe is allowed.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.__failures = 0
+        self.__opened_at = None
+        self.__probe = None
+        self.__lock = threading.Lock()
+
+    @property
+    def state(self):
+        """The state of the circuit: CLOSED, OPEN or HALF_OPEN."""
+        with self.__lock:
+            return self.__state()
+
+    def retry_after(self):
+        """Returns the seconds until the circuit half-opens (0 if it is)."""
+        with self.__lock:
+            if self.__opened_at is None:
+                return 0
+            return max(
+                self.__opened_at + self.reset_timeout - time.monotonic(), 0)
+
+    def allow(self):
+        """
+        Asks to make a call.
+
+        Returns True if the circuit is closed, or if it is half-open
+        and the current thread may probe (the probe of another thread
+        expires after reset_timeout), otherwise False.
+        """
+        with self.__lock:
+            state = self.__state()
+            if state == CLOSED:
+                return True
+            if state == OPEN:
+                return False
+
+            thread_id = threading.get_ident()
+            now = time.monotonic()
+            if self.__probe is None or self.__probe[0] == thread_id or \
+                    now - self.__probe[1] > self.reset_timeout:
+                self.__probe = (thread_id, now)
+                return True
+
+            return False
+
+    def record_success(self):
+        """Records a successful call, closing the circuit."""
+        with self.__lock:
+            self.__failures = 0
+            self.__opened_at = None
+            self.__probe = None
+
+    def record_failure(self):
+        """Records a failed call, opening the circuit past the threshold."""
+        with self.__lock:
+            self.__failures += 1
+            if self.__opened_at is not None or \
+                    self.__failures >= self.failure_threshold:
+                # A failed probe opens the circuit again
+                self.__opened_at = time.monotonic()
+                self.__probe = None
+
+    def __state(self):
+        """Returns the state of the circuit (the lock must be held)."""
+        if self.__opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.__opened_at < self.reset_timeout:
+            return OPEN
+        return HALF_OPEN
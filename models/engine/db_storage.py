@@ -11,33 +11,127 @@ Classes:
 
 """
 
+import math
 import os
+import threading
+from datetime import datetime
+from functools import partial
+from itertools import chain, count
 
-from sqlalchemy import create_engine, func
+from sqlalchemy import (
+    DATETIME, Column, Index, Integer, String, Table, create_engine, delete,
+    event, func, select, update
+)
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from models.base_model import Base
-from models.engine.storage import Storage
+from models.engine.circuit_breaker import CLOSED, CircuitBreaker
+from models.engine.identifiers import ID_TYPE
+from models.engine.storage import (
+    DeadlineExceeded, Storage, StorageUnavailable
+)
+
+#: The change log (see Storage.changes), written in the transaction
+#: of the changes
+changes_table = Table(
+    'changes', Base.metadata,
+    Column('seq', Integer, primary_key=True, autoincrement=True),
+    Column('op', String(6), nullable=False),
+    Column('class_name', String(60), nullable=False),
+    Column('object_id', ID_TYPE, nullable=False),
+    Column('changed_at', DATETIME, nullable=False),
+    Index('ix_changes_class_name_seq', 'class_name', 'seq')
+)
 
 
 class DBStorage(Storage):
     """
     DBStorage class represents the database storage system using SQLAlchemy.
+
+    Besides the primary engine, the storage can be given read replicas
+    (``HBNB_MYSQL_READ_HOSTS`` or ``HBNB_DB_READ_URLS``). Once
+    ``read_from_replica`` is enabled for the current thread, reads go to one
+    of the replicas until the first write, after which every read of that
+    thread goes to the primary again so it always sees its own writes.
+
+    The deadline of the current thread (``Storage.set_deadline``) is
+    checked before every statement and given to the database as a
+    statement timeout: a ``MAX_EXECUTION_TIME`` hint on MySQL SELECTs,
+    a progress handler interrupting the query on SQLite.
+
+    Each engine has a circuit breaker: after ``HBNB_DB_BREAKER_THRESHOLD``
+    (5) consecutive connection failures, the statements and connection
+    attempts raise ``StorageUnavailable`` at once for
+    ``HBNB_DB_BREAKER_RESET`` (30) seconds, then one thread probes the
+    database again.
+
+    Every flush and bulk statement also inserts its changes into the
+    ``changes`` table, in the same transaction. The sequence numbers are
+    given at flush time, so with concurrent transactions a change may be
+    committed after one with a higher number.
     """
     __engine = None
     __session = None
+    __read_engines = ()
+    __read_sessions = ()
+    __route = threading.local()
+    __replica_counter = count()
+    __breakers = {}
 
     def __init__(self):
         """
         Initialize the DBStorage instance.
         Connects to the database and creates a session.
+
+        ``HBNB_DB_URL`` and ``HBNB_DB_READ_URLS`` (comma separated) take
+        full database URLs and override the ``HBNB_MYSQL_*`` variables,
+        e.g. to run against local SQLite files.
+        """
+        hbnb_env = os.getenv('HBNB_ENV')
+        url = os.getenv('HBNB_DB_URL')
+        read_urls = self._split_env('HBNB_DB_READ_URLS')
+
+        if not url:
+            url, read_urls = self._mysql_urls()
+
+        self._connect(url, read_urls)
+
+        if hbnb_env == 'test':
+            Base.metadata.drop_all(self.__engine)
+
+    @staticmethod
+    def _split_env(name):
+        """
+        Splits a comma separated environment variable.
+
+        Parameters:
+            name (str): The name of the environment variable.
+
+        Returns:
+            list: The non-empty values of the variable.
+        """
+        return [value.strip()
+                for value in os.getenv(name, "").split(",")
+                if value.strip()]
+
+    @classmethod
+    def _mysql_urls(cls):
+        """
+        Builds the primary and replica MySQL URLs
+        from the ``HBNB_MYSQL_*`` environment variables.
+
+        Returns:
+            tuple: The primary URL (str) and the replica URLs (list).
+
+        Raises:
+            ValueError: If a connection variable is missing.
         """
         user = os.getenv('HBNB_MYSQL_USER')
         pwd = os.getenv('HBNB_MYSQL_PWD')
         host = os.getenv('HBNB_MYSQL_HOST')
         db = os.getenv('HBNB_MYSQL_DB')
-        hbnb_env = os.getenv('HBNB_ENV')
 
         missing_vars = [var_name for var_name, var_value in [
             ('HBNB_MYSQL_USER', user),
@@ -53,20 +147,173 @@ class DBStorage(Storage):
                 "{}".format(', '.join(missing_vars))
             )
 
-        self._connect(user, pwd, host, db)
+        url = "mysql+mysqldb://{}:{}@{}/{}"
 
-        if hbnb_env == 'test':
-            Base.metadata.drop_all(self.__engine)
+        return url.format(user, pwd, host, db), [
+            url.format(user, pwd, read_host, db)
+            for read_host in cls._split_env('HBNB_MYSQL_READ_HOSTS')
+        ]
 
     @classmethod
-    def _connect(cls, user, pwd, host, db, pool_pre_ping=True):
+    def _connect(cls, url, read_urls=(), pool_pre_ping=True):
         """
-        Creates a database engine connection using SQLAlchemy.
+        Creates the primary and the read replica
+        database engines using SQLAlchemy.
         """
-        cls.__engine = create_engine(
-            "mysql+mysqldb://{}:{}@{}/{}".format(user, pwd, host, db),
-            pool_pre_ping=pool_pre_ping
+        cls.__engine = create_engine(url, pool_pre_ping=pool_pre_ping)
+        cls.__read_engines = tuple(
+            create_engine(read_url, pool_pre_ping=pool_pre_ping)
+            for read_url in read_urls
         )
+        for engine in (cls.__engine,) + cls.__read_engines:
+            cls._watch_engine(engine)
+
+    @classmethod
+    def _watch_engine(cls, engine):
+        """
+        Enforces the deadline of the current thread on the statements
+        of an engine, and puts them behind a circuit breaker.
+
+        Parameters:
+            engine (Engine): The (synchronous) engine.
+        """
+        breaker = cls.__breakers[engine] = CircuitBreaker(
+            int(os.getenv('HBNB_DB_BREAKER_THRESHOLD', 5)),
+            float(os.getenv('HBNB_DB_BREAKER_RESET', 30)))
+
+        event.listen(engine, "do_connect", partial(cls._do_connect, breaker))
+        event.listen(engine, "before_cursor_execute",
+                     partial(cls._before_cursor_execute, breaker),
+                     retval=True)
+        event.listen(engine, "after_cursor_execute",
+                     partial(cls._after_cursor_execute, breaker))
+        event.listen(engine, "handle_error",
+                     partial(cls._handle_error, breaker))
+        if engine.dialect.name == "sqlite":
+            event.listen(engine, "connect", cls._sqlite_connect)
+
+    @staticmethod
+    def _check_breaker(breaker):
+        """
+        Raises StorageUnavailable if the circuit breaker
+        of an engine refuses a call.
+        """
+        if not breaker.allow():
+            raise StorageUnavailable(
+                "The database is unavailable",
+                retry_after=breaker.retry_after())
+
+    @classmethod
+    def _do_connect(cls, breaker, dialect, conn_rec, cargs, cparams):
+        """
+        Refuses to connect while the circuit is open
+        (listener of the engine do_connect event).
+        """
+        cls._check_breaker(breaker)
+
+    @classmethod
+    def _before_cursor_execute(cls, breaker, conn, cursor, statement,
+                               parameters, context, executemany):
+        """
+        Refuses to run a statement while the circuit is open or past
+        the deadline, and gives the time left to MySQL as the timeout
+        of a SELECT (listener of the engine before_cursor_execute event).
+
+        Raises:
+            StorageUnavailable: If the circuit is open.
+            DeadlineExceeded: If the deadline passed.
+        """
+        cls._check_breaker(breaker)
+        time_left = cls.time_left()
+        if time_left is None:
+            return statement, parameters
+
+        cls.check_deadline()
+        if conn.dialect.name == "mysql" and \
+                statement.lstrip()[:6].upper() == "SELECT":
+            statement = "SELECT /*+ MAX_EXECUTION_TIME({}) */{}".format(
+                math.ceil(time_left * 1000), statement.lstrip()[6:])
+
+        return statement, parameters
+
+    @staticmethod
+    def _after_cursor_execute(breaker, conn, cursor, statement,
+                              parameters, context, executemany):
+        """
+        Closes the circuit after a successful statement
+        (listener of the engine after_cursor_execute event).
+        """
+        breaker.record_success()
+
+    @classmethod
+    def _handle_error(cls, breaker, context):
+        """
+        Raises DeadlineExceeded for the statements the database
+        interrupted because of the deadline, and StorageUnavailable
+        for the lost or refused connections, which count as failures
+        of the circuit (listener of the engine handle_error event).
+        """
+        error = context.original_exception
+        if isinstance(error, (DeadlineExceeded, StorageUnavailable)):
+            return
+
+        if cls.deadline_passed():
+            raise DeadlineExceeded("The statement timed out") from error
+
+        if context.is_pre_ping:
+            # The pool reconnects, the reconnection is what counts
+            return
+
+        if context.is_disconnect or context.connection is None:
+            breaker.record_failure()
+            raise StorageUnavailable(
+                "The database is unreachable",
+                retry_after=breaker.retry_after()) from error
+
+    @classmethod
+    def _sqlite_connect(cls, dbapi_connection, connection_record):
+        """
+        Interrupts the SQLite queries running past the deadline
+        (listener of the engine connect event).
+        """
+        if hasattr(dbapi_connection, "set_progress_handler"):
+            dbapi_connection.set_progress_handler(cls.deadline_passed, 1000)
+
+    @property
+    def _reader(self):
+        """
+        The session used for reads by the current thread.
+
+        It is a replica session when routing to replicas is enabled,
+        nothing has been written yet and no transaction is open,
+        otherwise the primary session.
+        """
+        route = self.__route
+        if (not self.__read_sessions or self.in_transaction() or
+                not getattr(route, "use_replica", False) or
+                getattr(route, "wrote", False)):
+            return self.__session
+
+        if getattr(route, "replica", None) is None:
+            route.replica = next(self.__replica_counter) % \
+                len(self.__read_sessions)
+
+        return self.__read_sessions[route.replica]
+
+    def _written(self):
+        """Pins the reads of the current thread to the primary."""
+        self.__route.wrote = True
+
+    def read_from_replica(self, enabled=True):
+        """
+        Routes the reads of the current thread to a read replica.
+
+        Parameters:
+            enabled (bool): Whether reads may go to a replica.
+        """
+        self.__route.use_replica = enabled
+        self.__route.wrote = False
+        self.__route.replica = None
 
     def all(self, cls=None):
         """
@@ -82,19 +329,88 @@ class DBStorage(Storage):
         try:
             if cls is None:
                 for _class in self.get_classes():
-                    instances = self.__session.query(_class).all()
+                    instances = self._reader.query(_class).all()
                     dictionary.update(
                         self._class_to_dict(_class.__name__, instances))
             else:
-                instances = self.__session.query(cls).all()
+                instances = self._reader.query(cls).all()
                 dictionary.update(
                     self._class_to_dict(cls.__name__, instances))
         except SQLAlchemyError as err:
-            self.__session.rollback()
+            self._reader.rollback()
             raise err
 
         return dictionary
 
+    def iter_all(self, cls=None, batch_size=1000):
+        """
+        Iterate over all objects of a given class from the database.
+
+        Rows are streamed from a server-side cursor and turned into
+        objects batch_size at a time, so memory stays bounded no matter
+        how large the table is.
+
+        Parameters:
+            cls (class): The class of objects to retrieve,
+                        or None for all classes.
+            batch_size (int): The number of rows fetched per batch.
+
+        Yields:
+            BaseModel: The objects of the class.
+        """
+        if cls is None:
+            classes = self.get_classes()
+        elif cls in self.get_classes():
+            classes = (cls,)
+        else:
+            return
+
+        session = self._reader
+        try:
+            for _class in classes:
+                yield from session.query(_class).yield_per(batch_size)
+        except SQLAlchemyError as err:
+            session.rollback()
+            raise err
+
+    def iter_dicts(self, cls, batch_size=1000, fields=None, **filters):
+        """
+        Iterate over the dictionary representations of the objects
+        of a given class without building ORM objects.
+
+        Only the serializable columns are selected, and the rows are
+        turned straight into dictionaries shaped like to_dict, skipping
+        the identity map and the instance state of the ORM.
+
+        Parameters:
+            cls (class): The class of objects to retrieve.
+            batch_size (int): The number of rows fetched per batch.
+            fields (list): The keys to return, None for all of them.
+                Only the matching columns are selected.
+            **filters: Column values the rows must have.
+
+        Yields:
+            dict: The objects as returned by to_dict.
+        """
+        if cls not in self.get_classes():
+            return
+
+        table = cls.__table__
+        columns = [column for column in table.columns
+                   if column.name not in cls.NOT_SERIALIZABLE and
+                   (fields is None or column.name in fields)]
+        statement = select(*(columns or [table.c.id])).where(*(
+            table.c[attr] == value for attr, value in filters.items()
+        )).execution_options(yield_per=batch_size)
+
+        session = self._reader
+        try:
+            for row in session.execute(statement).mappings():
+                yield self._row_to_dict(cls.__name__, row, fields)
+        except SQLAlchemyError as err:
+            session.rollback()
+            raise err
+
     def new(self, obj):
         """
         Adds a new object to the database session.
@@ -105,9 +421,11 @@ class DBStorage(Storage):
         if not obj:
             return
 
+        self._written()
         try:
             self.__session.add(obj)
-            self.__session.flush()
+            if not self.in_transaction():
+                self.__session.flush()
         except SQLAlchemyError as err:
             self.__session.rollback()
             raise err
@@ -115,6 +433,24 @@ class DBStorage(Storage):
     def save(self):
         """
         Commits changes to the database.
+
+        Inside a transaction (see begin) the changes are only flushed,
+        so later reads see them, and commit() commits them once.
+        """
+        self._written()
+        try:
+            if self.in_transaction():
+                self.__session.flush()
+            else:
+                self.__session.commit()
+                self._settled()
+        except SQLAlchemyError as err:
+            self.__session.rollback()
+            raise err
+
+    def _commit(self):
+        """
+        Commits the changes staged by a transaction.
         """
         try:
             self.__session.commit()
@@ -122,6 +458,12 @@ class DBStorage(Storage):
             self.__session.rollback()
             raise err
 
+    def _rollback(self):
+        """
+        Rolls back the changes staged by a transaction.
+        """
+        self.__session.rollback()
+
     def delete(self, obj=None):
         """
         Deletes an object from the database.
@@ -132,26 +474,334 @@ class DBStorage(Storage):
         if not obj:
             return
 
+        self._written()
         try:
+            self._delete_owned(self.__session, {obj.__class__: [obj.id]})
             self.__session.delete(obj)
+            if not self.in_transaction():
+                self.__session.flush()
+        except SQLAlchemyError as err:
+            self.__session.rollback()
+            raise err
+
+    def new_many(self, objs):
+        """
+        Adds many new objects to the database in one transaction.
+
+        The objects are flushed together, so the rows of each table are
+        sent as batched multi-row INSERT statements. Either all of them
+        are committed or, on error, none.
+
+        Parameters:
+            objs (iterable): The objects to add.
+        """
+        objs = [obj for obj in objs if obj]
+        if not objs:
+            return
+
+        self._written()
+        try:
+            self.__session.add_all(objs)
             self.__session.flush()
         except SQLAlchemyError as err:
             self.__session.rollback()
             raise err
 
+        self.save()
+
+    def update_many(self, updates):
+        """
+        Updates the attributes of many objects in one transaction.
+
+        The rows of each class are updated with a single bulk UPDATE by
+        primary key, and the new values are set on the objects as
+        already persisted values. Either all updates are committed or,
+        on error, none.
+
+        The attributes that are not columns (e.g. unknown keys of a
+        request body) are only set on the objects, as before bulk
+        updates.
+
+        Parameters:
+            updates (iterable): (obj, {attr: value}) pairs.
+        """
+        rows_by_class = {}
+        updates = [(obj,) + self._split_columns(obj, attrs)
+                   for obj, attrs in updates if obj and attrs]
+        now = datetime.now()
+        for obj, columns, _others in updates:
+            if columns:
+                rows_by_class.setdefault(obj.__class__, []).append(
+                    dict(columns, id=obj.id, updated_at=now))
+
+        for obj, _columns, others in updates:
+            for attr, value in others.items():
+                setattr(obj, attr, value)
+        if not rows_by_class:
+            return
+
+        self._written()
+        self._changed(*(_class.__name__ for _class in rows_by_class))
+        try:
+            for _class, rows in rows_by_class.items():
+                self.__session.execute(update(_class), rows)
+            self._log(self.__session, [
+                ("update", _class.__name__, row["id"])
+                for _class, rows in rows_by_class.items() for row in rows
+            ])
+        except SQLAlchemyError as err:
+            self.__session.rollback()
+            raise err
+
+        self.save()
+        for obj, columns, _others in updates:
+            if columns:
+                for attr, value in dict(columns, updated_at=now).items():
+                    set_committed_value(obj, attr, value)
+
+    @staticmethod
+    def _split_columns(obj, attrs):
+        """
+        Splits attribute values into those of the mapped columns
+        of an object and the others.
+
+        Parameters:
+            obj (BaseModel): The object.
+            attrs (dict): The attribute values.
+
+        Returns:
+            tuple: The (columns, others) dicts.
+        """
+        keys = obj.__mapper__.column_attrs.keys()
+        columns = {attr: value for attr, value in attrs.items()
+                   if attr in keys}
+        others = {attr: value for attr, value in attrs.items()
+                  if attr not in columns}
+
+        return columns, others
+
+    def delete_many(self, objs):
+        """
+        Deletes many objects from the database in one transaction.
+
+        Each class is deleted with a single ``DELETE ... WHERE id IN``
+        statement, after removing the rows that link the objects in
+        association tables (e.g. place_amenity). Either all of them are
+        deleted or, on error, none.
+
+        Parameters:
+            objs (iterable): The objects to delete.
+        """
+        ids_by_class = {}
+        for obj in objs:
+            if obj:
+                ids_by_class.setdefault(obj.__class__, []).append(obj.id)
+
+        if not ids_by_class:
+            return
+
+        self._written()
+        self._changed(*(_class.__name__ for _class in ids_by_class))
+        try:
+            self._delete_owned(self.__session, ids_by_class)
+            for _class, ids in ids_by_class.items():
+                for table, column in self._association_columns(_class):
+                    self.__session.execute(
+                        delete(table).where(column.in_(ids)))
+                self.__session.execute(
+                    delete(_class).where(_class.id.in_(ids)))
+            self._log(self.__session, [
+                ("delete", _class.__name__, _id)
+                for _class, ids in ids_by_class.items() for _id in ids
+            ])
+        except SQLAlchemyError as err:
+            self.__session.rollback()
+            raise err
+
+        self.save()
+
+    def _delete_owned(self, session, ids_by_class):
+        """
+        Deletes the objects owned by objects about to be deleted (see
+        Storage.get_owned), and the objects those own, deepest first.
+        The database would cascade the deletes of most of them, but
+        deleting them here logs them and changes the versions of their
+        classes.
+
+        Parameters:
+            session (Session): The session deleting the objects.
+            ids_by_class (dict): The ids of the deleted objects by class.
+        """
+        found = {(_class, _id)
+                 for _class, ids in ids_by_class.items() for _id in ids}
+        levels = []
+        owners = ids_by_class
+        while owners:
+            level = {}
+            for owner_class, ids in owners.items():
+                for _class, attr in self.get_owned(owner_class.__name__):
+                    for _id in session.scalars(select(_class.id).where(
+                            getattr(_class, attr).in_(ids))):
+                        if (_class, _id) not in found:
+                            found.add((_class, _id))
+                            level.setdefault(_class, []).append(_id)
+            if level:
+                levels.append(level)
+            owners = level
+
+        changes = []
+        for level in reversed(levels):
+            for _class, ids in level.items():
+                for table, column in self._association_columns(_class):
+                    session.execute(delete(table).where(column.in_(ids)))
+                session.execute(delete(_class).where(_class.id.in_(ids)))
+                changes.extend(("delete", _class.__name__, _id)
+                               for _id in ids)
+
+        self._changed(*{_class.__name__
+                        for level in levels for _class in level})
+        self._log(session, changes)
+
+    @staticmethod
+    def _association_columns(cls):
+        """
+        Finds the association table columns that point to a class.
+
+        Parameters:
+            cls (class): The mapped class.
+
+        Returns:
+            list: (table, column) pairs of the association tables.
+        """
+        return [
+            (relation.secondary, column)
+            for relation in cls.__mapper__.relationships
+            if relation.secondary is not None
+            for column in relation.secondary.columns
+            if column.references(cls.__table__.c.id)
+        ]
+
     def reload(self):
         """
         Reloads objects from the database.
         """
         Base.metadata.create_all(self.__engine)
+        if os.getenv('HBNB_ENV') == 'test':
+            # Replicas get their schema from the primary in production
+            for engine in self.__read_engines:
+                Base.metadata.create_all(engine)
+
+        DBStorage.__session = self._scoped_session(self.__engine)
+        event.listen(DBStorage.__session, "after_flush", self._flushed)
+        DBStorage.__read_sessions = tuple(
+            self._scoped_session(engine) for engine in self.__read_engines
+        )
+
+    def _flushed(self, session, flush_context):
+        """
+        Records the classes of the objects a flush inserts, updates
+        or deletes, and logs their changes (listener of the session
+        after_flush event).
+        """
+        self._changed(*{
+            obj.__class__.__name__
+            for obj in chain(session.new, session.dirty, session.deleted)
+        })
+
+        classes = self.get_classes()
+        self._log(session, [
+            (op, obj.__class__.__name__, obj.id)
+            for op, objs in (("create", session.new),
+                             ("update", session.dirty),
+                             ("delete", session.deleted))
+            for obj in objs
+            if type(obj) in classes and
+            (op != "update" or session.is_modified(obj))
+        ])
+
+    @staticmethod
+    def _log(session, changes):
+        """
+        Inserts changes into the change log, in the transaction
+        of a session.
+
+        Parameters:
+            session (Session): The session that made the changes.
+            changes (list): (op, class name, id) tuples.
+        """
+        if not changes:
+            return
+
+        changed_at = datetime.now()
+        session.connection().execute(changes_table.insert(), [
+            {"op": op, "class_name": class_name, "object_id": _id,
+             "changed_at": changed_at}
+            for op, class_name, _id in changes
+        ])
+
+    def changes(self, since=0, limit=1000):
+        """
+        Returns the changes of the change log after a sequence number
+        (see Storage.changes). They are read from the primary database
+        on a connection of their own, so each call sees the changes
+        committed since the last one.
+
+        Parameters:
+            since (int): The sequence number of the last known change.
+            limit (int): The maximum number of changes returned.
+
+        Returns:
+            list: The changes, ordered by sequence number.
+        """
+        statement = select(changes_table).where(
+            changes_table.c.seq > since
+        ).order_by(changes_table.c.seq).limit(limit)
+
+        with self.__engine.connect() as connection:
+            return [{
+                "seq": row.seq, "op": row.op, "class": row.class_name,
+                "id": row.object_id,
+                "changed_at": row.changed_at.isoformat()
+            } for row in connection.execute(statement)]
+
+    def last_change(self, classes=None):
+        """
+        Returns the sequence number of the last change of the log
+        (see Storage.last_change), read like the changes.
+
+        Parameters:
+            classes (iterable): The classes of the changes, None for all.
+
+        Returns:
+            int: The sequence number, 0 if there is no change.
+        """
+        statement = select(func.max(changes_table.c.seq))
+        if classes is not None:
+            statement = statement.where(changes_table.c.class_name.in_(
+                [cls.__name__ for cls in classes]))
+
+        with self.__engine.connect() as connection:
+            return connection.scalar(statement) or 0
+
+    @staticmethod
+    def _scoped_session(engine):
+        """
+        Creates a thread-local session registry bound to an engine.
+
+        Parameters:
+            engine (Engine): The engine the sessions connect to.
+
+        Returns:
+            scoped_session: The session registry.
+        """
         session_factory = sessionmaker(
-            bind=self.__engine,
-            autoflush=False,
+            bind=engine,
+            autoflush=True,
             autocommit=False,
             expire_on_commit=False
         )
 
-        DBStorage.__session = scoped_session(session_factory)
+        return scoped_session(session_factory)
 
     def find(self, class_name, _id):
         """
@@ -168,13 +818,162 @@ class DBStorage(Storage):
         if not _class:
             return None
 
+        session = self._reader
         try:
-            obj = self.__session.query(_class).filter_by(id=_id).first()
+            obj = session.query(_class).filter_by(id=_id).first()
             if obj:
-                self.__session.refresh(obj)
+                session.refresh(obj)
             return obj
         except SQLAlchemyError as err:
-            self.__session.rollback()
+            session.rollback()
+            raise err
+
+    def find_by(self, cls, attr, values):
+        """
+        Finds the objects of a class whose attribute is one of
+        the given values, with a single ``WHERE attr IN`` query.
+
+        Parameters:
+            cls (class): The class of the objects.
+            attr (str): The name of the column.
+            values (iterable): The accepted values.
+
+        Returns:
+            list: The objects found.
+        """
+        values = set(values)
+        if cls not in self.get_classes() or not values:
+            return []
+
+        session = self._reader
+        try:
+            return list(session.scalars(
+                select(cls).where(getattr(cls, attr).in_(values))))
+        except SQLAlchemyError as err:
+            session.rollback()
+            raise err
+
+    def find_place_amenities(self, places):
+        """
+        Finds the amenities of many places with a single query
+        joining the place_amenity table.
+
+        Parameters:
+            places (iterable): The Place objects.
+
+        Returns:
+            dict: Each place ID mapped to its list of Amenity objects.
+        """
+        amenities = {place.id: [] for place in places}
+        if not amenities:
+            return amenities
+
+        place_cls = self.get_class("Place")
+        amenity_cls = self.get_class("Amenity")
+        link = place_cls.amenities.property.secondary
+        place_id, amenity_id = (
+            next(column for column in link.columns
+                 if column.references(_class.__table__.c.id))
+            for _class in (place_cls, amenity_cls)
+        )
+
+        session = self._reader
+        try:
+            rows = session.execute(
+                select(place_id, amenity_cls)
+                .select_from(amenity_cls)
+                .join(link, amenity_id == amenity_cls.id)
+                .where(place_id.in_(amenities))
+            )
+            for _id, amenity in rows:
+                amenities[_id].append(amenity)
+        except SQLAlchemyError as err:
+            session.rollback()
+            raise err
+
+        return amenities
+
+    def modified_since(self, cls, since, limit=None, **filters):
+        """
+        Finds the objects of a class updated after a time, with a
+        range scan of the index on updated_at.
+
+        Parameters:
+            cls (class): The class of the objects.
+            since (datetime): The time.
+            limit (int): The maximum number of objects, None for all.
+            **filters: Column values the objects must have.
+
+        Returns:
+            list: The objects, least recently updated first.
+        """
+        if cls not in self.get_classes():
+            return []
+
+        return self._updated_query(
+            select(cls).where(cls.updated_at > since)
+            .order_by(cls.updated_at, cls.id), cls, limit, filters)
+
+    def recently_updated(self, cls, limit, **filters):
+        """
+        Finds the most recently updated objects of a class, reading
+        the index on updated_at backwards.
+
+        Parameters:
+            cls (class): The class of the objects.
+            limit (int): The maximum number of objects.
+            **filters: Column values the objects must have.
+
+        Returns:
+            list: The objects, most recently updated first.
+        """
+        if cls not in self.get_classes():
+            return []
+
+        return self._updated_query(
+            select(cls).order_by(cls.updated_at.desc(), cls.id.desc()),
+            cls, limit, filters)
+
+    def _updated_query(self, statement, cls, limit, filters):
+        """
+        Runs a query ordered by updated_at with filters and a limit.
+
+        Returns:
+            list: The objects found.
+        """
+        statement = statement.where(*(
+            getattr(cls, attr) == value for attr, value in filters.items()
+        )).limit(limit)
+
+        session = self._reader
+        try:
+            return list(session.scalars(statement))
+        except SQLAlchemyError as err:
+            session.rollback()
+            raise err
+
+    def existing_ids(self, cls, ids):
+        """
+        Finds which of the given IDs belong to objects of a class,
+        with a single ``SELECT id ... WHERE id IN`` query.
+
+        Parameters:
+            cls (class): The class of the objects.
+            ids (iterable): The IDs to look up.
+
+        Returns:
+            set: The IDs found.
+        """
+        ids = set(ids)
+        if cls not in self.get_classes() or not ids:
+            return set()
+
+        session = self._reader
+        try:
+            return set(session.scalars(
+                select(cls.id).where(cls.id.in_(ids))))
+        except SQLAlchemyError as err:
+            session.rollback()
             raise err
 
     def find_all(self, class_name=""):
@@ -187,14 +986,7 @@ class DBStorage(Storage):
         Returns:
             list: A list of string representations of the objects.
         """
-        if not class_name:
-            return [str(instance) for instance in self.all().values()]
-
-        _class = self.get_class(class_name)
-        if not _class:
-            return []
-
-        return [str(instance) for instance in self.all(_class).values()]
+        return list(self.iter_find_all(class_name))
 
     def update(self, obj=None, attr=None, value=None):
         """
@@ -219,16 +1011,22 @@ class DBStorage(Storage):
         Note:
             The method flushes changes to the session but does not commit them.
             After calling this method, you should call the save method
-            to commit the changes to the database.
+            to commit the changes to the database. Inside a transaction
+            the flush is left to the commit.
         """
         if not obj or attr is None:
             return
 
+        self._written()
+        self._changed(obj.__class__.__name__)
         try:
             self.__session.refresh(obj)
             self.__session.query(obj.__class__) \
                 .filter_by(id=obj.id).update({attr: value})
-            self.__session.flush()
+            self._log(self.__session,
+                      [("update", obj.__class__.__name__, obj.id)])
+            if not self.in_transaction():
+                self.__session.flush()
         except SQLAlchemyError as err:
             self.__session.rollback()
             raise err
@@ -248,19 +1046,35 @@ class DBStorage(Storage):
             return 0
 
         try:
-            return self.__session.query(func.count(_class.id)).scalar()
+            return self._reader.query(func.count(_class.id)).scalar()
         except SQLAlchemyError as err:
-            self.__session.rollback()
+            self._reader.rollback()
             raise err
 
+    def circuit_state(self):
+        """
+        Returns the state of the circuit breaker of the primary
+        database: "closed", "open" or "half_open".
+        """
+        breaker = self.__breakers.get(self.__engine)
+
+        return breaker.state if breaker else CLOSED
+
     def close(self):
         """
         Remove the current SQLAlchemy session.
 
         This method is intended to close the current SQLAlchemy session,
         ensuring that any resources held by the session are released.
+        It also resets the read routing of the current thread.
         """
         self.__session.remove()
+        for read_session in self.__read_sessions:
+            read_session.remove()
+
+        # Uncommitted changes of the session are gone
+        self._settled()
+        self.read_from_replica(False)
 
     def _class_to_dict(self, class_name, instances):
         """
@@ -277,3 +1091,27 @@ class DBStorage(Storage):
             self._get_obj_key(class_name, instance.id): instance
             for instance in instances
         }
+
+    @staticmethod
+    def _row_to_dict(class_name, row, fields=None):
+        """
+        Helper method to convert a selected row to a dictionary
+        shaped like to_dict.
+
+        Parameters:
+            class_name (str): The name of the class.
+            row (RowMapping): The selected row.
+            fields (list): The keys to return, None for all of them.
+
+        Returns:
+            dict: The dictionary representation of the row.
+        """
+        dictionary = {
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in row.items()
+            if fields is None or key in fields
+        }
+        if fields is None or "__class__" in fields:
+            dictionary["__class__"] = class_name
+
+        return dictionary
@@ -1,17 +1,57 @@
 #!/usr/bin/python3
 """FileStorage module - Handles file storage operations for objects"""
 
-import json
 import os
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime
 
+from models.engine import json_codec
 from models.engine.storage import Storage
 
 
 class FileStorage(Storage):
-    """FileStorage class - Handles file storage operations for objects"""
+    """
+    FileStorage class - Handles file storage operations for objects
+
+    The objects are shared by the threads: a reload keeps the objects
+    changed by the open transactions, and a rollback only reads back
+    the objects changed by its own transaction.
+
+    Every write of the file also appends the changes it persists to
+    a journal (one JSON object per line, see Storage.changes).
+
+    The (updated_at, id) pairs of the objects of each class are kept
+    sorted, for the modified since and recently updated queries. The
+    index is built when first queried, then updated by the storage
+    methods and for the objects a reload changes (so it misses the
+    attributes set on an object until it is saved).
+    """
 
     __file_path = "file.json"
+    __journal_path = "file.changes.jsonl"
     __objects = {}
+    # The staged write and the changes not written yet of each thread
+    __staged = threading.local()
+    # Thread ident -> the keys of the objects its open transaction
+    # changed, which the reloads of the other threads keep
+    __pending = {}
+    # Guards the objects shared by the threads against a reload
+    __lock = threading.RLock()
+    __journal = []
+    # The sequence numbers of the journal, to bisect
+    __journal_seqs = []
+    __journal_size = 0
+    # Class name -> sequence number of its last change in the journal
+    __last_seqs = {}
+    __journal_lock = threading.Lock()
+    # Class name -> sorted (updated_at, id) pairs, None until built
+    __updated = None
+    # Class name -> the updated_at of its pairs, to bisect
+    __updated_times = {}
+    # Object key -> its indexed (class name, (updated_at, id))
+    __updated_keys = {}
+    __index_lock = threading.Lock()
 
     def all(self, cls=None):
         """
@@ -40,6 +80,72 @@ class FileStorage(Storage):
         return {key: obj for key, obj in self.__objects.items()
                 if obj.__class__ == cls}
 
+    def iter_all(self, cls=None, batch_size=1000):
+        """
+        Iterate over the stored objects of a given class or all classes.
+
+        The objects already live in memory, so batch_size is only
+        the number of objects scanned between two checks of the
+        deadline of the current thread.
+
+        Parameters:
+            cls (class, optional): The class type to filter the objects.
+            batch_size (int): The objects scanned per deadline check.
+
+        Yields:
+            BaseModel: The stored objects.
+
+        Raises:
+            DeadlineExceeded: If the deadline passes during the scan.
+        """
+        if cls and cls not in self.get_classes():
+            return
+
+        for index, obj in enumerate(tuple(self.__objects.values())):
+            if index % batch_size == 0:
+                self.check_deadline()
+            if not cls or obj.__class__ == cls:
+                yield obj
+
+    def iter_dicts(self, cls, batch_size=1000, fields=None, **filters):
+        """
+        Iterate over the dictionary representations of the stored
+        objects of a given class.
+
+        Parameters:
+            cls (class): The class type of the objects.
+            batch_size (int): Unused.
+            fields (list): The keys to return, None for all of them.
+            **filters: Attribute values the objects must have.
+
+        Yields:
+            dict: The objects as returned by to_dict.
+        """
+        for obj in self.iter_all(cls):
+            if all(getattr(obj, attr, None) == value
+                   for attr, value in filters.items()):
+                yield obj.to_dict(fields)
+
+    def iter_json(self, cls, batch_size=1000, fields=None, **filters):
+        """
+        Iterate over the JSON encodings of the stored objects of a
+        given class, reusing the encoding each object keeps while
+        it does not change.
+
+        Parameters:
+            cls (class): The class type of the objects.
+            batch_size (int): Unused.
+            fields (list): The keys to return, None for all of them.
+            **filters: Attribute values the objects must have.
+
+        Yields:
+            bytes: The objects as returned by to_json.
+        """
+        for obj in self.iter_all(cls):
+            if all(getattr(obj, attr, None) == value
+                   for attr, value in filters.items()):
+                yield obj.to_json(fields)
+
     def new(self, obj):
         """Adds a new object to the storage.
 
@@ -50,35 +156,385 @@ class FileStorage(Storage):
             return
 
         key = self._get_obj_key(obj.__class__.__name__, obj.id)
-        self.__objects[key] = obj
+        with self.__lock:
+            self._log("update" if key in self.__objects else "create", obj)
+            self.__objects[key] = obj
+        self._index(obj)
+        self._changed(obj.__class__.__name__)
+        self._stage()
+
+    def new_many(self, objs):
+        """
+        Adds many new objects to the storage and persists them
+        with a single write of the file.
 
-    def save(self):
-        """Serializes objects to JSON and saves to file"""
-        serialized_objects = {
-            key: obj.to_dict()
-            for key, obj in self.__objects.items()
-        }
+        Either all objects are stored or, if one of them is not a
+        stored class or the file cannot be written, none.
 
-        with open(self.__file_path, "w") as file:
-            json.dump(serialized_objects, file)
+        Parameters:
+            objs (iterable): The objects to add.
 
-    def reload(self):
-        """Deserializes JSON from file and reloads objects"""
+        Raises:
+            ValueError: If an object is not an instance of a stored class.
+        """
+        objs = self._check_objects(objs)
+        if not objs:
+            return
 
-        if not os.path.isfile(self.__file_path):
+        snapshot = dict(self.__objects)
+        with self.__lock:
+            for obj in objs:
+                key = self._get_obj_key(obj.__class__.__name__, obj.id)
+                self._log(
+                    "update" if key in self.__objects else "create", obj)
+                self.__objects[key] = obj
+        self._index(*objs)
+        self._changed(*{obj.__class__.__name__ for obj in objs})
+
+        self._save_or_restore(snapshot)
+
+    def update_many(self, updates):
+        """
+        Updates the attributes of many objects and persists them
+        with a single write of the file.
+
+        Either all updates are applied or, if the file cannot be
+        written, none.
+
+        Parameters:
+            updates (iterable): (obj, {attr: value}) pairs.
+
+        Raises:
+            ValueError: If an object is not an instance of a stored class.
+        """
+        updates = [(obj, attrs) for obj, attrs in updates if obj and attrs]
+        self._check_objects(obj for obj, _ in updates)
+        if not updates:
             return
 
+        previous = [(obj, dict(obj.__dict__)) for obj, _ in updates]
+        with self.__lock:
+            for obj, attrs in updates:
+                for attr, value in attrs.items():
+                    setattr(obj, attr, value)
+                self._log("update", obj)
+                # A reload may have replaced the object since it was read
+                key = self._get_obj_key(obj.__class__.__name__, obj.id)
+                if key in self.__objects:
+                    self.__objects[key] = obj
+        self._index(*(obj for obj, _ in updates))
+        self._changed(*{obj.__class__.__name__ for obj, _ in updates})
+        self._stage()
+
         try:
-            with open(self.__file_path, "r") as file:
-                deserialized_objects = json.load(file)
+            self.save()
+        except OSError as err:
+            for obj, attributes in previous:
+                obj.__dict__.clear()
+                obj.__dict__.update(attributes)
+            self._unlogged().clear()
+            self._drop_index()
+            self._settled()
+            raise err
+
+    def delete_many(self, objs):
+        """
+        Deletes many objects from the storage and persists the removal
+        with a single write of the file.
 
-                FileStorage.__objects = {
-                    key: self._deserialize(dictionary)
-                    for key, dictionary in deserialized_objects.items()
-                }
+        Either all objects are deleted or, if the file cannot be
+        written, none.
+
+        Parameters:
+            objs (iterable): The objects to delete.
+
+        Raises:
+            ValueError: If an object is not an instance of a stored class.
+        """
+        objs = self._check_objects(objs)
+        if not objs:
+            return
 
-        except (OSError, json.JSONDecodeError):
-            pass
+        snapshot = dict(self.__objects)
+        self._remove(objs)
+
+        self._save_or_restore(snapshot)
+
+    def _check_objects(self, objs):
+        """
+        Checks that objects can be stored before a bulk operation.
+
+        Parameters:
+            objs (iterable): The objects to check, falsy ones are skipped.
+
+        Returns:
+            list: The objects to operate on.
+
+        Raises:
+            ValueError: If an object is not an instance of a stored class.
+        """
+        objs = [obj for obj in objs if obj]
+        for obj in objs:
+            if type(obj) not in self.get_classes():
+                raise ValueError(
+                    "Not a stored class: {}".format(type(obj).__name__))
+
+        return objs
+
+    def _save_or_restore(self, snapshot):
+        """
+        Persists the objects, restoring them from a snapshot if the file
+        cannot be written.
+
+        Parameters:
+            snapshot (dict): The objects before the change.
+        """
+        try:
+            self.save()
+        except OSError as err:
+            self.__objects.clear()
+            self.__objects.update(snapshot)
+            self._unlogged().clear()
+            self._drop_index()
+            self._settled()
+            raise err
+
+    def save(self):
+        """
+        Serializes objects to JSON and saves to file.
+
+        Inside a transaction (see begin) the write is only staged,
+        and commit() writes the file once.
+        """
+        if self.in_transaction():
+            self._stage()
+            return
+
+        self._persist()
+        self._settled()
+
+    def _stage(self):
+        """Marks the file to be written when the transaction commits"""
+        if self.in_transaction():
+            self.__staged.dirty = True
+
+    def _commit(self):
+        """Writes the file once if a save was staged"""
+        if getattr(self.__staged, "dirty", False):
+            self.__staged.dirty = False
+            self._persist()
+        with self.__lock:
+            self.__pending.pop(threading.get_ident(), None)
+
+    def _rollback(self):
+        """
+        Discards the staged changes by reading the objects the
+        transaction changed back from the file, leaving the changes
+        of the transactions of the other threads
+        """
+        self.__staged.dirty = False
+        self._unlogged().clear()
+        with self.__lock:
+            keys = self.__pending.pop(threading.get_ident(), set())
+            stored = self._read_file() or {}
+            for key in keys:
+                if key in stored:
+                    self.__objects[key] = self._deserialize(stored[key])
+                else:
+                    self.__objects.pop(key, None)
+            self._reindex(keys)
+
+    def _persist(self):
+        """
+        Serializes objects to JSON and writes them to the file,
+        reusing the encoding each unchanged object keeps
+        """
+        with self.__lock:
+            serialized_objects = b",".join(
+                json_codec.dumps(key) + b":" + obj.to_json()
+                for key, obj in self.__objects.items()
+            )
+
+        with open(self.__file_path, "wb") as file:
+            file.write(b"{" + serialized_objects + b"}")
+
+        self._write_journal()
+
+    def _log(self, op, obj):
+        """
+        Records a change to append to the journal
+        when the file is written.
+
+        Parameters:
+            op (str): "create", "update" or "delete".
+            obj (BaseModel): The changed object.
+        """
+        self._unlogged().append((op, obj.__class__.__name__, obj.id))
+        if self.in_transaction():
+            with self.__lock:
+                self.__pending.setdefault(threading.get_ident(), set()).add(
+                    self._get_obj_key(obj.__class__.__name__, obj.id))
+
+    def _unlogged(self):
+        """Returns the changes of the current thread not written yet"""
+        unlogged = getattr(self.__staged, "unlogged", None)
+        if unlogged is None:
+            unlogged = self.__staged.unlogged = []
+
+        return unlogged
+
+    def _write_journal(self):
+        """Appends the recorded changes to the journal"""
+        unlogged = self._unlogged()
+        with self.__journal_lock:
+            if not unlogged:
+                return
+
+            self._read_journal()
+            seq = self.__journal[-1]["seq"] if self.__journal else 0
+            changed_at = datetime.now().isoformat()
+            lines = b"".join(
+                json_codec.dumps({
+                    "seq": seq, "op": op, "class": class_name,
+                    "id": _id, "changed_at": changed_at
+                }) + b"\n"
+                for seq, (op, class_name, _id) in enumerate(
+                    unlogged, seq + 1)
+            )
+            unlogged.clear()
+
+            with open(self.__journal_path, "ab") as file:
+                file.write(lines)
+            self._read_journal()
+
+    def _read_journal(self):
+        """
+        Reads the lines appended to the journal since it was last read
+        (the journal lock must be held)
+        """
+        try:
+            size = os.path.getsize(self.__journal_path)
+        except OSError:
+            size = 0
+        if size < self.__journal_size:
+            # The journal was replaced
+            FileStorage.__journal = []
+            FileStorage.__journal_seqs = []
+            FileStorage.__journal_size = 0
+            self.__last_seqs.clear()
+        if size == self.__journal_size:
+            return
+
+        with open(self.__journal_path, "rb") as file:
+            file.seek(self.__journal_size)
+            data = file.read(size - self.__journal_size)
+
+        # Leave a line being written for the next read
+        data = data[:data.rfind(b"\n") + 1]
+        for line in data.splitlines():
+            if line:
+                change = json_codec.loads(line)
+                self.__journal.append(change)
+                self.__journal_seqs.append(change["seq"])
+                self.__last_seqs[change["class"]] = change["seq"]
+        FileStorage.__journal_size += len(data)
+
+    def changes(self, since=0, limit=1000):
+        """
+        Returns the changes of the journal after a sequence number
+        (see Storage.changes).
+
+        Parameters:
+            since (int): The sequence number of the last known change.
+            limit (int): The maximum number of changes returned.
+
+        Returns:
+            list: The changes, ordered by sequence number.
+        """
+        with self.__journal_lock:
+            self._read_journal()
+            start = bisect_right(self.__journal_seqs, since)
+            return [dict(change)
+                    for change in self.__journal[start:start + limit]]
+
+    def last_change(self, classes=None):
+        """
+        Returns the sequence number of the last change of the journal
+        (see Storage.last_change).
+
+        Parameters:
+            classes (iterable): The classes of the changes, None for all.
+
+        Returns:
+            int: The sequence number, 0 if there is no change.
+        """
+        with self.__journal_lock:
+            self._read_journal()
+            if classes is None:
+                return self.__journal[-1]["seq"] if self.__journal else 0
+
+            return max((self.__last_seqs.get(cls.__name__, 0)
+                        for cls in classes), default=0)
+
+    def reload(self):
+        """
+        Deserializes JSON from file and reloads objects, keeping the
+        objects changed by the open transactions. The objects whose
+        updated_at did not change are kept too, with their encoding
+        (see BaseModel.to_json).
+        """
+        stored = self._read_file()
+        if stored is None:
+            return
+
+        with self.__lock:
+            if not self.in_transaction():
+                # The unsaved changes are discarded with the objects
+                self._unlogged().clear()
+            pending = set().union(*self.__pending.values())
+            objects = {}
+            for key, dictionary in stored.items():
+                if key not in pending:
+                    obj = self.__objects.get(key)
+                    objects[key] = obj if self._unchanged(obj, dictionary) \
+                        else self._deserialize(dictionary)
+            objects.update((key, self.__objects[key]) for key in pending
+                           if key in self.__objects)
+            previous = self.__objects
+            FileStorage.__objects = objects
+            self._reindex(key for key in objects.keys() | previous.keys()
+                          if objects.get(key) is not previous.get(key))
+
+    @staticmethod
+    def _unchanged(obj, dictionary):
+        """
+        Tells if an object is the one a dictionary read from the file
+        represents, since setting an attribute moves its updated_at
+
+        Parameters:
+            obj (BaseModel): The object in memory, or None.
+            dictionary (dict[str, any]): The dictionary of the object.
+        """
+        return obj is not None and \
+            obj.__class__.__name__ == dictionary.get("__class__") and \
+            obj.updated_at.isoformat() == dictionary.get("updated_at")
+
+    def _read_file(self):
+        """
+        Reads the dictionaries of the objects from the file
+
+        Returns:
+            dict: The dictionaries by object key, None if the file
+                does not exist or cannot be read.
+        """
+        if not os.path.isfile(self.__file_path):
+            return None
+
+        try:
+            with open(self.__file_path, "rb") as file:
+                return json_codec.loads(file.read())
+        except (OSError, ValueError):
+            return None
 
     def delete(self, obj=None):
         """
@@ -95,8 +551,245 @@ class FileStorage(Storage):
         if not obj or type(obj) not in self.get_classes():
             return
 
-        key = self._get_obj_key(obj.__class__.__name__, obj.id)
-        self.__objects.pop(key, None)
+        self._remove([obj])
+        self._stage()
+
+    def _remove(self, objs):
+        """
+        Removes objects, and the objects they own (see
+        Storage.get_owned), from the stored objects.
+
+        Parameters:
+            objs (list): The objects to remove.
+        """
+        objs = objs + self._owned_objects(objs)
+        with self.__lock:
+            for obj in objs:
+                key = self._get_obj_key(obj.__class__.__name__, obj.id)
+                if self.__objects.pop(key, None) is not None:
+                    self._log("delete", obj)
+        self._unindex(*objs)
+        self._changed(*{obj.__class__.__name__ for obj in objs})
+
+    def _owned_objects(self, objs):
+        """
+        Finds the objects owned by some objects, and the objects those
+        own in turn, scanning the stored objects once per level.
+
+        Parameters:
+            objs (list): The owner objects.
+
+        Returns:
+            list: The owned objects, not including objs.
+        """
+        found = {self._get_obj_key(obj.__class__.__name__, obj.id)
+                 for obj in objs}
+        owned = []
+        owners = objs
+        while owners:
+            # Owned class -> (attribute, ids of the owners) pairs
+            links = {}
+            for obj in owners:
+                for cls, attr in self.get_owned(obj.__class__.__name__):
+                    links.setdefault(cls, {}).setdefault(
+                        attr, set()).add(obj.id)
+            if not links:
+                break
+
+            owners = []
+            for key, obj in tuple(self.__objects.items()):
+                if key not in found and any(
+                        getattr(obj, attr, None) in ids
+                        for attr, ids in links.get(
+                            obj.__class__, {}).items()):
+                    found.add(key)
+                    owners.append(obj)
+            owned.extend(owners)
+
+        return owned
+
+    def _index(self, *objs):
+        """
+        Moves objects to their updated_at in the index.
+
+        Parameters:
+            *objs (BaseModel): The added or updated objects.
+        """
+        with self.__index_lock:
+            if self.__updated is None:
+                return
+
+            for obj in objs:
+                key = self._get_obj_key(obj.__class__.__name__, obj.id)
+                self._drop_from_index(key)
+                self._add_to_index(key, obj)
+
+    def _reindex(self, keys):
+        """
+        Moves the objects of some keys to their updated_at in the
+        index, or removes the keys no longer stored.
+
+        Parameters:
+            keys (iterable): The keys of the reloaded objects.
+        """
+        with self.__index_lock:
+            if self.__updated is None:
+                return
+
+            for key in keys:
+                self._drop_from_index(key)
+                obj = self.__objects.get(key)
+                if obj is not None:
+                    self._add_to_index(key, obj)
+
+    def _add_to_index(self, key, obj):
+        """
+        Inserts the entry of an object in the index
+        (the index lock must be held).
+        """
+        class_name = obj.__class__.__name__
+        entry = (obj.updated_at, obj.id)
+        entries = self.__updated.setdefault(class_name, [])
+        index = bisect_right(entries, entry)
+        entries.insert(index, entry)
+        self.__updated_times.setdefault(class_name, []).insert(
+            index, entry[0])
+        self.__updated_keys[key] = (class_name, entry)
+
+    def _unindex(self, *objs):
+        """
+        Removes objects from the index.
+
+        Parameters:
+            *objs (BaseModel): The deleted objects.
+        """
+        with self.__index_lock:
+            if self.__updated is None:
+                return
+
+            for obj in objs:
+                self._drop_from_index(
+                    self._get_obj_key(obj.__class__.__name__, obj.id))
+
+    def _drop_from_index(self, key):
+        """
+        Removes the entry of an object key from the index
+        (the index lock must be held).
+        """
+        indexed = self.__updated_keys.pop(key, None)
+        if indexed is None:
+            return
+
+        class_name, entry = indexed
+        entries = self.__updated[class_name]
+        index = bisect_left(entries, entry)
+        if index < len(entries) and entries[index] == entry:
+            del entries[index]
+            del self.__updated_times[class_name][index]
+
+    def _drop_index(self):
+        """Drops the index, to build it again from the objects"""
+        with self.__index_lock:
+            FileStorage.__updated = None
+            FileStorage.__updated_times = {}
+            FileStorage.__updated_keys = {}
+
+    def _updated_entries(self, class_name, since=None):
+        """
+        Returns the sorted (updated_at, id) pairs of a class,
+        building the index first if needed.
+
+        Parameters:
+            class_name (str): The name of the class.
+            since (datetime): Only return the pairs updated after it,
+                found with a binary search, None for all of them.
+        """
+        with self.__index_lock:
+            if self.__updated is None:
+                updated = {}
+                keys = {}
+                for key, obj in self.__objects.items():
+                    name = obj.__class__.__name__
+                    entry = (obj.updated_at, obj.id)
+                    updated.setdefault(name, []).append(entry)
+                    keys[key] = (name, entry)
+                for entries in updated.values():
+                    entries.sort()
+                FileStorage.__updated = updated
+                FileStorage.__updated_times = {
+                    name: [entry[0] for entry in entries]
+                    for name, entries in updated.items()
+                }
+                FileStorage.__updated_keys = keys
+
+            entries = self.__updated.get(class_name, [])
+            start = 0 if since is None else bisect_right(
+                self.__updated_times.get(class_name, []), since)
+
+            return entries[start:]
+
+    def modified_since(self, cls, since, limit=None, **filters):
+        """
+        Finds the stored objects of a class updated after a time,
+        with a binary search in the index.
+
+        Parameters:
+            cls (class): The class of the objects.
+            since (datetime): The time.
+            limit (int): The maximum number of objects, None for all.
+            **filters: Attribute values the objects must have.
+
+        Returns:
+            list: The objects, least recently updated first.
+        """
+        if cls not in self.get_classes():
+            return []
+
+        entries = self._updated_entries(cls.__name__, since)
+
+        return self._indexed_objects(
+            cls, (_id for _, _id in entries), limit, filters)
+
+    def recently_updated(self, cls, limit, **filters):
+        """
+        Finds the most recently updated stored objects of a class,
+        reading the index backwards.
+
+        Parameters:
+            cls (class): The class of the objects.
+            limit (int): The maximum number of objects.
+            **filters: Attribute values the objects must have.
+
+        Returns:
+            list: The objects, most recently updated first.
+        """
+        if cls not in self.get_classes():
+            return []
+
+        entries = self._updated_entries(cls.__name__)
+
+        return self._indexed_objects(
+            cls, (_id for _, _id in reversed(entries)), limit, filters)
+
+    def _indexed_objects(self, cls, ids, limit, filters):
+        """
+        Looks up the objects of the ids read from the index,
+        up to limit of them matching the filters.
+
+        Returns:
+            list: The objects, in the order of the ids.
+        """
+        found = []
+        for _id in ids:
+            if limit is not None and len(found) >= limit:
+                break
+
+            obj = self.find(cls.__name__, _id)
+            if obj and all(getattr(obj, attr, None) == value
+                           for attr, value in filters.items()):
+                found.append(obj)
+
+        return found
 
     def find(self, class_name, _id):
         """
@@ -113,6 +806,67 @@ class FileStorage(Storage):
         key = self._get_obj_key(class_name, _id)
         return self.__objects.get(key, None)
 
+    def find_by(self, cls, attr, values):
+        """
+        Finds the stored objects of a class whose attribute
+        is one of the given values, in a single pass
+        Parameters:
+            cls (BaseModel): the class of the objects
+            attr (str): the name of the attribute
+            values (iterable): the accepted values
+        Returns:
+            A list of the objects found
+        """
+        values = set(values)
+        if not values:
+            return []
+
+        if attr == "id":
+            objs = (self.find(getattr(cls, "__name__", None), _id)
+                    for _id in values)
+            return [obj for obj in objs if obj]
+
+        return [obj for obj in self.iter_all(cls)
+                if getattr(obj, attr, None) in values]
+
+    def find_place_amenities(self, places):
+        """
+        Finds the amenities of many places with one lookup
+        per amenity ID
+        Parameters:
+            places (iterable): the Place objects
+        Returns:
+            A dict mapping each place ID to its list of Amenity objects
+        """
+        places = list(places)
+        amenity_cls = self.get_class("Amenity")
+        amenities = {
+            amenity.id: amenity for amenity in self.find_by(
+                amenity_cls, "id",
+                {_id for place in places for _id in place.amenity_ids})
+        }
+
+        return {
+            place.id: [amenities[_id] for _id in place.amenity_ids
+                       if _id in amenities]
+            for place in places
+        }
+
+    def existing_ids(self, cls, ids):
+        """
+        Finds which of the given IDs belong to stored objects of a class
+        Parameters:
+            cls (BaseModel): the class of the objects
+            ids (iterable): the IDs to look up
+        Returns:
+            A set of the IDs found
+        """
+        if cls not in self.get_classes():
+            return set()
+
+        return {_id for _id in ids
+                if self._get_obj_key(cls.__name__, _id) in self.__objects}
+
     def find_all(self, class_name=""):
         """
         Finds and returns all objects of a given class
@@ -121,14 +875,7 @@ class FileStorage(Storage):
         Returns:
             A list of objects if found, otherwise an empty list
         """
-        if not class_name:
-            return [str(obj) for obj in self.__objects.values()]
-
-        if class_name not in self.get_classes_names():
-            return []
-
-        return [str(obj) for key, obj in self.__objects.items()
-                if obj.__class__.__name__ == class_name]
+        return list(self.iter_find_all(class_name))
 
     def update(self, obj=None, attr=None, value=None):
         """
@@ -148,6 +895,9 @@ class FileStorage(Storage):
             return
 
         setattr(obj, attr, value)
+        self._log("update", obj)
+        self._index(obj)
+        self._changed(obj.__class__.__name__)
 
     def count_by_class_name(self, class_name):
         """
@@ -172,6 +922,7 @@ class FileStorage(Storage):
         transactions are reflected in the current instance.
         """
         self.reload()
+        self._settled()
 
     def _deserialize(self, dictionary):
         """
@@ -0,0 +1,187 @@
+#!/usr/bin/python3
+"""
+This module generates the ids of the objects and defines how DBStorage
+stores them.
+
+HBNB_ID_GENERATOR picks the generator of the new ids:
+- uuid4 (the default): random UUIDs,
+- uuid7: UUIDs starting with the creation time (RFC 9562),
+- ulid: ULIDs, 26 characters starting with the creation time.
+Time-ordered ids are generated in increasing order (also within a
+millisecond), so new rows are appended to the primary key and foreign
+key indexes instead of being scattered over them.
+
+With HBNB_BINARY_IDS set, DBStorage stores the ids (and the foreign
+keys) as bytes: the UUIDs and ULIDs in 17 bytes (a tag byte and their
+16 bytes), any other id as its UTF-8 bytes, so the existing ids keep
+working. The ids are always strings for the rest of the application.
+"""
+import os
+import secrets
+import threading
+import time
+import uuid
+
+from sqlalchemy import String, VARBINARY
+from sqlalchemy.types import TypeDecorator
+
+ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+_UUID_TAG = b"\x01"
+_ULID_TAG = b"\x02"
+
+
+class _MonotonicClock:
+    """
+    Milliseconds timestamps with a sequence number that increases
+    within a millisecond, never going backwards.
+    """
+
+    def __init__(self, bits):
+        """
+        Initializes the clock.
+
+        Parameters:
+            bits (int): The size of the sequence number. It starts at a
+                random value of the lower half in each millisecond.
+        """
+        self.__bits = bits
+        self.__ms = 0
+        self.__sequence = 0
+        self.__lock = threading.Lock()
+
+    def next(self):
+        """Returns the next (milliseconds, sequence number) pair."""
+        with self.__lock:
+            ms = time.time_ns() // 1000000
+            if ms > self.__ms:
+                self.__ms = ms
+                self.__sequence = secrets.randbits(self.__bits - 1)
+            else:
+                # Same millisecond, or the clock went back
+                self.__sequence += 1
+                if self.__sequence >> self.__bits:
+                    self.__ms += 1
+                    self.__sequence = secrets.randbits(self.__bits - 1)
+
+            return self.__ms, self.__sequence
+
+
+_uuid7_clock = _MonotonicClock(12)
+_ulid_clock = _MonotonicClock(80)
+
+
+def uuid4():
+    """Returns a random UUID (str)."""
+    return str(uuid.uuid4())
+
+
+def uuid7():
+    """
+    Returns a UUID version 7 (str): 48 bits of Unix time in
+    milliseconds, a 12 bits sequence number and 62 random bits.
+    """
+    ms, sequence = _uuid7_clock.next()
+    value = (ms << 80 | 0x7 << 76 | sequence << 64 |
+             0b10 << 62 | secrets.randbits(62))
+
+    return str(uuid.UUID(int=value))
+
+
+def ulid():
+    """
+    Returns a ULID (str): 48 bits of Unix time in milliseconds and
+    80 random bits (incremented within a millisecond), in Crockford's
+    base 32.
+    """
+    ms, randomness = _ulid_clock.next()
+
+    return _encode_ulid(ms << 80 | randomness)
+
+
+GENERATORS = {"uuid4": uuid4, "uuid7": uuid7, "ulid": ulid}
+
+ID_GENERATOR = os.getenv("HBNB_ID_GENERATOR", "uuid4")
+if ID_GENERATOR not in GENERATORS:
+    raise ValueError("Unknown HBNB_ID_GENERATOR: {} (expected one of {})"
+                     .format(ID_GENERATOR, ", ".join(GENERATORS)))
+
+
+def new_id():
+    """Returns a new id from the generator of HBNB_ID_GENERATOR."""
+    return GENERATORS[ID_GENERATOR]()
+
+
+def id_to_bytes(value):
+    """
+    Encodes an id for a binary column.
+
+    Parameters:
+        value (str): The id.
+
+    Returns:
+        bytes: The tagged 16 bytes of a UUID or ULID in canonical form,
+            otherwise the UTF-8 bytes of the id.
+    """
+    if len(value) == 36:
+        try:
+            parsed = uuid.UUID(value)
+        except ValueError:
+            parsed = None
+        if parsed is not None and str(parsed) == value:
+            return _UUID_TAG + parsed.bytes
+    elif len(value) == 26 and value[0] <= "7" and \
+            all(char in ULID_ALPHABET for char in value):
+        number = 0
+        for char in value:
+            number = number << 5 | ULID_ALPHABET.index(char)
+        return _ULID_TAG + number.to_bytes(16, "big")
+
+    return value.encode()
+
+
+def id_from_bytes(data):
+    """
+    Decodes an id read from a binary column (see id_to_bytes).
+
+    Parameters:
+        data (bytes): The encoded id.
+
+    Returns:
+        str: The id.
+    """
+    if len(data) == 17 and data[:1] == _UUID_TAG:
+        return str(uuid.UUID(bytes=bytes(data[1:])))
+    if len(data) == 17 and data[:1] == _ULID_TAG:
+        return _encode_ulid(int.from_bytes(data[1:], "big"))
+
+    return bytes(data).decode()
+
+
+def _encode_ulid(value):
+    """Encodes a 128 bits number as a ULID (26 characters)."""
+    chars = []
+    for _ in range(26):
+        chars.append(ULID_ALPHABET[value & 0x1F])
+        value >>= 5
+
+    return "".join(reversed(chars))
+
+
+class BinaryId(TypeDecorator):
+    """The column type of the ids stored as bytes (see id_to_bytes)."""
+
+    impl = VARBINARY(60)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        """Encodes an id sent to the database."""
+        return None if value is None else id_to_bytes(value)
+
+    def process_result_value(self, value, dialect):
+        """Decodes an id read from the database."""
+        return None if value is None else id_from_bytes(value)
+
+
+#: The column type of the ids and of the foreign keys
+ID_TYPE = BinaryId() if os.getenv("HBNB_BINARY_IDS") else String(60)
@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""
+This module encodes and decodes the JSON documents of the storage and
+the API in one place. It uses the fastest library available (orjson,
+then ujson, then the standard json module), or the one named by
+HBNB_JSON_CODEC. Every backend writes compact UTF-8 bytes and encodes
+datetimes as ISO 8601 strings and bytes as base64 strings.
+"""
+import base64
+import json
+import os
+from datetime import date, datetime
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+def default(obj):
+    """
+    Encodes the values the JSON libraries do not support.
+
+    Parameters:
+        obj: The value to encode.
+
+    Returns:
+        str: The encoded value.
+
+    Raises:
+        TypeError: If the value cannot be encoded.
+    """
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return base64.b64encode(obj).decode("ascii")
+
+    raise TypeError(
+        "Object of type {} is not JSON serializable".format(
+            type(obj).__name__))
+
+
+def _orjson_dumps(obj):
+    """Encodes with orjson (datetimes and int keys are native)."""
+    return orjson.dumps(obj, default=default,
+                        option=orjson.OPT_NON_STR_KEYS)
+
+
+def _ujson_dumps(obj):
+    """Encodes with ujson."""
+    return ujson.dumps(obj, default=default, ensure_ascii=False,
+                       escape_forward_slashes=False).encode("utf-8")
+
+
+def _json_dumps(obj):
+    """Encodes with the standard json module."""
+    return json.dumps(obj, default=default, ensure_ascii=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+_BACKENDS = {
+    "orjson": (orjson, _orjson_dumps, orjson and orjson.loads),
+    "ujson": (ujson, _ujson_dumps, ujson and ujson.loads),
+    "json": (json, _json_dumps, json.loads),
+}
+
+
+def _select_backend(name=None):
+    """
+    Selects the backend named by HBNB_JSON_CODEC,
+    or the first one installed.
+
+    Returns:
+        tuple: The name, dumps and loads functions of the backend.
+
+    Raises:
+        ValueError: If the named backend is unknown or not installed.
+    """
+    name = name or os.getenv("HBNB_JSON_CODEC")
+    if name:
+        if name not in _BACKENDS or _BACKENDS[name][0] is None:
+            raise ValueError("JSON codec not available: {}".format(name))
+        return (name,) + _BACKENDS[name][1:]
+
+    for name, (module, _dumps, _loads) in _BACKENDS.items():
+        if module is not None:
+            return name, _dumps, _loads
+
+
+BACKEND, _dumps, _loads = _select_backend()
+
+
+def dumps(obj):
+    """
+    Encodes an object to compact JSON.
+
+    Parameters:
+        obj: The object to encode (dict, list, str, number...).
+
+    Returns:
+        bytes: The UTF-8 encoded JSON document.
+    """
+    return _dumps(obj)
+
+
+def loads(data):
+    """
+    Decodes a JSON document.
+
+    Parameters:
+        data (bytes or str): The JSON document.
+
+    Returns:
+        The decoded object.
+
+    Raises:
+        ValueError: If the document is not valid JSON.
+    """
+    return _loads(data)
@@ -4,24 +4,112 @@ This module defines the abstract Storage class,
 which serves as the interface for interacting with
 different storage mechanisms.
 """
+import threading
+import time
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import count
+from uuid import uuid4
 
-from models.engine.stored_classes import CLASSES
+from models.engine import json_codec
+from models.engine.circuit_breaker import CLOSED
+from models.engine.stored_classes import CLASSES, OWNED
+
+
+class DeadlineExceeded(Exception):
+    """
+    Raised when a storage operation runs past the deadline
+    of the current thread (see Storage.set_deadline).
+    """
+    pass
+
+
+class StorageUnavailable(Exception):
+    """
+    Raised when the storage cannot be reached (e.g. while the circuit
+    breaker of DBStorage is open).
+    """
+
+    def __init__(self, message="The storage is unavailable",
+                 retry_after=None):
+        """
+        Parameters:
+            message (str): the error message
+            retry_after (float): the seconds before the storage is
+                tried again, None if unknown
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
 
 
 class Storage(ABC):
     __CLASSES = CLASSES
+    __transaction = threading.local()
+    __versions = {}
+    __version_counter = count(1)
+    __epoch = uuid4().hex[:8]
+    __changes = threading.local()
+    # A context variable, so the deadline follows the asyncio tasks too
+    __deadline = ContextVar("storage_deadline", default=None)
 
     @abstractmethod
     def all(self, cls=None):
         """Retrieve all objects of a given class or all classes."""
         pass
 
+    @abstractmethod
+    def iter_all(self, cls=None, batch_size=1000):
+        """
+        Iterate over all objects of a given class or all classes,
+        loading them in batches of batch_size.
+        """
+        pass
+
+    @abstractmethod
+    def iter_dicts(self, cls, batch_size=1000, fields=None, **filters):
+        """
+        Iterate over the dictionary representations of the objects
+        of a given class whose attributes equal the given filters,
+        limited to the given fields when fields is not None.
+        """
+        pass
+
+    def iter_json(self, cls, batch_size=1000, fields=None, **filters):
+        """
+        Iterate over the JSON encodings of the objects of a given class
+        whose attributes equal the given filters
+        Parameters:
+            cls (BaseModel): the class of the objects
+            batch_size (int): the number of objects loaded per batch
+            fields (list): the keys to return, None for all of them
+            **filters: attribute values the objects must have
+        Returns:
+            A generator of JSON objects (bytes) shaped like to_dict
+        """
+        return (json_codec.dumps(dictionary) for dictionary in
+                self.iter_dicts(cls, batch_size, fields, **filters))
+
     @abstractmethod
     def new(self, obj):
         """Add a new object to the storage."""
         pass
 
+    @abstractmethod
+    def new_many(self, objs):
+        """Add many new objects and persist them all or none."""
+        pass
+
+    @abstractmethod
+    def update_many(self, updates):
+        """Update many (object, attributes) pairs all or none."""
+        pass
+
+    @abstractmethod
+    def delete_many(self, objs):
+        """Delete many objects and persist the removal all or none."""
+        pass
+
     @abstractmethod
     def save(self):
         """Commit changes to the storage."""
@@ -56,6 +144,24 @@ class Storage(ABC):
 
         return self.find(cls.__name__, _id)
 
+    def get_many(self, cls, ids):
+        """
+        Get many objects of a class by their IDs with one lookup
+        Parameters:
+            cls (BaseModel): the class of the objects
+            ids (iterable): the IDs of the objects
+        Returns:
+            A list of the objects found, in the order of their first ID
+            (IDs without an object are skipped)
+        """
+        if not cls or cls not in self.get_classes():
+            return []
+
+        ids = list(dict.fromkeys(ids))
+        found = {obj.id: obj for obj in self.find_by(cls, "id", ids)}
+
+        return [found[_id] for _id in ids if _id in found]
+
     def count(self, cls=None):
         """
         Count the number of objects of a given class or all classes
@@ -76,11 +182,90 @@ class Storage(ABC):
 
         return self.count_by_class_name(cls.__name__)
 
+    @abstractmethod
+    def find_by(self, cls, attr, values):
+        """Find the objects of a class whose attr is one of values."""
+        pass
+
+    def find_place_amenities(self, places):
+        """
+        Finds the amenities of many places
+        Parameters:
+            places (iterable): the Place objects
+        Returns:
+            A dict mapping each place ID to its list of Amenity objects
+        """
+        return {place.id: list(place.amenities) for place in places}
+
+    def modified_since(self, cls, since, limit=None, **filters):
+        """
+        Finds the objects of a class updated after a time
+        (storages without an index on updated_at sort every object)
+        Parameters:
+            cls (BaseModel): the class of the objects
+            since (datetime): the time (naive, local like updated_at)
+            limit (int): the maximum number of objects, None for all
+            **filters: attribute values the objects must have
+        Returns:
+            A list of the objects, least recently updated first
+            (ties are ordered by ID)
+        """
+        objs = sorted(
+            (obj for obj in self.iter_all(cls) if obj.updated_at > since and
+             all(getattr(obj, attr, None) == value
+                 for attr, value in filters.items())),
+            key=lambda obj: (obj.updated_at, obj.id))
+
+        return objs[:limit]
+
+    def recently_updated(self, cls, limit, **filters):
+        """
+        Finds the most recently updated objects of a class
+        (storages without an index on updated_at sort every object)
+        Parameters:
+            cls (BaseModel): the class of the objects
+            limit (int): the maximum number of objects
+            **filters: attribute values the objects must have
+        Returns:
+            A list of the objects, most recently updated first
+            (ties are ordered by descending ID)
+        """
+        objs = sorted(
+            (obj for obj in self.iter_all(cls)
+             if all(getattr(obj, attr, None) == value
+                    for attr, value in filters.items())),
+            key=lambda obj: (obj.updated_at, obj.id), reverse=True)
+
+        return objs[:limit]
+
+    @abstractmethod
+    def existing_ids(self, cls, ids):
+        """Return the subset of ids that belong to stored objects."""
+        pass
+
     @abstractmethod
     def find_all(self, class_name=""):
         """Find all objects of a given class."""
         pass
 
+    def iter_find_all(self, class_name=""):
+        """
+        Iterates over the string representations of all objects
+        of a given class, or of all classes if class_name is empty
+        Parameters:
+            class_name (str): the name of the class
+        Returns:
+            A generator of strings, empty if the class is not found
+        """
+        if not class_name:
+            return (str(obj) for obj in self.iter_all())
+
+        _class = self.get_class(class_name)
+        if not _class:
+            return iter(())
+
+        return (str(obj) for obj in self.iter_all(_class))
+
     @abstractmethod
     def update(self, obj=None, attr=None, value=None):
         """Update an object's attribute."""
@@ -96,6 +281,231 @@ class Storage(ABC):
         """Close the storage session."""
         pass
 
+    def begin(self):
+        """
+        Starts (or nests into) a transaction of the current thread.
+        Until the outermost transaction ends, save() only stages the
+        changes and they are persisted once by commit().
+        """
+        if not self.in_transaction():
+            self.__transaction.doomed = False
+        self.__transaction.depth = self._transaction_depth() + 1
+
+    def commit(self):
+        """
+        Ends the current transaction. The outermost one persists the
+        staged changes, unless a nested transaction was rolled back,
+        in which case everything is rolled back. If persisting fails,
+        the changes are rolled back and the error is raised.
+
+        Returns:
+            True if the changes were (or will be) persisted,
+            False if they were rolled back.
+        """
+        depth = self._transaction_depth() - 1
+        self.__transaction.depth = max(depth, 0)
+        doomed = getattr(self.__transaction, "doomed", False)
+        if depth > 0:
+            return not doomed
+
+        if doomed:
+            self._rollback()
+            self._settled()
+            return False
+
+        try:
+            self._commit()
+        except Exception as err:
+            self._rollback()
+            raise err
+        finally:
+            self._settled()
+
+        return True
+
+    def rollback(self):
+        """
+        Ends the current transaction, discarding the staged changes.
+        A nested transaction only marks the outermost one to be
+        rolled back when it ends.
+        """
+        depth = self._transaction_depth() - 1
+        self.__transaction.depth = max(depth, 0)
+        if depth > 0:
+            self.__transaction.doomed = True
+            return
+
+        self._rollback()
+        self._settled()
+
+    def in_transaction(self):
+        """Returns True if the current thread is inside a transaction."""
+        return self._transaction_depth() > 0
+
+    @contextmanager
+    def atomic(self):
+        """
+        Runs a block as one transaction: the changes are persisted once
+        when the block ends, or discarded if it raises.
+        """
+        self.begin()
+        try:
+            yield self
+        except BaseException as err:
+            self.rollback()
+            raise err
+
+        self.commit()
+
+    def _transaction_depth(self):
+        """Returns the transaction nesting depth of the current thread."""
+        return getattr(self.__transaction, "depth", 0)
+
+    def _commit(self):
+        """Persists the changes staged by a transaction."""
+        pass
+
+    def _rollback(self):
+        """Discards the changes staged by a transaction."""
+        pass
+
+    def version(self, cls):
+        """
+        Returns a token of the state of the objects of a class,
+        which changes whenever one of them is created, updated
+        or deleted through this storage
+        Parameters:
+            cls (BaseModel): the class of the objects
+        Returns:
+            The version token (str)
+        """
+        return "{}.{}".format(
+            self.__epoch, self.__versions.get(cls.__name__, 0))
+
+    def pending_changes(self):
+        """
+        Returns the names of the classes whose objects the current
+        thread changed without committing or rolling back yet
+        (e.g. inside a transaction)
+        Returns:
+            A frozenset of class names
+        """
+        return frozenset(self.__pending_changes())
+
+    def _changed(self, *class_names):
+        """
+        Records that objects of some classes changed. Their versions
+        change at once, and again when the changes are committed or
+        rolled back, so a version read while the changes were staged
+        is never reused for the final state.
+        Parameters:
+            *class_names (str): the names of the changed classes
+        """
+        pending = self.__pending_changes()
+        for class_name in class_names:
+            self.__versions[class_name] = next(self.__version_counter)
+            pending.add(class_name)
+
+    def _settled(self):
+        """
+        Changes the versions of the classes changed since the last
+        commit or rollback of the current thread.
+        """
+        pending = self.__pending_changes()
+        for class_name in tuple(pending):
+            self.__versions[class_name] = next(self.__version_counter)
+        pending.clear()
+
+    def __pending_changes(self):
+        """Returns the changed class names of the current thread."""
+        if not hasattr(self.__changes, "pending"):
+            self.__changes.pending = set()
+        return self.__changes.pending
+
+    @classmethod
+    def set_deadline(cls, deadline):
+        """
+        Sets the time by which the storage operations of the current
+        thread (or asyncio task) must be done. Past it, they raise
+        DeadlineExceeded instead of running.
+        Parameters:
+            deadline (float): a time.monotonic() value,
+                or None to remove the deadline
+        """
+        cls.__deadline.set(deadline)
+
+    @classmethod
+    def time_left(cls):
+        """
+        Returns the seconds left before the deadline of the current
+        thread (negative once it passed), or None without a deadline
+        """
+        deadline = cls.__deadline.get()
+        if deadline is None:
+            return None
+
+        return deadline - time.monotonic()
+
+    @classmethod
+    def deadline_passed(cls):
+        """Returns True if the deadline of the current thread passed"""
+        time_left = cls.time_left()
+        return time_left is not None and time_left <= 0
+
+    @classmethod
+    def check_deadline(cls):
+        """
+        Raises DeadlineExceeded if the deadline of the current thread
+        passed (long operations call it while they run).
+        """
+        if cls.deadline_passed():
+            raise DeadlineExceeded("The storage operation timed out")
+
+    def changes(self, since=0, limit=1000):
+        """
+        Returns the change log of the storage: one entry per object
+        created, updated or deleted, numbered in the order the changes
+        were persisted. Storages without a change log return none.
+        Parameters:
+            since (int): the sequence number of the last change known
+                to the caller (0 for the whole log)
+            limit (int): the maximum number of changes returned
+        Returns:
+            A list of dicts with the keys seq (int), op ("create",
+            "update" or "delete"), class (str), id (str) and
+            changed_at (ISO format str), ordered by seq
+        """
+        return []
+
+    def last_change(self, classes=None):
+        """
+        Returns the sequence number of the last change persisted,
+        0 if there is none
+        Parameters:
+            classes (iterable): the classes of the changes to consider,
+                None for all of them
+        """
+        return 0
+
+    def circuit_state(self):
+        """
+        Returns the state of the circuit breaker of the storage:
+        "closed" while it is reachable, "open" while calls fail at
+        once, "half_open" while a call probes whether it is back.
+        Storages without a circuit breaker are always "closed".
+        """
+        return CLOSED
+
+    def read_from_replica(self, enabled=True):
+        """
+        Routes the reads of the current thread to a read replica.
+        Storages without replicas ignore it.
+
+        Parameters:
+            enabled (bool): Whether reads may go to a replica.
+        """
+        pass
+
     @staticmethod
     def _get_obj_key(class_name, _id):
         """
@@ -119,6 +529,19 @@ class Storage(ABC):
         """Returns a tuple of model names"""
         return tuple(self.__CLASSES.keys())
 
+    def get_owned(self, class_name):
+        """
+        Returns the objects owned by the objects of a class, which are
+        deleted with them (e.g. the cities of a state)
+        Parameters:
+            class_name (str): the name of the owner class
+        Returns:
+            A tuple of (owned class, name of the attribute holding
+            the id of the owner) pairs
+        """
+        return tuple((self.get_class(owned_name), attr)
+                     for owned_name, attr in OWNED.get(class_name, ()))
+
     def get_class(self, class_name):
         """
         Returns the class corresponding to a class name
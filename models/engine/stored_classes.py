@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """
-This module defines a dictionary of classes used in the application.
+This module defines a dictionary of classes used in the application,
+and which of their objects own others.
 """
 
 from models.user import User
@@ -19,3 +20,13 @@ CLASSES = FrozenDict({
     "Place": Place,
     "Review": Review
 })
+
+# The objects owned by the objects of each class, deleted with them
+# (the foreign keys declared ON DELETE CASCADE):
+# class name -> ((owned class name, attribute of the owner id), ...)
+OWNED = FrozenDict({
+    "State": (("City", "state_id"),),
+    "City": (("Place", "city_id"),),
+    "User": (("Place", "user_id"), ("Review", "user_id")),
+    "Place": (("Review", "place_id"),)
+})
@@ -8,6 +8,7 @@ from sqlalchemy import Column, Float, Integer, String, ForeignKey, Table
 from sqlalchemy.orm import relationship
 
 from models.base_model import BaseModel, Base
+from models.engine.identifiers import ID_TYPE
 from models.review import Review
 from models.amenity import Amenity
 
@@ -29,10 +30,10 @@ class Place(*parent_classes):
     if STORAGE_TYPE == "db":
         __tablename__ = 'places'
 
-        city_id = Column(String(60),
+        city_id = Column(ID_TYPE,
                          ForeignKey('cities.id', ondelete="CASCADE"),
                          nullable=False)
-        user_id = Column(String(60),
+        user_id = Column(ID_TYPE,
                          ForeignKey('users.id', ondelete="CASCADE"),
                          nullable=False)
         name = Column(String(128), nullable=False)
@@ -116,16 +117,21 @@ class Place(*parent_classes):
                 return
 
             if obj.id not in self.amenity_ids:
-                self.amenity_ids.append(obj.id)
+                # Assigned, not appended, so the change is noticed
+                # (and the class-level list is never shared)
+                self.amenity_ids = self.amenity_ids + [obj.id]
 
-    def to_dict(self):
+    def to_dict(self, fields=None):
         """
         Returns a dictionary representation of the object.
 
+        Parameters:
+        - fields (list[str]): The keys to return, None for all of them.
+
         Returns:
         - dictionary (dict[str, any]): Dictionary containing object attributes.
         """
-        place_dict = super().to_dict()
+        place_dict = super().to_dict(fields)
 
         place_dict.pop('city', None)
         place_dict.pop('amenities', None)
@@ -138,12 +144,12 @@ if STORAGE_TYPE == "db":
         'place_amenity',
         Base.metadata,
         Column(
-            'place_id', String(60),
+            'place_id', ID_TYPE,
             ForeignKey('places.id'),
             primary_key=True
         ),
         Column(
-            'amenity_id', String(60),
+            'amenity_id', ID_TYPE,
             ForeignKey('amenities.id'),
             primary_key=True
         )
@@ -8,6 +8,7 @@ from sqlalchemy import Column, String, ForeignKey
 from sqlalchemy.orm import relationship
 
 from models.base_model import BaseModel, Base
+from models.engine.identifiers import ID_TYPE
 
 STORAGE_TYPE = os.getenv('HBNB_TYPE_STORAGE')
 
@@ -28,10 +29,10 @@ class Review(*parent_classes):
         __tablename__ = 'reviews'
 
         text = Column(String(1024), nullable=False)
-        place_id = Column(String(60),
+        place_id = Column(ID_TYPE,
                           ForeignKey('places.id', ondelete="CASCADE"),
                           nullable=False)
-        user_id = Column(String(60),
+        user_id = Column(ID_TYPE,
                          ForeignKey('users.id', ondelete="CASCADE"),
                          nullable=False)
         user = relationship('User', back_populates='reviews')
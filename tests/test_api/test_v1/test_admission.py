@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+"""
+test api/v1/admission.py module that rate limits the clients
+and sheds the requests over the concurrency limits
+"""
+
+import json
+import threading
+import unittest
+from unittest import mock
+
+from api.v1.app import app
+from api.v1.admission import Budget, ConcurrencyLimiter, TokenBucket
+
+
+class AdmissionTestCase(unittest.TestCase):
+    """test admission module"""
+
+    def test_token_bucket(self):
+        """check a bucket admits its burst then asks to wait"""
+        bucket = TokenBucket(rate=1, burst=2)
+        self.assertEqual(bucket.take(), 0)
+        self.assertEqual(bucket.take(), 0)
+        self.assertGreater(bucket.take(), 0)
+
+    def test_concurrency_limiter(self):
+        """check the slots and the bounded wait queue"""
+        limiter = ConcurrencyLimiter(limit=1, max_queued=1)
+        self.assertTrue(limiter.acquire(0))
+        self.assertFalse(limiter.acquire(0))
+
+        threading.Timer(0.05, limiter.release).start()
+        self.assertTrue(limiter.acquire(5))
+        limiter.release()
+
+        full = ConcurrencyLimiter(limit=1, max_queued=0)
+        full.acquire(0)
+        self.assertFalse(full.acquire(5))
+
+    def test_rate_limited_route(self):
+        """check a client over the budget of a route gets 429"""
+        budgets = {"search": Budget(rate=0.1, burst=1)}
+        search = {"data": json.dumps({}), "content_type": "application/json"}
+        with mock.patch.dict(app.extensions["admission"], budgets), \
+                app.test_client() as client:
+            resp = client.post('/api/v1/places_search', **search)
+            self.assertEqual(resp.status_code, 200)
+
+            resp = client.post('/api/v1/places_search', **search)
+            self.assertEqual(resp.status_code, 429)
+            self.assertEqual(resp.headers["Retry-After"], "10")
+            self.assertEqual(resp.get_json()["error"], "Too Many Requests")
+
+            resp = client.get('/api/v1/states')
+            self.assertEqual(resp.status_code, 200)
+
+            resp = client.post('/api/v1/batch', data=json.dumps({
+                "requests": [{"method": "POST", "path": "/places_search",
+                              "body": {}}] * 2
+            }), content_type="application/json")
+            self.assertEqual(
+                [result["status"] for result in resp.get_json()["results"]],
+                [200, 200])
+
+    def test_overloaded(self):
+        """check a request without a free slot gets 503"""
+        budget = Budget(concurrency=1, queue=0)
+        budget.concurrency_limiter.acquire(0)
+        with mock.patch.dict(app.extensions["admission"], default=budget), \
+                app.test_client() as client:
+            resp = client.get('/api/v1/status')
+            self.assertEqual(resp.status_code, 503)
+            self.assertIn("Retry-After", resp.headers)
+
+            budget.concurrency_limiter.release()
+            resp = client.get('/api/v1/status')
+            self.assertEqual(resp.status_code, 200)
+            self.assertTrue(budget.concurrency_limiter.acquire(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
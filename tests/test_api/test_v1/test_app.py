@@ -5,6 +5,7 @@ Flask application for the HBNB API
 """
 
 import unittest
+from datetime import datetime
 import flask
 
 from api.v1.app import app
@@ -18,6 +19,19 @@ class AppTestCase(unittest.TestCase):
         with app.test_client() as client:
             self.assertIsInstance(client, flask.testing.FlaskClient)
 
+    def test_json_provider(self):
+        """check responses are compact and encode datetimes"""
+        with app.app_context():
+            res = flask.jsonify(at=datetime(2024, 1, 2, 3, 4, 5))
+        self.assertEqual(res.get_data(), b'{"at":"2024-01-02T03:04:05"}')
+
+    def test_apispec(self):
+        """check the API documentation is generated"""
+        with app.test_client() as client:
+            res = client.get('/apispec_1.json')
+            self.assertEqual(res.status_code, 200)
+            self.assertIn('/api/v1/states/', res.get_json()['paths'])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,178 @@
+#!/usr/bin/python3
+"""
+test api/v1/cache.py module that caches
+the responses of the read routes
+"""
+
+import json
+import threading
+import time
+import unittest
+from unittest import mock
+
+from models import storage
+from models.engine.storage import StorageUnavailable
+from models.state import State
+from api.v1.app import app
+from api.v1.cache import response_cache, single_flight
+from api.v1.formats import msgpack
+
+
+class CacheTestCase(unittest.TestCase):
+    """test cache module"""
+
+    def setUp(self):
+        """start every test with an empty cache"""
+        response_cache.clear()
+
+    def test_repeated_read_skips_storage(self):
+        """check a repeated read is served from the cache"""
+        with app.test_client() as client:
+            first = client.get('/api/v1/states')
+
+            with mock.patch.object(storage, "iter_json") as iter_json:
+                second = client.get('/api/v1/states')
+
+            iter_json.assert_not_called()
+            self.assertEqual(second.status_code, 200)
+            self.assertEqual(first.get_json(), second.get_json())
+
+    def test_write_invalidates_dependent_entries(self):
+        """check a write only invalidates the entries of its class"""
+        with app.test_client() as client:
+            client.get('/api/v1/states')
+            client.get('/api/v1/amenities')
+
+            client.post('/api/v1/states/',
+                        data=json.dumps({"name": "Kansas"}),
+                        content_type="application/json")
+
+            with mock.patch.object(storage, "iter_json",
+                                   wraps=storage.iter_json) as iter_json:
+                states = client.get('/api/v1/states').get_json()
+                client.get('/api/v1/amenities')
+
+            self.assertEqual(
+                [call.args[0] for call in iter_json.call_args_list],
+                [State])
+            self.assertIn("Kansas", [state["name"] for state in states])
+
+    def test_search_key_normalizes_body(self):
+        """check equal search bodies share one entry"""
+        with app.test_client() as client:
+            client.post('/api/v1/places_search',
+                        data='{"states": [], "cities": []}',
+                        content_type="application/json")
+            count = len(response_cache)
+            client.post('/api/v1/places_search',
+                        data='{"cities": [],  "states": []}',
+                        content_type="application/json")
+
+            self.assertEqual(len(response_cache), count)
+
+    @unittest.skipIf(msgpack is None, "msgpack is not installed")
+    def test_search_key_of_binary_body(self):
+        """check a body JSON cannot encode is still cached"""
+        body = msgpack.packb({"states": [], 1: "one", "raw": b"\x00"})
+        with app.test_client() as client:
+            for _ in range(2):
+                resp = client.post('/api/v1/places_search', data=body,
+                                   content_type="application/msgpack")
+                self.assertEqual(resp.status_code, 200)
+
+            self.assertEqual(len(response_cache), 1)
+
+    def test_hit_keeps_vary(self):
+        """check a cached response still varies on Accept"""
+        with app.test_client() as client:
+            first = client.get('/api/v1/states')
+            second = client.get('/api/v1/states')
+
+            self.assertIn("Accept", first.vary)
+            self.assertEqual(second.vary, first.vary)
+
+    def test_concurrent_misses_are_coalesced(self):
+        """check identical concurrent reads compute the response once"""
+        iter_json = storage.iter_json
+
+        def slow_iter_json(*args, **kwargs):
+            """Reads the states slowly"""
+            time.sleep(0.2)
+            return iter_json(*args, **kwargs)
+
+        results = []
+
+        def get_states():
+            """Reads the states in a thread"""
+            with app.test_client() as client:
+                results.append(client.get('/api/v1/states').get_json())
+
+        with mock.patch.object(storage, "iter_json",
+                               side_effect=slow_iter_json) as mocked:
+            threads = [threading.Thread(target=get_states)
+                       for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(mocked.call_count, 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(len(single_flight), 0)
+
+    def test_stale_while_storage_unavailable(self):
+        """check the last good response is served when storage is down"""
+        with app.test_client() as client:
+            first = client.get('/api/v1/states').get_json()
+            client.post('/api/v1/states/',
+                        data=json.dumps({"name": "Nebraska"}),
+                        content_type="application/json")
+
+            with mock.patch.object(
+                    storage, "iter_json",
+                    side_effect=StorageUnavailable(retry_after=4.2)):
+                stale = client.get('/api/v1/states')
+                missing = client.get('/api/v1/amenities')
+
+            self.assertEqual(stale.status_code, 200)
+            self.assertEqual(stale.get_json(), first)
+            self.assertIn("110", stale.headers["Warning"])
+            self.assertIn("Age", stale.headers)
+            self.assertNotIn("ETag", stale.headers)
+
+            self.assertEqual(missing.status_code, 503)
+            self.assertEqual(missing.headers["Retry-After"], "5")
+            self.assertEqual(missing.get_json()["error"],
+                             "Service Unavailable")
+
+    def test_half_open_refreshes_in_background(self):
+        """check a stale response is refreshed once storage may be back"""
+        with app.test_client() as client:
+            client.get('/api/v1/states')
+            name = "Iowa {}".format(time.time())
+            client.post('/api/v1/states/',
+                        data=json.dumps({"name": name}),
+                        content_type="application/json")
+
+            with mock.patch.object(storage, "circuit_state",
+                                   return_value="half_open"):
+                stale = client.get('/api/v1/states')
+            self.assertIn("Warning", stale.headers)
+            self.assertNotIn(
+                name, [state["name"] for state in stale.get_json()])
+
+            deadline = time.monotonic() + 5
+            while len(single_flight) and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            with mock.patch.object(storage, "iter_json") as iter_json:
+                fresh = client.get('/api/v1/states')
+            iter_json.assert_not_called()
+            self.assertNotIn("Warning", fresh.headers)
+            self.assertIn(
+                name, [state["name"] for state in fresh.get_json()])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+"""
+test api/v1/compression.py module that compresses
+the responses with the encoding the client accepts
+"""
+
+import gzip
+import unittest
+from unittest import mock
+
+from models import storage
+from models.state import State
+from api.v1.app import app
+from api.v1 import compression
+from api.v1.cache import response_cache
+
+
+class CompressionTestCase(unittest.TestCase):
+    """test compression module"""
+
+    @classmethod
+    def setUpClass(cls):
+        """create enough states to compress their list"""
+        for i in range(20):
+            storage.new(State(name="Compressed state {}".format(i)))
+        storage.save()
+
+    def setUp(self):
+        """start every test with an empty cache"""
+        response_cache.clear()
+
+    def test_gzip(self):
+        """check a large list is compressed with gzip"""
+        headers = {"Accept-Encoding": "gzip"}
+        with app.test_client() as client:
+            identity = client.get('/api/v1/states')
+            resp = client.get('/api/v1/states', headers=headers)
+            self.assertEqual(resp.headers["Content-Encoding"], "gzip")
+            self.assertIn("Accept-Encoding", resp.headers["Vary"])
+            self.assertEqual(gzip.decompress(resp.data), identity.data)
+            self.assertEqual(resp.headers["ETag"],
+                             identity.headers["ETag"][:-1] + '-gzip"')
+
+            resp = client.get('/api/v1/states', headers={
+                "Accept-Encoding": "gzip",
+                "If-None-Match": resp.headers["ETag"]})
+            self.assertEqual(resp.status_code, 304)
+            self.assertTrue(resp.headers["ETag"].endswith('-gzip"'))
+
+    def test_small_body_not_compressed(self):
+        """check a body under the threshold is sent as it is"""
+        with app.test_client() as client:
+            resp = client.get('/api/v1/status',
+                              headers={"Accept-Encoding": "gzip"})
+            self.assertNotIn("Content-Encoding", resp.headers)
+            self.assertEqual(resp.get_json(), {"status": "OK"})
+
+    def test_stream(self):
+        """check a streamed list is compressed chunk by chunk"""
+        with app.test_client() as client:
+            identity = client.get('/api/v1/states?stream=1').data
+            resp = client.get('/api/v1/states?stream=1',
+                              headers={"Accept-Encoding": "gzip"})
+            self.assertEqual(resp.headers["Content-Encoding"], "gzip")
+            self.assertEqual(gzip.decompress(resp.data), identity)
+
+    def test_cached_variant(self):
+        """check a cached response is compressed only once"""
+        headers = {"Accept-Encoding": "gzip"}
+        with app.test_client() as client:
+            first = client.get('/api/v1/states', headers=headers)
+
+            with mock.patch.object(compression, "compress") as compress:
+                second = client.get('/api/v1/states', headers=headers)
+
+            compress.assert_not_called()
+            self.assertEqual(second.headers["Content-Encoding"], "gzip")
+            self.assertEqual(second.data, first.data)
+            self.assertEqual(second.headers["ETag"], first.headers["ETag"])
+
+    @unittest.skipIf(compression.brotli is None, "brotli is not installed")
+    def test_brotli(self):
+        """check br is preferred to gzip"""
+        with app.test_client() as client:
+            identity = client.get('/api/v1/states')
+            resp = client.get('/api/v1/states',
+                              headers={"Accept-Encoding": "gzip, br"})
+            self.assertEqual(resp.headers["Content-Encoding"], "br")
+            self.assertEqual(compression.brotli.decompress(resp.data),
+                             identity.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""
+test api/v1/conditional.py module that answers
+conditional GET requests with 304 Not Modified
+"""
+
+import json
+import unittest
+from unittest import mock
+
+from models import storage
+from models.city import City
+from models.state import State
+from api.v1.app import app
+
+
+class ConditionalTestCase(unittest.TestCase):
+    """test conditional module"""
+
+    def test_collection_not_modified(self):
+        """check an unchanged collection is answered with 304"""
+        with app.test_client() as client:
+            resp = client.get('/api/v1/states')
+            etag = resp.headers["ETag"]
+
+            with mock.patch.object(State, "to_dict") as to_dict:
+                resp = client.get('/api/v1/states',
+                                  headers={"If-None-Match": etag})
+
+            self.assertEqual(resp.status_code, 304)
+            self.assertEqual(resp.headers["ETag"], etag)
+            self.assertEqual(resp.data, b"")
+            to_dict.assert_not_called()
+
+            client.post('/api/v1/states/',
+                        data=json.dumps({"name": "Chile"}),
+                        content_type="application/json")
+            resp = client.get('/api/v1/states',
+                              headers={"If-None-Match": etag})
+            self.assertEqual(resp.status_code, 200)
+            self.assertNotEqual(resp.headers["ETag"], etag)
+
+    def test_collection_changed_by_another_process(self):
+        """check the ETag of a collection follows the shared change log"""
+        # The versions of this process do not see the change
+        with app.test_client() as client, \
+                mock.patch.object(storage, "version", return_value="1"):
+            resp = client.get('/api/v1/states')
+            etag = resp.headers["ETag"]
+
+            storage.new(State(name="Paraguay"))
+            storage.save()
+            resp = client.get('/api/v1/states',
+                              headers={"If-None-Match": etag})
+
+            self.assertEqual(resp.status_code, 200)
+            self.assertNotEqual(resp.headers["ETag"], etag)
+
+    def test_collection_of_a_parent(self):
+        """check the collections of two parents have different ETags,
+        and a missing parent is answered with 404"""
+        state = State(name="Uruguay")
+        cities = [City(name="Salto", state_id=state.id),
+                  City(name="Rivera", state_id=state.id)]
+        storage.new_many([state] + cities)
+
+        with app.test_client() as client:
+            etags = [
+                client.get('/api/v1/cities/{}/places'.format(
+                    city.id)).headers["ETag"]
+                for city in cities
+            ]
+            self.assertNotEqual(etags[0], etags[1])
+
+            resp = client.get('/api/v1/cities/nope/places',
+                              headers={"If-None-Match": etags[0]})
+            self.assertEqual(resp.status_code, 404)
+
+            etag = client.get('/api/v1/states/{}/cities'.format(
+                state.id)).headers["ETag"]
+            resp = client.get('/api/v1/states/nope/cities',
+                              headers={"If-None-Match": etag})
+            self.assertEqual(resp.status_code, 404)
+
+    def test_object_not_modified(self):
+        """check an unchanged object is answered with 304"""
+        new_state = State(name="Peru")
+        storage.new(new_state)
+        storage.save()
+        url = '/api/v1/states/{}'.format(new_state.id)
+
+        with app.test_client() as client:
+            resp = client.get(url)
+            etag = resp.headers["ETag"]
+            last_modified = resp.headers["Last-Modified"]
+
+            resp = client.get(url, headers={"If-None-Match": etag})
+            self.assertEqual(resp.status_code, 304)
+            resp = client.get(url,
+                              headers={"If-Modified-Since": last_modified})
+            self.assertEqual(resp.status_code, 304)
+
+            client.put(url, data=json.dumps({"name": "Bolivia"}),
+                       content_type="application/json")
+            resp = client.get(url, headers={"If-None-Match": etag})
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.get_json()["name"], "Bolivia")
+
+
+if __name__ == "__main__":
+    unittest.main()
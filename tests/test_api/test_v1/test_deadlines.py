@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""
+test api/v1/deadlines.py module that gives every
+request a deadline the storage operations must meet
+"""
+
+import unittest
+from unittest import mock
+
+from models import storage
+from api.v1.app import app
+from api.v1 import deadlines
+from api.v1.cache import response_cache
+
+
+class DeadlinesTestCase(unittest.TestCase):
+    """test deadlines module"""
+
+    def setUp(self):
+        """start every test with an empty cache"""
+        response_cache.clear()
+
+    def test_request_timeout(self):
+        """check the client header only shortens the route timeout"""
+        with app.test_request_context(
+                '/api/v1/states', headers={"X-Request-Timeout": "2.5"}):
+            self.assertEqual(deadlines.request_timeout(), 2.5)
+        with app.test_request_context(
+                '/api/v1/states', headers={"X-Request-Timeout": "3600"}):
+            self.assertEqual(deadlines.request_timeout(),
+                             deadlines.REQUEST_TIMEOUT)
+
+    def test_invalid_header(self):
+        """check an invalid X-Request-Timeout is answered with 400"""
+        with app.test_client() as client:
+            for value in ("soon", "0", "-1"):
+                resp = client.get('/api/v1/states',
+                                  headers={"X-Request-Timeout": value})
+                self.assertEqual(resp.status_code, 400)
+
+    def test_deadline_exceeded(self):
+        """check a request past its deadline is answered with 504"""
+        with mock.patch.object(deadlines, "request_timeout",
+                               return_value=-1), \
+                app.test_client() as client:
+            resp = client.get('/api/v1/states')
+            self.assertEqual(resp.status_code, 504)
+            self.assertEqual(resp.get_json()["error"], "Gateway Timeout")
+
+        self.assertIsNone(storage.time_left())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+"""
+test api/v1/formats.py module that encodes the responses
+and decodes the bodies in MessagePack or CBOR
+"""
+
+import unittest
+
+from models import storage
+from models.state import State
+from api.v1.app import app
+from api.v1.formats import msgpack, cbor2
+
+
+class FormatsTestCase(unittest.TestCase):
+    """test formats module"""
+
+    @classmethod
+    def setUpClass(cls):
+        """create a state to get"""
+        cls.state = State(name="Paraguay")
+        storage.new(cls.state)
+        storage.save()
+
+    @unittest.skipIf(msgpack is None, "msgpack is not installed")
+    def test_msgpack(self):
+        """check MessagePack responses and bodies"""
+        headers = {"Accept": "application/msgpack"}
+        with app.test_client() as client:
+            url = '/api/v1/states/{}'.format(self.state.id)
+            expected = client.get(url).get_json()
+            resp = client.get(url, headers=headers)
+            self.assertEqual(resp.mimetype, "application/msgpack")
+            self.assertEqual(msgpack.unpackb(resp.data), expected)
+
+            resp = client.get('/api/v1/states', headers=headers)
+            self.assertIn(expected, msgpack.unpackb(resp.data))
+
+            resp = client.post('/api/v1/states/',
+                               data=msgpack.packb({"name": "Ecuador"}),
+                               content_type="application/msgpack",
+                               headers=headers)
+            self.assertEqual(resp.status_code, 201)
+            self.assertEqual(msgpack.unpackb(resp.data)["name"], "Ecuador")
+
+            resp = client.post('/api/v1/states/', data=b"\xc1",
+                               content_type="application/msgpack",
+                               headers=headers)
+            self.assertEqual(resp.status_code, 400)
+            self.assertIn("Not a JSON",
+                          msgpack.unpackb(resp.data)["message"])
+
+    @unittest.skipIf(cbor2 is None, "cbor2 is not installed")
+    def test_cbor(self):
+        """check CBOR responses and bodies"""
+        headers = {"Accept": "application/cbor"}
+        with app.test_client() as client:
+            url = '/api/v1/states/{}'.format(self.state.id)
+            expected = client.get(url).get_json()
+            resp = client.get(url, headers=headers)
+            self.assertEqual(resp.mimetype, "application/cbor")
+            self.assertEqual(cbor2.loads(resp.data), expected)
+
+            resp = client.put(url, data=cbor2.dumps({"name": "Guyana"}),
+                              content_type="application/cbor",
+                              headers=headers)
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(cbor2.loads(resp.data)["name"], "Guyana")
+
+    @unittest.skipIf(msgpack is None, "msgpack is not installed")
+    def test_cached_formats(self):
+        """check each format of a cached response is kept apart"""
+        headers = {"Accept": "application/msgpack"}
+        with app.test_client() as client:
+            expected = client.get('/api/v1/states').get_json()
+            resp = client.get('/api/v1/states', headers=headers)
+            self.assertEqual(resp.mimetype, "application/msgpack")
+            self.assertEqual(msgpack.unpackb(resp.data), expected)
+
+            resp = client.get('/api/v1/states')
+            self.assertEqual(resp.mimetype, "application/json")
+            self.assertEqual(resp.get_json(), expected)
+
+            resp = client.get('/api/v1/states/unknown', headers=headers)
+            self.assertEqual(resp.status_code, 404)
+            self.assertEqual(msgpack.unpackb(resp.data)["error"],
+                             "Not found")
+
+    def test_json_by_default(self):
+        """check JSON is kept without a binary Accept header"""
+        with app.test_client() as client:
+            resp = client.get('/api/v1/states',
+                              headers={"Accept": "application/json"})
+            self.assertEqual(resp.mimetype, "application/json")
+
+
+if __name__ == '__main__':
+    unittest.main()
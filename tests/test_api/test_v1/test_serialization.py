@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+test api/v1/serialization.py module that builds the
+JSON array and NDJSON list responses
+"""
+
+import json
+import unittest
+
+from models import storage
+from models.state import State
+from api.v1.app import app
+
+
+class SerializationTestCase(unittest.TestCase):
+    """test serialization module"""
+
+    @classmethod
+    def setUpClass(cls):
+        """create a state to list"""
+        cls.state = State(name="Uruguay")
+        storage.new(cls.state)
+        storage.save()
+
+    def test_json_array(self):
+        """check a list is a buffered JSON array by default"""
+        with app.test_client() as client:
+            resp = client.get('/api/v1/states')
+            self.assertIn("Content-Length", resp.headers)
+            self.assertEqual(resp.mimetype, "application/json")
+            self.assertIn("Accept", resp.headers["Vary"])
+            ids = [state["id"] for state in resp.get_json()]
+            self.assertIn(self.state.id, ids)
+
+    def test_stream_json_array(self):
+        """check the stream parameter streams the same JSON array"""
+        with app.test_client() as client:
+            expected = client.get('/api/v1/states').get_json()
+            resp = client.get('/api/v1/states?stream=1')
+            self.assertNotIn("Content-Length", resp.headers)
+            self.assertEqual(resp.mimetype, "application/json")
+            self.assertEqual(resp.get_json(), expected)
+
+            resp = client.get('/api/v1/states?stream=1&ids=missing')
+            self.assertEqual(resp.get_json(), [])
+
+    def test_ndjson(self):
+        """check application/x-ndjson lists one object per line"""
+        headers = {"Accept": "application/x-ndjson"}
+        with app.test_client() as client:
+            expected = client.get('/api/v1/states').get_json()
+            resp = client.get('/api/v1/states', headers=headers)
+            self.assertNotIn("Content-Length", resp.headers)
+            self.assertEqual(resp.mimetype, "application/x-ndjson")
+            lines = resp.get_data().decode("utf-8").splitlines()
+            self.assertEqual([json.loads(line) for line in lines], expected)
+            self.assertTrue(resp.get_data().endswith(b"\n"))
+
+            resp = client.post('/api/v1/places_search',
+                               data=json.dumps({"cities": ["missing"]}),
+                               content_type="application/json",
+                               headers=headers)
+            self.assertEqual(resp.get_data(), b"")
+
+    def test_ndjson_etag(self):
+        """check NDJSON and JSON lists have different ETags"""
+        with app.test_client() as client:
+            etag = client.get('/api/v1/states').headers["ETag"]
+            resp = client.get('/api/v1/states',
+                              headers={"Accept": "application/x-ndjson",
+                                       "If-None-Match": etag})
+            self.assertEqual(resp.status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
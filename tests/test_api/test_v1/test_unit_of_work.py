@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+test api/v1/unit_of_work.py module that persists
+the changes of each write request once
+"""
+
+import json
+import time
+import unittest
+from unittest import mock
+
+from werkzeug.exceptions import Conflict
+
+from models import storage
+from models.state import State
+from api.v1.app import app
+
+
+class UnitOfWorkTestCase(unittest.TestCase):
+    """test unit_of_work module"""
+
+    def test_write_request_commits_once(self):
+        """check a successful write request commits once"""
+        with app.test_client() as client:
+            with mock.patch.object(storage, "_commit",
+                                   wraps=storage._commit) as commit:
+                resp = client.post(
+                    '/api/v1/states/',
+                    data=json.dumps({"name": "Peru"}),
+                    content_type="application/json"
+                )
+
+            self.assertEqual(resp.status_code, 201)
+            self.assertEqual(commit.call_count, 1)
+            self.assertFalse(storage.in_transaction())
+
+    def test_failed_write_request_rolls_back(self):
+        """check a request failing after a write is rolled back"""
+        name = "Peru {}".format(time.time())
+        with app.test_client() as client:
+            # The state is saved, then the response fails
+            with mock.patch.object(storage, "_commit") as commit, \
+                    mock.patch.object(State, "to_dict",
+                                      side_effect=Conflict()):
+                resp = client.post(
+                    '/api/v1/states/',
+                    data=json.dumps({"name": name}),
+                    content_type="application/json"
+                )
+
+            self.assertEqual(resp.status_code, 409)
+            commit.assert_not_called()
+            self.assertFalse(storage.in_transaction())
+            self.assertNotIn(name, [state.name for state
+                                    in storage.all(State).values()])
+
+    def test_read_request_has_no_unit_of_work(self):
+        """check read requests do not open a transaction"""
+        with app.test_client() as client:
+            with mock.patch.object(storage, "begin") as begin:
+                client.get('/api/v1/states')
+
+            begin.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""testing the asynchronous routes"""
+import json
+import unittest
+from models import async_storage, storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+from api.v1.app import app
+
+
+@unittest.skipIf(async_storage is None, 'Async DB Storage test')
+class TestAsyncViews(unittest.TestCase):
+    """test async_views.py file for the asynchronous routes"""
+    def test_lists(self):
+        """test the asynchronous collection GET routes"""
+        state = State(name="Oregon")
+        city = City(name="Portland", state_id=state.id)
+        user = User(email="async@hbnb.io", password="pwd")
+        place = Place(name="Loft", city_id=city.id, user_id=user.id)
+        review = Review(text="Nice", place_id=place.id, user_id=user.id)
+        amenity = Amenity(name="Kettle")
+        storage.new_many([state, city, user, place, review, amenity])
+
+        with app.test_client() as client:
+            for path, obj in (("/states", state), ("/amenities", amenity),
+                              ("/users", user)):
+                resp = client.get('/api/v1/async' + path)
+                self.assertEqual(resp.status_code, 200)
+                self.assertIn(obj.id, [item["id"] for item in resp.get_json()])
+
+            for path, obj in (
+                    ("/states/{}/cities".format(state.id), city),
+                    ("/cities/{}/places".format(city.id), place),
+                    ("/places/{}/reviews".format(place.id), review)):
+                resp = client.get('/api/v1/async' + path + '?fields=id')
+                self.assertEqual(resp.get_json(), [{"id": obj.id}])
+
+            for path in ("/states/unknown/cities", "/cities/unknown/places",
+                         "/places/unknown/reviews"):
+                resp = client.get('/api/v1/async' + path)
+                self.assertEqual(resp.status_code, 404)
+
+    def test_places_search(self):
+        """test the asynchronous places_search POST route"""
+        state = State(name="Idaho")
+        city = City(name="Boise", state_id=state.id)
+        user = User(email="search@hbnb.io", password="pwd")
+        place = Place(name="Cabin", city_id=city.id, user_id=user.id)
+        storage.new_many([state, city, user, place])
+
+        with app.test_client() as client:
+            resp = client.post('/api/v1/async/places_search?fields=id',
+                               data=json.dumps({"states": [state.id]}),
+                               content_type="application/json")
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.get_json(), [{"id": place.id}])
+
+            resp = client.post('/api/v1/async/places_search',
+                               data="states")
+            self.assertEqual(resp.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""testing the batch route"""
+import json
+import os
+import unittest
+from models.state import State
+from models import storage
+from api.v1.app import app
+
+
+class TestBatch(unittest.TestCase):
+    """test batch.py file for the batch route"""
+    def test_batch(self):
+        """test batch POST route"""
+        with app.test_client() as client:
+            new_state = State(name="Kenya")
+            storage.new(new_state)
+            storage.save()
+
+            resp = client.post(
+                '/api/v1/batch',
+                data=json.dumps({"requests": [
+                    {"path": "/states/{}".format(new_state.id)},
+                    {"method": "POST", "path": "/states",
+                     "body": {"name": "Uganda"}},
+                    {"path": "/states/unknown"},
+                    {"path": "/batch", "method": "POST"}
+                ]}),
+                content_type="application/json"
+            )
+
+            self.assertEqual(resp.status_code, 200)
+            results = resp.get_json()["results"]
+            self.assertEqual(
+                [result["status"] for result in results], [200, 201, 404, 404]
+            )
+            self.assertEqual(results[0]["body"]["name"], "Kenya")
+
+    def test_batch_transaction(self):
+        """test a transactional batch is rolled back if a request fails"""
+        with app.test_client() as client:
+            old_count = storage.count(State)
+
+            resp = client.post(
+                '/api/v1/batch',
+                data=json.dumps({"transaction": True, "requests": [
+                    {"method": "POST", "path": "/states",
+                     "body": {"name": "Tanzania"}},
+                    {"method": "POST", "path": "/states", "body": {}}
+                ]}),
+                content_type="application/json"
+            )
+
+            self.assertEqual(resp.status_code, 409)
+            self.assertEqual(old_count, storage.count(State))
+
+    @unittest.skipIf(not os.getenv("HBNB_DB_READ_URLS"), 'No read replica')
+    def test_batch_reads_its_writes(self):
+        """test the requests after a write in a batch read the primary"""
+        with app.test_client() as client:
+            new_state = State(name="Nevada")
+            storage.new(new_state)
+            storage.save()
+
+            resp = client.post(
+                '/api/v1/batch',
+                data=json.dumps({"requests": [
+                    {"method": "POST", "path": "/states",
+                     "body": {"name": "Utah"}},
+                    {"path": "/states/{}".format(new_state.id)}
+                ]}),
+                content_type="application/json"
+            )
+
+            self.assertEqual(resp.status_code, 200)
+            results = resp.get_json()["results"]
+            self.assertEqual(
+                [result["status"] for result in results], [201, 200]
+            )
+
+    def test_batch_not_json(self):
+        """test batch POST route with invalid JSON"""
+        with app.test_client() as client:
+            resp = client.post('/api/v1/batch', data="requests")
+            self.assertEqual(resp.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
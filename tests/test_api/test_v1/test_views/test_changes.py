@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""testing the change feed routes"""
+import json
+import unittest
+from models import storage
+from api.v1.app import app
+
+
+class TestChanges(unittest.TestCase):
+    """test changes.py file for the change feed routes"""
+    def test_changes_since_token(self):
+        """test changes GET route returns the changes after a token"""
+        with app.test_client() as client:
+            token = client.get('/api/v1/changes?limit=1000').get_json()
+            while token["more"]:
+                token = client.get('/api/v1/changes?limit=1000&since=' +
+                                   token["next"]).get_json()
+
+            state = client.post('/api/v1/states/',
+                                data=json.dumps({"name": "Oregon"}),
+                                content_type="application/json").get_json()
+            client.put('/api/v1/states/' + state["id"],
+                       data=json.dumps({"name": "Ohio"}),
+                       content_type="application/json")
+            amenity = client.post('/api/v1/amenities/',
+                                  data=json.dumps({"name": "Sauna"}),
+                                  content_type="application/json").get_json()
+            client.delete('/api/v1/amenities/' + amenity["id"])
+
+            resp = client.get('/api/v1/changes?since=' + token["next"])
+            self.assertEqual(resp.status_code, 200)
+            page = resp.get_json()
+            self.assertEqual(
+                [(change["op"], change["id"]) for change in page["changes"]],
+                [("update", state["id"]), ("delete", amenity["id"])])
+            self.assertEqual(page["changes"][0]["object"]["name"], "Ohio")
+            self.assertNotIn("object", page["changes"][1])
+            self.assertEqual(page["next"], str(storage.last_change()))
+            self.assertFalse(page["more"])
+
+            resp = client.get('/api/v1/changes?classes=Amenity&since=' +
+                              token["next"])
+            self.assertEqual(
+                [change["class"] for change in resp.get_json()["changes"]],
+                ["Amenity"])
+
+            resp = client.get('/api/v1/changes?since=' + page["next"])
+            self.assertEqual(resp.get_json()["changes"], [])
+
+    def test_invalid_token(self):
+        """test changes GET route rejects invalid and unknown tokens"""
+        with app.test_client() as client:
+            resp = client.get('/api/v1/changes?since=soon')
+            self.assertEqual(resp.status_code, 400)
+
+            resp = client.get('/api/v1/changes?classes=Planet')
+            self.assertEqual(resp.status_code, 400)
+
+            resp = client.get('/api/v1/changes?since={}'.format(
+                storage.last_change() + 1))
+            self.assertEqual(resp.status_code, 410)
+            self.assertEqual(resp.get_json()["error"], "Gone")
+
+    def test_stream_changes(self):
+        """test changes stream route sends the changes as events"""
+        since = storage.last_change()
+        with app.test_client() as client:
+            state = client.post('/api/v1/states/',
+                                data=json.dumps({"name": "Utah"}),
+                                content_type="application/json").get_json()
+
+            resp = client.get('/api/v1/changes/stream',
+                              headers={"Last-Event-ID": str(since),
+                                       "X-Request-Timeout": "0.5"})
+            body = resp.get_data(as_text=True)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.mimetype, "text/event-stream")
+        self.assertIn("id: {}\nevent: change\n".format(since + 1), body)
+        self.assertIn(state["id"], body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,9 @@
 #!/usr/bin/python3
 """testing the index route"""
 import json
+import os
 import unittest
+from models.amenity import Amenity
 from models.place import Place
 from models.city import City
 from models.state import State
@@ -67,6 +69,42 @@ class TestPlaces(unittest.TestCase):
 
             self.assertEqual(resp.status_code, 201)
 
+    def test_create_places_bulk(self):
+        """test places bulk POST route"""
+        with app.test_client() as client:
+            new_state = State(name="Japan")
+            storage.new(new_state)
+
+            new_city = City(name="Kyoto", state_id=new_state.id)
+            storage.new(new_city)
+
+            new_user = User(email="example@123.com", password="0000")
+            storage.new(new_user)
+            storage.save()
+            city_id, user_id = new_city.id, new_user.id
+
+            resp = client.post(
+                '/api/v1/cities/{}/places/bulk'.format(city_id),
+                data=json.dumps([
+                    dict(name="Becky's Bakery", user_id=user_id),
+                    dict(name="Becky's Barn", user_id="nobody")
+                ]), content_type="application/json"
+            )
+
+            self.assertEqual(resp.status_code, 400)
+            self.assertEqual(resp.get_json()[1]["status"], 404)
+
+            resp = client.post(
+                '/api/v1/cities/{}/places/bulk'.format(city_id),
+                data=json.dumps([
+                    dict(name="Becky's Bakery", user_id=user_id),
+                    dict(name="Becky's Barn", user_id=user_id)
+                ]), content_type="application/json"
+            )
+
+            self.assertEqual(resp.status_code, 201)
+            self.assertEqual(len(resp.get_json()), 2)
+
     def test_delete_place(self):
         """test place DELETE route"""
         with app.test_client() as client:
@@ -125,6 +163,130 @@ class TestPlaces(unittest.TestCase):
             res = client.get('/api/v1/places/{}'.format(new_place.id))
             self.assertEqual(res.status_code, 200)
 
+    def test_get_place_include(self):
+        """test place GET by id route with embedded resources"""
+        with app.test_client() as client:
+            new_state = State(name="Spain")
+            storage.new(new_state)
+
+            new_city = City(name="Madrid", state_id=new_state.id)
+            storage.new(new_city)
+
+            new_user = User(email="abc@123.com", password="chicken")
+            storage.new(new_user)
+
+            new_place = Place(
+                name="Becky's Bathhouse", city_id=new_city.id,
+                user_id=new_user.id
+            )
+            storage.new(new_place)
+            storage.save()
+            place_id, city_id = new_place.id, new_city.id
+
+            res = client.get(
+                '/api/v1/places/{}?include=city,user,reviews'.format(place_id)
+            )
+            self.assertEqual(res.status_code, 200)
+            data = res.get_json()
+            self.assertEqual(data["city"]["id"], city_id)
+            self.assertNotIn("password", data["user"])
+            self.assertEqual(data["reviews"], [])
+
+            res = client.get(
+                '/api/v1/places/{}?include=owner'.format(place_id))
+            self.assertEqual(res.status_code, 400)
+
+    def test_get_places_fields(self):
+        """test places GET routes limited to some fields"""
+        with app.test_client() as client:
+            new_state = State(name="Italy")
+            storage.new(new_state)
+
+            new_city = City(name="Rome", state_id=new_state.id)
+            storage.new(new_city)
+
+            new_user = User(email="abc@123.com", password="chicken")
+            storage.new(new_user)
+
+            new_place = Place(
+                name="Becky's Bathhouse", city_id=new_city.id,
+                user_id=new_user.id, description="A long description"
+            )
+            storage.new(new_place)
+            storage.save()
+            place_id, city_id = new_place.id, new_city.id
+
+            res = client.get('/api/v1/cities/{}/places?fields=id,name'.format(
+                city_id))
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.get_json(), [
+                {"id": place_id, "name": "Becky's Bathhouse"}
+            ])
+
+            res = client.get('/api/v1/places/{}?fields=name&include=city'
+                             .format(place_id))
+            self.assertEqual(res.status_code, 200)
+            data = res.get_json()
+            self.assertEqual(sorted(data.keys()), ["city", "name"])
+            self.assertEqual(data["city"]["id"], city_id)
+
+            res = client.get('/api/v1/places/{}?fields=password'.format(
+                place_id))
+            self.assertEqual(res.status_code, 400)
+
+    def test_get_places_by_ids(self):
+        """test places GET route for many IDs"""
+        with app.test_client() as client:
+            new_state = State(name="Greece")
+            storage.new(new_state)
+
+            new_city = City(name="Athens", state_id=new_state.id)
+            storage.new(new_city)
+
+            new_user = User(email="abc@123.com", password="chicken")
+            storage.new(new_user)
+
+            places = [Place(name="Place{}".format(i), city_id=new_city.id,
+                            user_id=new_user.id) for i in range(3)]
+            storage.new_many(places)
+            ids = [places[2].id, places[0].id]
+
+            res = client.get('/api/v1/places?ids={},missing,{}'.format(*ids))
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual([place["id"] for place in res.get_json()], ids)
+
+            res = client.get('/api/v1/places')
+            self.assertEqual(res.status_code, 400)
+
+    def test_places_search_filters(self):
+        """test places_search route with states and amenities filters"""
+        with app.test_client() as client:
+            new_state = State(name="Norway")
+            new_city = City(name="Bergen", state_id=new_state.id)
+            new_user = User(email="fjord@123.com", password="bergen")
+            new_place = Place(name="Fjord view", city_id=new_city.id,
+                              user_id=new_user.id)
+            sauna = Amenity(name="Sauna")
+            storage.new_many([new_state, new_city, new_user, new_place,
+                              sauna, Amenity(name="Ski room")])
+
+            if os.getenv("HBNB_TYPE_STORAGE") == "db":
+                new_place.amenities.append(sauna)
+            else:
+                new_place.amenities = sauna
+            storage.save()
+
+            resp = client.post(
+                '/api/v1/places_search?include=city,amenities',
+                data=json.dumps({"states": [new_state.id],
+                                 "amenities": [sauna.id]}),
+                content_type="application/json")
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(
+                [(place["id"], place["city"]["id"])
+                 for place in resp.get_json()],
+                [(new_place.id, new_city.id)])
+
     def test_update_place(self):
         """test place PUT route"""
         with app.test_client() as client:
@@ -18,6 +18,29 @@ class TestStates(unittest.TestCase):
             resp = client.get('/api/v1/states/')
             self.assertEqual(resp.status_code, 200)
 
+    def test_lists_updated_states(self):
+        """test state GET route with updated_since and latest"""
+        states = [State(name="Dated{}".format(day),
+                        updated_at="2100-02-0{}T00:00:00".format(day))
+                  for day in (1, 2)]
+        storage.new_many(states)
+        try:
+            with app.test_client() as client:
+                resp = client.get(
+                    '/api/v1/states?updated_since=2100-01-31T12:00:00')
+                self.assertEqual([state["id"] for state in resp.get_json()],
+                                 [states[0].id, states[1].id])
+
+                resp = client.get('/api/v1/states?latest=1&fields=id')
+                self.assertEqual(resp.get_json(), [{"id": states[1].id}])
+
+                for query in ("updated_since=soon", "latest=0",
+                              "latest=1&updated_since=2100-01-01"):
+                    resp = client.get('/api/v1/states?' + query)
+                    self.assertEqual(resp.status_code, 400)
+        finally:
+            storage.delete_many(states)
+
     def test_create_state(self):
         """test state POST route"""
         with app.test_client() as client:
@@ -29,6 +52,31 @@ class TestStates(unittest.TestCase):
 
             self.assertEqual(resp.status_code, 201)
 
+    def test_create_states_bulk(self):
+        """test states bulk POST route"""
+        with app.test_client() as client:
+            resp = client.post(
+                '/api/v1/states/bulk',
+                data=json.dumps([{"name": "Peru"}, {"name": "Chile"}]),
+                content_type="application/json"
+            )
+
+            self.assertEqual(resp.status_code, 201)
+            for result in resp.get_json():
+                state = storage.get(State, result["object"]["id"])
+                self.assertIsNotNone(state)
+
+            resp = client.post(
+                '/api/v1/states/bulk',
+                data='{"name": "Cuba"}\n{"title": "Haiti"}\n',
+                content_type="application/x-ndjson"
+            )
+
+            self.assertEqual(resp.status_code, 400)
+            self.assertEqual(
+                [result["status"] for result in resp.get_json()], [424, 400]
+            )
+
     def test_delete_state(self):
         """test state DELETE route"""
         with app.test_client() as client:
@@ -67,6 +115,24 @@ class TestStates(unittest.TestCase):
 
             self.assertEqual(resp.status_code, 200)
 
+    def test_update_state_unknown_key(self):
+        """test state PUT route ignores the keys that are not columns"""
+        with app.test_client() as client:
+            new_state = State(name="Mexico")
+            storage.new(new_state)
+            storage.save()
+
+            resp = client.put(
+                'api/v1/states/{}'.format(new_state.id),
+                data=json.dumps({"name": "Belize", "foo": 1}),
+                content_type="application/json"
+            )
+
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.get_json()["name"], "Belize")
+            self.assertEqual(
+                storage.get(State, new_state.id).name, "Belize")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,12 +1,28 @@
 #!/usr/bin/python3
 """Defines unittests for models/base_model.py"""
 
+import json
 import unittest
 
+from models.state import State
+
 
 class TestBaseModel(unittest.TestCase):
     """Unittests for testing the BaseModel class."""
-    pass
+
+    def test_to_json(self):
+        """Test if to_json keeps its encoding until the object changes"""
+        state = State(name="Texas")
+
+        encoded = state.to_json()
+        self.assertEqual(json.loads(encoded), state.to_dict())
+        self.assertIs(state.to_json(), encoded)
+        self.assertNotIn("_json", state.to_dict())
+
+        state.name = "Nevada"
+        self.assertEqual(json.loads(state.to_json())["name"], "Nevada")
+        self.assertEqual(json.loads(state.to_json(["name"])),
+                         {"name": "Nevada"})
 
 
 if __name__ == "__main__":
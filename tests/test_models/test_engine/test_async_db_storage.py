@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+"""test for async DB storage"""
+import asyncio
+import unittest
+from models import async_storage, storage
+from models.state import State
+
+
+@unittest.skipIf(async_storage is None, 'Async DB Storage test')
+class TestAsyncDBStorage(unittest.TestCase):
+    """Tests the Async DB Storage"""
+    def run_closing(self, coroutine):
+        """Runs a coroutine and closes the storage session of its task"""
+        async def run():
+            try:
+                return await coroutine
+            finally:
+                await async_storage.close()
+
+        return asyncio.run(run())
+
+    def test_get(self):
+        """Test if get method retrieves obj requested"""
+        new_state = State(name="NewYork")
+
+        async def new_and_get():
+            await async_storage.new(new_state)
+            await async_storage.save()
+            return await async_storage.get(State, new_state.id)
+
+        result = self.run_closing(new_and_get())
+
+        self.assertEqual(result.id, new_state.id)
+        self.assertIsInstance(result, State)
+
+    def test_count(self):
+        """Test if count method returns expected number of objects"""
+        old_count = self.run_closing(async_storage.count(State))
+
+        async def new_states():
+            for name in ("NewYork", "Virginia", "California"):
+                await async_storage.new(State(name=name))
+            await async_storage.save()
+
+        self.run_closing(new_states())
+
+        self.assertEqual(old_count + 3,
+                         self.run_closing(async_storage.count(State)))
+
+    def test_changes(self):
+        """Test if the writes are logged and change the versions"""
+        since = storage.last_change()
+        version = storage.version(State)
+        state = State(name="Maine")
+
+        async def write():
+            await async_storage.new(state)
+            await async_storage.save()
+            await async_storage.update_many([(state, {"name": "Vermont"})])
+            await async_storage.delete(state)
+            await async_storage.save()
+
+        self.run_closing(write())
+
+        changes = storage.changes(since)
+        self.assertEqual(
+            [(change["op"], change["id"]) for change in changes],
+            [("create", state.id), ("update", state.id), ("delete", state.id)])
+        self.assertNotEqual(storage.version(State), version)
+
+
+if __name__ == "__main__":
+    unittest.main()
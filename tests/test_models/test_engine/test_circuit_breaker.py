@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+"""
+test models/engine/circuit_breaker.py module that stops calling
+a database that keeps failing
+"""
+
+import threading
+import time
+import unittest
+
+from models.engine.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker)
+
+
+class CircuitBreakerTestCase(unittest.TestCase):
+    """test CircuitBreaker class"""
+
+    def test_opens_past_threshold(self):
+        """check consecutive failures open the circuit"""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertTrue(breaker.allow())
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow())
+        self.assertGreater(breaker.retry_after(), 29)
+
+    def test_success_resets_failures(self):
+        """check a success restarts the count of failures"""
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_half_open_probe(self):
+        """check one thread probes a half-open circuit"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.allow())
+        self.assertTrue(breaker.allow())
+
+        allowed = []
+        thread = threading.Thread(
+            target=lambda: allowed.append(breaker.allow()))
+        thread.start()
+        thread.join()
+        self.assertEqual(allowed, [False])
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.retry_after(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,18 @@
 #!/usr/bin/python3
 """test for DB storage"""
 import os
+import time
 import unittest
+from datetime import datetime
+from sqlalchemy import create_engine, text
 from models import storage
+from models.engine.db_storage import DBStorage
+from models.engine.storage import DeadlineExceeded, StorageUnavailable
+from models.city import City
+from models.place import Place
+from models.review import Review
 from models.state import State
+from models.user import User
 
 storage_type = os.getenv("HBNB_TYPE_STORAGE")
 
@@ -36,6 +45,205 @@ class TestDBStorage(unittest.TestCase):
 
         self.assertEqual(old_count + 3, storage.count(State))
 
+    def test_iter_all(self):
+        """Test if iter_all yields the same objects as all"""
+        storage.new(State(name="Nevada"))
+
+        ids = {obj.id for obj in storage.iter_all(State, batch_size=1)}
+
+        self.assertEqual(ids, {obj.id for obj in storage.all(State).values()})
+
+    def test_iter_dicts(self):
+        """Test if iter_dicts yields to_dict shaped dictionaries"""
+        new_state = State(name="Oregon")
+        storage.new(new_state)
+
+        result = list(storage.iter_dicts(State, id=new_state.id))
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].keys(), new_state.to_dict().keys())
+        self.assertEqual(result[0]["name"], "Oregon")
+
+        result = list(storage.iter_dicts(
+            State, fields=["id", "name"], id=new_state.id))
+        self.assertEqual(result, [{"id": new_state.id, "name": "Oregon"}])
+
+    def test_get_many(self):
+        """Test if get_many finds many objects in the order of their IDs"""
+        states = [State(name="Many{}".format(i)) for i in range(3)]
+        storage.new_many(states)
+        ids = [states[2].id, "missing", states[0].id, states[2].id]
+
+        result = storage.get_many(State, ids)
+
+        self.assertEqual([state.id for state in result],
+                         [states[2].id, states[0].id])
+        self.assertEqual(storage.get_many(None, ids), [])
+
+    def test_version(self):
+        """Test if the version of a class changes with its objects"""
+        version = storage.version(State)
+        new_state = State(name="Utah")
+        storage.new(new_state)
+        storage.save()
+
+        self.assertNotEqual(storage.version(State), version)
+        version = storage.version(State)
+        self.assertEqual(storage.version(State), version)
+
+        storage.update_many([(new_state, {"name": "Idaho"})])
+        self.assertNotEqual(storage.version(State), version)
+
+    def test_deadline(self):
+        """Test if statements past the deadline raise DeadlineExceeded"""
+        storage.set_deadline(time.monotonic() - 1)
+        try:
+            with self.assertRaises(DeadlineExceeded):
+                storage.count(State)
+        finally:
+            storage.set_deadline(None)
+            storage.close()
+
+        self.assertGreaterEqual(storage.count(State), 0)
+
+    @unittest.skipIf(not os.getenv("HBNB_DB_URL", "").startswith("sqlite"),
+                     'SQLite test')
+    def test_deadline_interrupts_query(self):
+        """Test if a query running past the deadline is interrupted"""
+        query = text("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL "
+                     "SELECT i + 1 FROM n) SELECT count(*) FROM n")
+        storage.set_deadline(time.monotonic() + 0.1)
+        try:
+            with self.assertRaises(DeadlineExceeded):
+                storage._DBStorage__session.execute(query)
+        finally:
+            storage.set_deadline(None)
+            storage.close()
+
+    def test_circuit_breaker(self):
+        """Test if an unreachable database fails fast once tripped"""
+        engine = create_engine("sqlite:////nonexistent/hbnb/dev.db")
+        DBStorage._watch_engine(engine)
+        breaker = DBStorage._DBStorage__breakers[engine]
+        breaker.failure_threshold = 2
+
+        for _ in range(2):
+            with self.assertRaises(StorageUnavailable):
+                engine.connect()
+        self.assertEqual(breaker.state, "open")
+
+        with self.assertRaises(StorageUnavailable) as error:
+            engine.connect()
+        self.assertGreater(error.exception.retry_after, 0)
+        self.assertEqual(storage.circuit_state(), "closed")
+
+    def test_changes(self):
+        """Test if the writes are logged in order, and rollbacks are not"""
+        since = storage.last_change()
+        state = State(name="Logged")
+        storage.new(state)
+        storage.save()
+        storage.update_many([(state, {"name": "Relogged"})])
+
+        storage.begin()
+        storage.new(State(name="Discarded"))
+        storage.save()
+        storage.rollback()
+
+        storage.delete_many([state])
+
+        changes = storage.changes(since)
+        self.assertEqual(
+            [(change["op"], change["class"], change["id"])
+             for change in changes],
+            [("create", "State", state.id), ("update", "State", state.id),
+             ("delete", "State", state.id)])
+        self.assertEqual([change["seq"] for change in changes],
+                         [since + 1, since + 2, since + 3])
+        self.assertEqual(storage.last_change(), since + 3)
+        self.assertEqual(storage.last_change([City, State]), since + 3)
+        self.assertLessEqual(storage.last_change([City]), since)
+        self.assertEqual(storage.changes(since, limit=1), changes[:1])
+
+    def test_cascaded_changes(self):
+        """Test if the objects owned by a deleted object are logged"""
+        state = State(name="Owner")
+        city = City(name="Owned", state_id=state.id)
+        user = User(email="owner@hbnb.io", password="pwd")
+        place = Place(name="Owned", city_id=city.id, user_id=user.id)
+        review = Review(text="Owned", place_id=place.id, user_id=user.id)
+        storage.new_many([state, city, user, place, review])
+        since = storage.last_change()
+        # A loaded collection of owned objects
+        self.assertEqual(len(storage.get(State, state.id).cities), 1)
+
+        storage.delete(state)
+        storage.save()
+        storage.delete_many([user])
+
+        self.assertEqual(
+            sorted((change["class"], change["id"])
+                   for change in storage.changes(since)),
+            sorted([("State", state.id), ("City", city.id),
+                    ("Place", place.id), ("Review", review.id),
+                    ("User", user.id)]))
+        self.assertIsNone(storage.get(City, city.id))
+        self.assertIsNone(storage.get(Review, review.id))
+
+    def test_updated_index(self):
+        """Test if modified_since and recently_updated follow updated_at"""
+        states = [State(name="Dated{}".format(day),
+                        updated_at="2100-01-0{}T00:00:00".format(day))
+                  for day in (1, 2, 3)]
+        storage.new_many(states)
+        try:
+            self.assertEqual(storage.recently_updated(State, 2),
+                             [states[2], states[1]])
+            self.assertEqual(
+                storage.modified_since(State, datetime(2100, 1, 1, 12)),
+                [states[1], states[2]])
+            self.assertEqual(storage.modified_since(
+                State, datetime(2100, 1, 1), limit=1), [states[1]])
+            self.assertEqual(storage.modified_since(
+                State, datetime(2100, 1, 1), name="Dated3"), [states[2]])
+
+            storage.delete_many([states[2]])
+            storage.update_many([(states[1], {"name": "Redated"})])
+            self.assertEqual(storage.recently_updated(State, 1), [states[0]])
+        finally:
+            storage.delete_many(states)
+
+    def test_bulk_operations(self):
+        """Test if new_many, update_many and delete_many persist batches"""
+        old_count = storage.count(State)
+        states = [State(name="Bulk{}".format(i)) for i in range(5)]
+
+        storage.new_many(states)
+        self.assertEqual(old_count + 5, storage.count(State))
+
+        storage.update_many((state, {"name": "Renamed"}) for state in states)
+        self.assertEqual(storage.get(State, states[0].id).name, "Renamed")
+
+        storage.delete_many(states)
+        self.assertEqual(old_count, storage.count(State))
+        self.assertIsNone(storage.get(State, states[0].id))
+
+    @unittest.skipIf(not os.getenv("HBNB_DB_READ_URLS"), 'No read replica')
+    def test_read_from_replica(self):
+        """Test if reads go to the replica until the first write"""
+        new_state = State(name="Ohio")
+        storage.new(new_state)
+        storage.save()
+
+        storage.read_from_replica()
+        try:
+            self.assertIsNone(storage.get(State, new_state.id))
+
+            storage.new(State(name="Texas"))
+            self.assertIsNotNone(storage.get(State, new_state.id))
+        finally:
+            storage.close()
+
 
 if __name__ == "__main__":
     unittest.main()
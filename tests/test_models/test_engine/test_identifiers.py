@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""
+test models/engine/identifiers.py module that generates
+the ids and encodes them for binary columns
+"""
+
+import unittest
+import uuid
+
+from models.engine import identifiers
+
+
+class IdentifiersTestCase(unittest.TestCase):
+    """test identifiers module"""
+
+    def test_uuid7(self):
+        """check UUIDv7 are valid and generated in increasing order"""
+        ids = [identifiers.uuid7() for _ in range(1000)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+
+        parsed = uuid.UUID(ids[0])
+        self.assertEqual(parsed.version, 7)
+        self.assertEqual(parsed.variant, uuid.RFC_4122)
+        self.assertEqual(str(parsed), ids[0])
+
+    def test_ulid(self):
+        """check ULIDs are valid and generated in increasing order"""
+        ids = [identifiers.ulid() for _ in range(1000)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+        for _id in ids:
+            self.assertEqual(len(_id), 26)
+            self.assertTrue(set(_id) <= set(identifiers.ULID_ALPHABET))
+
+    def test_binary_ids(self):
+        """check the ids survive the binary encoding"""
+        for _id in (identifiers.uuid4(), identifiers.uuid7(),
+                    identifiers.ulid(), "place_id_1", ""):
+            self.assertEqual(
+                identifiers.id_from_bytes(identifiers.id_to_bytes(_id)), _id)
+
+        self.assertEqual(len(identifiers.id_to_bytes(identifiers.uuid7())), 17)
+        self.assertEqual(len(identifiers.id_to_bytes(identifiers.ulid())), 17)
+        upper = identifiers.uuid4().upper()
+        self.assertEqual(identifiers.id_to_bytes(upper), upper.encode())
+
+        first, second = identifiers.uuid7(), identifiers.uuid7()
+        self.assertLess(identifiers.id_to_bytes(first),
+                        identifiers.id_to_bytes(second))
+
+
+if __name__ == '__main__':
+    unittest.main()
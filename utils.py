@@ -6,6 +6,7 @@ command line inputs.
 """
 import re
 import ast
+import sys
 
 
 def extract_method_call(line):
@@ -187,3 +188,20 @@ def parse_params(params):
         kwargs[key] = value
 
     return kwargs
+
+
+def print_list(items):
+    """
+    Prints the items of an iterable the way print() prints a list,
+    writing each item as soon as it is produced instead of building
+    the whole list first.
+
+    Parameters:
+        items (iterable): The items to print.
+    """
+    sys.stdout.write("[")
+    for index, item in enumerate(items):
+        if index:
+            sys.stdout.write(", ")
+        sys.stdout.write(repr(item))
+    sys.stdout.write("]\n")